@@ -5,7 +5,7 @@ a = Analysis(
     ['C:\\Users\\Dell\\Desktop\\optimiez\\main.py'],
     pathex=[],
     binaries=[],
-    datas=[('optimizer.py', '.'), ('updater.py', '.')],
+    datas=[('optimizer.py', '.'), ('updater.py', '.'), ('hardware.py', '.'), ('profiling.py', '.'), ('processes.py', '.'), ('games.py', '.'), ('benchmarks.py', '.'), ('policies.py', '.'), ('throttler.py', '.'), ('memory.py', '.'), ('history.py', '.'), ('experiments.py', '.'), ('latency.py', '.'), ('network.py', '.'), ('resolvers.py', '.'), ('storage.py', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,520 @@
+import os
+import sys
+import json
+import mmap
+import time
+import random
+import tempfile
+import threading
+import statistics
+import multiprocessing
+import psutil
+from typing import Callable, Optional
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * pct / 100.0
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def summarize_latencies(samples: list) -> dict:
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean_us": statistics.fmean(samples),
+        "median_us": statistics.median(samples),
+        "p95_us": percentile(samples, 95),
+        "p99_us": percentile(samples, 99),
+        "max_us": max(samples),
+        "jitter_us": statistics.pstdev(samples),
+    }
+
+
+def summarize_samples(values: list) -> dict:
+    if not values:
+        return {"count": 0, "mean": 0.0, "median": 0.0, "p95": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "median": statistics.median(values),
+        "p95": percentile(values, 95),
+        "stddev": statistics.pstdev(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+BENCHMARK_METRICS = ("cpu_usage", "ram_percent", "ram_available_gb", "disk_read_speed", "disk_write_speed")
+
+
+def _cpu_busy(prev, cur) -> float:
+    total = sum(cur) - sum(prev)
+    idle = (cur.idle - prev.idle) + (getattr(cur, "iowait", 0) - getattr(prev, "iowait", 0))
+    return max(0.0, min(100.0, (total - idle) / total * 100)) if total > 0 else 0.0
+
+
+class BenchmarkSampler:
+    
+    def __init__(self, window: float = 2.0, hz: float = 10.0, callback: Optional[Callable[[dict], None]] = None):
+        self.window = window
+        self.hz = hz
+        self._callback = callback
+        self._result = None
+        self._error = None
+        self._done = threading.Event()
+        self._thread = None
+    
+    def start(self) -> "BenchmarkSampler":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+    
+    def result(self, timeout: Optional[float] = None) -> dict:
+        if timeout is None:
+            timeout = self.window + 10.0
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Benchmark sampling did not finish within {timeout:.1f} s")
+        if self._error is not None:
+            raise self._error
+        return self._result
+    
+    def _run(self):
+        try:
+            result = self._sample()
+            if self._callback:
+                self._callback(result)
+            self._result = result
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+    
+    def _sample(self) -> dict:
+        samples = {metric: [] for metric in BENCHMARK_METRICS}
+        period = 1.0 / self.hz
+        
+        prev_cpu = psutil.cpu_times()
+        prev_io = psutil.disk_io_counters()
+        prev_time = time.perf_counter()
+        deadline = prev_time + self.window
+        next_tick = prev_time + period
+        
+        while next_tick <= deadline + period / 2:
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+            next_tick += period
+            
+            now = time.perf_counter()
+            cpu = psutil.cpu_times()
+            memory = psutil.virtual_memory()
+            io = psutil.disk_io_counters()
+            elapsed = now - prev_time
+            
+            samples["cpu_usage"].append(_cpu_busy(prev_cpu, cpu))
+            samples["ram_percent"].append(memory.percent)
+            samples["ram_available_gb"].append(memory.available / (1024 ** 3))
+            if io is not None and prev_io is not None and elapsed > 0:
+                samples["disk_read_speed"].append((io.read_bytes - prev_io.read_bytes) / elapsed / (1024 * 1024))
+                samples["disk_write_speed"].append((io.write_bytes - prev_io.write_bytes) / elapsed / (1024 * 1024))
+            
+            prev_cpu, prev_io, prev_time = cpu, io, now
+        
+        stats = {metric: summarize_samples(values) for metric, values in samples.items()}
+        result = {metric: stats[metric]["mean"] for metric in BENCHMARK_METRICS}
+        result.update(window=self.window, hz=self.hz, samples=stats["cpu_usage"]["count"], stats=stats)
+        return result
+
+
+def compare_metric(
+    before: dict,
+    after: dict,
+    metric: str,
+    lower_is_better: bool = True,
+    noise_factor: float = 2.0,
+    floor: float = 0.0
+) -> dict:
+    old, new = before.get(metric), after.get(metric)
+    if old is None or new is None:
+        return {"verdict": "unknown", "delta": 0.0, "band": 0.0}
+    
+    old_sd = before.get("stats", {}).get(metric, {}).get("stddev", 0.0)
+    new_sd = after.get("stats", {}).get(metric, {}).get("stddev", 0.0)
+    band = max(floor, noise_factor * max(old_sd, new_sd))
+    delta = new - old
+    
+    if abs(delta) <= band:
+        verdict = "noise"
+    elif (delta < 0) == lower_is_better:
+        verdict = "improvement"
+    else:
+        verdict = "regression"
+    return {"verdict": verdict, "delta": delta, "band": band}
+
+
+def pin_process(cpus: Optional[list]):
+    if not cpus:
+        return
+    try:
+        psutil.Process().cpu_affinity(cpus)
+    except (psutil.AccessDenied, AttributeError, ValueError, OSError):
+        pass
+
+
+def _busy_worker(cpus: Optional[list], stop, ready=None):
+    pin_process(cpus)
+    if ready is not None:
+        ready.release()
+    value = 0
+    while not stop.is_set():
+        for i in range(10000):
+            value = (value + i * i) % 1000003
+
+
+def _wakeup_probe(cpus: Optional[list], duration: float, interval: float, queue):
+    pin_process(cpus)
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        time.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1e6)
+    queue.put(samples)
+
+
+def start_load(ctx, cpu_sets: list, stop, timeout: float = 30.0) -> list:
+    ready = ctx.Semaphore(0)
+    workers = [
+        ctx.Process(target=_busy_worker, args=(cpus, stop, ready), daemon=True)
+        for cpus in cpu_sets
+    ]
+    for worker in workers:
+        worker.start()
+    
+    pending = len(workers)
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        if ready.acquire(timeout=0.1):
+            pending -= 1
+        elif not any(worker.is_alive() for worker in workers):
+            break
+    return workers
+
+
+def stop_load(workers: list, stop):
+    stop.set()
+    for worker in workers:
+        worker.join(5)
+        if worker.is_alive():
+            worker.terminate()
+
+
+def measure_wakeup_latency(
+    cpus: Optional[list] = None,
+    duration: float = 2.0,
+    interval: float = 0.001,
+    load_cpus: Optional[list] = None,
+    load_workers: int = 0
+) -> dict:
+    ctx = multiprocessing.get_context()
+    stop = ctx.Event()
+    queue = ctx.Queue()
+    workers = start_load(ctx, [load_cpus] * load_workers, stop)
+    
+    probe = ctx.Process(target=_wakeup_probe, args=(cpus, duration, interval, queue), daemon=True)
+    probe.start()
+    try:
+        samples = queue.get(timeout=duration + 30)
+    except Exception:
+        samples = []
+    finally:
+        probe.join(5)
+        stop_load(workers, stop)
+    
+    result = summarize_latencies(samples)
+    result["cpus"] = cpus
+    result["load_workers"] = load_workers
+    return result
+
+
+def validate_affinity_plan(
+    plan: Optional[dict] = None,
+    duration: float = 2.0,
+    interval: float = 0.001,
+    load_workers: Optional[int] = None
+) -> dict:
+    if plan is None:
+        from hardware import get_affinity_plan
+        plan = get_affinity_plan()
+    
+    if load_workers is None:
+        load_workers = max(1, len(plan["background"]))
+    
+    before = measure_wakeup_latency(None, duration, interval, None, load_workers)
+    after = measure_wakeup_latency(plan["game"], duration, interval, plan["background"], load_workers)
+    
+    result = {"plan": plan, "before": before, "after": after, "improvement_pct": 0.0}
+    if before.get("count") and after.get("count") and before["p99_us"] > 0:
+        result["improvement_pct"] = (before["p99_us"] - after["p99_us"]) / before["p99_us"] * 100
+    return result
+
+
+def _cpu_kernel(iterations: int) -> int:
+    x = 0
+    f = 1.0
+    for i in range(iterations):
+        x = (x * 31 + i) & 0xFFFFFFFF
+        f = f * 1.0000001 + 0.5 / (i + 1)
+    return x
+
+
+def _with_variance(scores: list, unit: str) -> dict:
+    result = summarize_samples(scores)
+    result["unit"] = unit
+    result["cv_pct"] = result["stddev"] / result["mean"] * 100 if result["mean"] else 0.0
+    return result
+
+
+def _score(run: Callable[[], float], repeats: int, unit: str) -> dict:
+    run()
+    return _with_variance([run() for _ in range(repeats)], unit)
+
+
+def cpu_benchmark(workers: int = 1, iterations: int = 2_000_000, repeats: int = 3) -> dict:
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(workers) as pool:
+        def run() -> float:
+            started = time.perf_counter()
+            pool.map(_cpu_kernel, [iterations] * workers)
+            return iterations * workers / (time.perf_counter() - started) / 1e6
+        
+        result = _score(run, repeats, "Mops/s")
+    result["workers"] = workers
+    return result
+
+
+def memory_benchmark(size_mb: int = 64, repeats: int = 5) -> dict:
+    size = size_mb * 1024 * 1024
+    src = memoryview(bytearray(b"\xa5" * size))
+    dst = memoryview(bytearray(size))
+    
+    def run() -> float:
+        started = time.perf_counter()
+        for _ in range(4):
+            dst[:] = src
+        return 4 * size / (time.perf_counter() - started) / (1024 ** 3)
+    
+    result = _score(run, repeats, "GB/s")
+    src.release()
+    dst.release()
+    return result
+
+
+GENERIC_READ = 0x80000000
+
+FILE_FLAG_NO_BUFFERING = 0x20000000
+
+
+def open_unbuffered(path: str, size: int = 4096) -> tuple:
+    buffer = mmap.mmap(-1, size)
+    if os.name == "nt":
+        import ctypes
+        import msvcrt
+        from ctypes import wintypes
+        
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        handle = kernel32.CreateFileW(path, GENERIC_READ, 3, None, 3, FILE_FLAG_NO_BUFFERING, None)
+        if handle not in (None, wintypes.HANDLE(-1).value):
+            return msvcrt.open_osfhandle(handle, os.O_RDONLY), buffer
+    elif hasattr(os, "O_DIRECT"):
+        try:
+            return os.open(path, os.O_RDONLY | os.O_DIRECT), buffer
+        except OSError:
+            pass
+    buffer.close()
+    return os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0)), None
+
+
+def _windows_read(fd: int, offset: int, buffer: mmap.mmap) -> int:
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+    
+    os.lseek(fd, offset, os.SEEK_SET)
+    read = wintypes.DWORD()
+    success = ctypes.windll.kernel32.ReadFile(
+        wintypes.HANDLE(msvcrt.get_osfhandle(fd)), ctypes.byref(ctypes.c_char.from_buffer(buffer)),
+        len(buffer), ctypes.byref(read), None
+    )
+    if not success:
+        raise ctypes.WinError()
+    return read.value
+
+
+def read_at(fd: int, offset: int, buffer: Optional[mmap.mmap] = None, size: int = 4096) -> int:
+    if buffer is not None:
+        if hasattr(os, "preadv"):
+            return os.preadv(fd, [buffer], offset)
+        return _windows_read(fd, offset, buffer)
+    if hasattr(os, "pread"):
+        return len(os.pread(fd, size, offset))
+    os.lseek(fd, offset, os.SEEK_SET)
+    return len(os.read(fd, size))
+
+
+def disk_benchmark(
+    directory: Optional[str] = None,
+    size_mb: int = 64,
+    block_kb: int = 1024,
+    random_ops: int = 256,
+    repeats: int = 3
+) -> dict:
+    directory = directory or tempfile.gettempdir()
+    path = os.path.join(directory, f"yalokgar_bench_{os.getpid()}.tmp")
+    block = os.urandom(block_kb * 1024)
+    small = os.urandom(4096)
+    blocks = size_mb * 1024 // block_kb
+    size = blocks * len(block)
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    unbuffered = True
+    
+    def seq_write() -> float:
+        started = time.perf_counter()
+        fd = os.open(path, flags | os.O_TRUNC)
+        try:
+            for _ in range(blocks):
+                os.write(fd, block)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return size / (time.perf_counter() - started) / (1024 * 1024)
+    
+    def seq_read() -> float:
+        nonlocal unbuffered
+        fd, buffer = open_unbuffered(path, len(block))
+        unbuffered = unbuffered and buffer is not None
+        started = time.perf_counter()
+        try:
+            offset = 0
+            while offset < size:
+                offset += read_at(fd, offset, buffer, len(block)) or size
+        finally:
+            os.close(fd)
+            if buffer is not None:
+                buffer.close()
+        return size / (time.perf_counter() - started) / (1024 * 1024)
+    
+    def random_io(write: bool) -> float:
+        offsets = [random.randrange(size // 4096) * 4096 for _ in range(random_ops)]
+        fd, buffer = (os.open(path, flags), None) if write else open_unbuffered(path)
+        started = time.perf_counter()
+        try:
+            for offset in offsets:
+                if write:
+                    os.lseek(fd, offset, os.SEEK_SET)
+                    os.write(fd, small)
+                    os.fsync(fd)
+                else:
+                    read_at(fd, offset, buffer)
+        finally:
+            os.close(fd)
+            if buffer is not None:
+                buffer.close()
+        return random_ops / (time.perf_counter() - started)
+    
+    try:
+        return {
+            "seq_write": _score(seq_write, repeats, "MB/s"),
+            "seq_read": _score(seq_read, repeats, "MB/s"),
+            "random_write": _score(lambda: random_io(True), repeats, "IOPS"),
+            "random_read": _score(lambda: random_io(False), repeats, "IOPS"),
+            "directory": directory,
+            "unbuffered": unbuffered,
+        }
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+SUITE = ("cpu_single", "cpu_multi", "memory", "disk", "scheduler")
+
+
+def run_suite(
+    workloads: Optional[list] = None,
+    repeats: int = 3,
+    quick: bool = False,
+    log_callback: Optional[Callable[[str], None]] = None
+) -> dict:
+    log = log_callback or (lambda message: None)
+    scale = 0.25 if quick else 1.0
+    cores = psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
+    results = {"timestamp": time.time(), "repeats": repeats, "quick": quick}
+    
+    for name in workloads or SUITE:
+        started = time.perf_counter()
+        if name == "cpu_single":
+            results[name] = cpu_benchmark(1, int(2_000_000 * scale), repeats)
+        elif name == "cpu_multi":
+            results[name] = cpu_benchmark(cores, int(2_000_000 * scale), repeats)
+        elif name == "memory":
+            results[name] = memory_benchmark(int(64 * scale) or 16, repeats)
+        elif name == "disk":
+            results[name] = disk_benchmark(size_mb=int(64 * scale) or 16, random_ops=int(256 * scale), repeats=repeats)
+        elif name == "scheduler":
+            runs = [measure_wakeup_latency(duration=1.0 * scale) for _ in range(repeats)]
+            runs = [run for run in runs if run.get("count")]
+            results[name] = _with_variance([run["p99_us"] for run in runs], "us p99")
+            results[name]["median_us"] = statistics.median([run["median_us"] for run in runs] or [0.0])
+        else:
+            raise ValueError(f"Unknown workload: {name}")
+        log(f"  {name}: {time.perf_counter() - started:.1f} s")
+    
+    return results
+
+
+def flatten_suite(results: dict) -> dict:
+    flat = {"stats": {}}
+    for name, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        items = [(name, value)] if "mean" in value else [
+            (f"{name}_{sub}", stats) for sub, stats in value.items() if isinstance(stats, dict)
+        ]
+        for key, stats in items:
+            flat[key] = stats["mean"]
+            flat["stats"][key] = stats
+    return flat
+
+
+def _get_arg(name: str, default=None):
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if "--suite" in sys.argv:
+        workloads = _get_arg("--workloads")
+        result = run_suite(
+            workloads=workloads.split(",") if workloads else None,
+            repeats=int(_get_arg("--repeats", 3)),
+            quick="--quick" in sys.argv,
+            log_callback=lambda message: print(message, file=sys.stderr)
+        )
+    else:
+        result = validate_affinity_plan(duration=float(_get_arg("--duration", 2.0)))
+    print(json.dumps(result, indent=2))
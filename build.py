@@ -67,6 +67,20 @@ def build_exe():
         "--name", "Yalokgar Optimizer",
         "--add-data", f"optimizer.py;.",
         "--add-data", f"updater.py;.",
+        "--add-data", f"hardware.py;.",
+        "--add-data", f"profiling.py;.",
+        "--add-data", f"processes.py;.",
+        "--add-data", f"games.py;.",
+        "--add-data", f"benchmarks.py;.",
+        "--add-data", f"policies.py;.",
+        "--add-data", f"throttler.py;.",
+        "--add-data", f"memory.py;.",
+        "--add-data", f"history.py;.",
+        "--add-data", f"experiments.py;.",
+        "--add-data", f"latency.py;.",
+        "--add-data", f"network.py;.",
+        "--add-data", f"resolvers.py;.",
+        "--add-data", f"storage.py;.",
         "--clean",
         "--noconfirm",
     ]
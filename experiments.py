@@ -0,0 +1,161 @@
+import sys
+import json
+import math
+import time
+import random
+import statistics
+from typing import Callable, Optional
+
+
+def cohens_d(a: list, b: list) -> float:
+    if len(a) < 2 or len(b) < 2:
+        return 0.0
+    pooled = ((len(a) - 1) * statistics.variance(a) + (len(b) - 1) * statistics.variance(b)) / (len(a) + len(b) - 2)
+    if pooled <= 0:
+        return 0.0
+    d = (statistics.fmean(b) - statistics.fmean(a)) / math.sqrt(pooled)
+    return d * (1 - 3 / (4 * (len(a) + len(b)) - 9))
+
+
+def bootstrap_ci(a: list, b: list, confidence: float = 0.95, resamples: int = 5000, seed: int = 0) -> tuple:
+    rng = random.Random(seed)
+    diffs = []
+    for _ in range(resamples):
+        sample_a = [rng.choice(a) for _ in a]
+        sample_b = [rng.choice(b) for _ in b]
+        diffs.append(statistics.fmean(sample_b) - statistics.fmean(sample_a))
+    diffs.sort()
+    tail = (1 - confidence) / 2
+    return diffs[int(tail * (resamples - 1))], diffs[int((1 - tail) * (resamples - 1))]
+
+
+def permutation_test(a: list, b: list, resamples: int = 10000, seed: int = 0) -> float:
+    rng = random.Random(seed)
+    observed = abs(statistics.fmean(b) - statistics.fmean(a))
+    pooled = list(a) + list(b)
+    extreme = 0
+    for _ in range(resamples):
+        rng.shuffle(pooled)
+        diff = abs(statistics.fmean(pooled[len(a):]) - statistics.fmean(pooled[:len(a)]))
+        if diff >= observed - 1e-12:
+            extreme += 1
+    return (extreme + 1) / (resamples + 1)
+
+
+class ABExperiment:
+    
+    def __init__(
+        self,
+        apply: Callable[[], object],
+        revert: Callable[[], object],
+        workload: Callable[[], float],
+        rounds: int = 6,
+        warmup: int = 1,
+        settle: float = 1.0,
+        higher_is_better: bool = True,
+        alpha: float = 0.05,
+        name: str = "tweak",
+        log_callback: Optional[Callable[[str], None]] = None
+    ):
+        self.apply = apply
+        self.revert = revert
+        self.workload = workload
+        self.rounds = rounds
+        self.warmup = warmup
+        self.settle = settle
+        self.higher_is_better = higher_is_better
+        self.alpha = alpha
+        self.name = name
+        self._log = log_callback or (lambda message: None)
+    
+    def _measure(self, label: str, samples: list):
+        time.sleep(self.settle)
+        value = float(self.workload())
+        samples.append(value)
+        self._log(f"  [{label}] {value:.3f}")
+    
+    def _switch(self, action: Callable[[], object], label: str):
+        result = action()
+        if isinstance(result, dict) and result.get("success") is False:
+            raise RuntimeError(f"{self.name}: {label} не удалось, эксперимент прерван")
+    
+    def run(self) -> dict:
+        baseline, treatment = [], []
+        started = time.perf_counter()
+        applied = False
+        
+        try:
+            for _ in range(self.warmup):
+                self.workload()
+            
+            for round_index in range(self.rounds):
+                order = ("A", "B") if round_index % 2 == 0 else ("B", "A")
+                for arm in order:
+                    if arm == "B" and not applied:
+                        applied = True
+                        self._switch(self.apply, "применение")
+                    elif arm == "A" and applied:
+                        self._switch(self.revert, "откат")
+                        applied = False
+                    self._measure(arm, treatment if arm == "B" else baseline)
+        finally:
+            if applied:
+                result = self.revert()
+                if isinstance(result, dict) and result.get("success") is False:
+                    self._log(f"  {self.name}: откат не удался, проверь настройку вручную")
+        
+        return self.analyze(baseline, treatment, time.perf_counter() - started)
+    
+    def analyze(self, baseline: list, treatment: list, elapsed: float = 0.0) -> dict:
+        mean_a = statistics.fmean(baseline)
+        mean_b = statistics.fmean(treatment)
+        delta = mean_b - mean_a
+        low, high = bootstrap_ci(baseline, treatment, 1 - self.alpha)
+        p_value = permutation_test(baseline, treatment)
+        
+        if p_value >= self.alpha or low <= 0 <= high:
+            verdict = "no effect"
+        elif (delta > 0) == self.higher_is_better:
+            verdict = "improvement"
+        else:
+            verdict = "regression"
+        
+        return {
+            "name": self.name,
+            "rounds": self.rounds,
+            "baseline": baseline,
+            "treatment": treatment,
+            "baseline_mean": mean_a,
+            "treatment_mean": mean_b,
+            "delta": delta,
+            "delta_pct": delta / mean_a * 100 if mean_a else 0.0,
+            "ci": [low, high],
+            "effect_size": cohens_d(baseline, treatment),
+            "p_value": p_value,
+            "verdict": verdict,
+            "elapsed_s": elapsed,
+        }
+
+
+def format_report(result: dict) -> list:
+    return [
+        f"A/B: {result['name']} ({result['rounds']} раундов, {result['elapsed_s']:.0f} с)",
+        f"  Без твика: {result['baseline_mean']:.3f}",
+        f"  С твиком:  {result['treatment_mean']:.3f}",
+        f"  Разница: {result['delta']:+.3f} ({result['delta_pct']:+.1f}%), "
+        f"ДИ [{result['ci'][0]:+.3f}; {result['ci'][1]:+.3f}]",
+        f"  Размер эффекта (g): {result['effect_size']:+.2f}, p = {result['p_value']:.4f}",
+        f"  Итог: {result['verdict']}",
+    ]
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    from optimizer import SystemOptimizer
+    
+    multiprocessing.freeze_support()
+    tweak = sys.argv[sys.argv.index("--tweak") + 1] if "--tweak" in sys.argv else "power_plan"
+    workload = sys.argv[sys.argv.index("--workload") + 1] if "--workload" in sys.argv else "cpu_single"
+    rounds = int(sys.argv[sys.argv.index("--rounds") + 1]) if "--rounds" in sys.argv else 6
+    result = SystemOptimizer().run_tweak_experiment(tweak, workload=workload, rounds=rounds)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,534 @@
+import os
+import re
+import json
+import glob
+import time
+import threading
+import subprocess
+import psutil
+from typing import Callable, Optional
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+from hardware import get_affinity_plan
+from processes import PRIORITY_CLASSES
+
+
+GAME_INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_index.json")
+
+
+HIGH_PERFORMANCE_GUID = "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c"
+
+DEFAULT_PROFILE = {
+    "priority": "high",
+    "affinity": "auto",
+    "power_plan": HIGH_PERFORMANCE_GUID,
+}
+
+KNOWN_GAMES = [
+    "cs2.exe",
+    "csgo.exe",
+    "dota2.exe",
+    "valorant-win64-shipping.exe",
+    "fortniteclient-win64-shipping.exe",
+    "r5apex.exe",
+    "gta5.exe",
+    "rdr2.exe",
+    "eldenring.exe",
+    "overwatch.exe",
+    "rocketleague.exe",
+    "cyberpunk2077.exe",
+    "rainbowsix.exe",
+    "pubg-win64-shipping.exe",
+]
+
+IGNORED_EXECUTABLES = (
+    "unins",
+    "setup",
+    "crashreport",
+    "crashhandler",
+    "vcredist",
+    "vc_redist",
+    "dxsetup",
+    "dxwebsetup",
+    "dotnet",
+    "ue4prereq",
+    "easyanticheat_setup",
+)
+
+
+def _run_command(command: str) -> tuple[bool, str]:
+    try:
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+        return result.returncode == 0, result.stdout + result.stderr
+    except Exception as e:
+        return False, str(e)
+
+
+class PowerPlanController:
+    
+    def __init__(self, runner: Optional[Callable[[str], tuple]] = None):
+        self._run = runner or _run_command
+    
+    def get_active(self) -> Optional[str]:
+        success, output = self._run("powercfg /getactivescheme")
+        if not success:
+            return None
+        match = re.search(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}", output)
+        return match.group(0).lower() if match else None
+    
+    def set_active(self, guid: str) -> bool:
+        success, _ = self._run(f"powercfg /setactive {guid}")
+        return success
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def parse_vdf(text: str) -> dict:
+    root = {}
+    stack = [root]
+    key = None
+    
+    for quoted, brace in re.findall(r'"((?:\\.|[^"\\])*)"|([{}])', text):
+        if brace == "{":
+            child = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+        elif brace == "}":
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        elif key is None:
+            key = quoted.replace("\\\\", "\\")
+        else:
+            stack[-1][key] = quoted.replace("\\\\", "\\")
+            key = None
+    
+    return root
+
+
+def default_steam_roots() -> list:
+    roots = []
+    
+    if winreg:
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam") as key:
+                roots.append(winreg.QueryValueEx(key, "SteamPath")[0])
+        except OSError:
+            pass
+    
+    roots.append(os.path.join(os.environ.get("ProgramFiles(x86)", r"C:\Program Files (x86)"), "Steam"))
+    roots.append(os.path.expanduser("~/.steam/steam"))
+    return [root for root in roots if os.path.isdir(root)]
+
+
+def default_epic_manifest_dirs() -> list:
+    program_data = os.environ.get("ProgramData", r"C:\ProgramData")
+    path = os.path.join(program_data, "Epic", "EpicGamesLauncher", "Data", "Manifests")
+    return [path] if os.path.isdir(path) else []
+
+
+class GameLibrary:
+    
+    def __init__(
+        self,
+        steam_roots: Optional[list] = None,
+        epic_manifest_dirs: Optional[list] = None,
+        index_file: Optional[str] = GAME_INDEX_FILE,
+        max_scan_depth: int = 3,
+        max_executables: int = 200
+    ):
+        self._steam_roots = steam_roots if steam_roots is not None else default_steam_roots()
+        self._epic_dirs = epic_manifest_dirs if epic_manifest_dirs is not None else default_epic_manifest_dirs()
+        self._index_file = index_file
+        self._max_depth = max_scan_depth
+        self._max_executables = max_executables
+        self._lock = threading.Lock()
+        self.entries = {}
+        self._exe_index = {}
+        self._load()
+    
+    def _load(self):
+        if not self._index_file:
+            return
+        try:
+            with open(self._index_file, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("manifests", {})
+        except (OSError, ValueError):
+            self.entries = {}
+        self._rebuild_index()
+    
+    def _save(self):
+        if not self._index_file:
+            return
+        try:
+            tmp_file = self._index_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"manifests": self.entries}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self._index_file)
+        except OSError:
+            pass
+    
+    def _rebuild_index(self):
+        index = {}
+        for entry in self.entries.values():
+            for exe in entry.get("executables", []):
+                index[normalize_path(exe)] = entry
+        self._exe_index = index
+    
+    def _steam_manifests(self) -> list:
+        libraries = []
+        for root in self._steam_roots:
+            libraries.append(root)
+            vdf_path = os.path.join(root, "steamapps", "libraryfolders.vdf")
+            try:
+                with open(vdf_path, "r", encoding="utf-8", errors="replace") as f:
+                    data = parse_vdf(f.read())
+            except OSError:
+                continue
+            
+            folders = data.get("libraryfolders") or data.get("LibraryFolders") or {}
+            for value in folders.values():
+                path = value.get("path") if isinstance(value, dict) else value
+                if path and os.path.isdir(path):
+                    libraries.append(path)
+        
+        manifests = []
+        seen = set()
+        for library in libraries:
+            steamapps = os.path.join(library, "steamapps")
+            for manifest in glob.glob(os.path.join(steamapps, "appmanifest_*.acf")):
+                key = normalize_path(manifest)
+                if key not in seen:
+                    seen.add(key)
+                    manifests.append(("steam", manifest))
+        return manifests
+    
+    def _epic_manifests(self) -> list:
+        manifests = []
+        for directory in self._epic_dirs:
+            for manifest in glob.glob(os.path.join(directory, "*.item")):
+                manifests.append(("epic", manifest))
+        return manifests
+    
+    def _parse_steam(self, manifest: str) -> Optional[dict]:
+        with open(manifest, "r", encoding="utf-8", errors="replace") as f:
+            state = parse_vdf(f.read()).get("AppState", {})
+        
+        install_dir = state.get("installdir")
+        if not install_dir:
+            return None
+        
+        path = os.path.join(os.path.dirname(manifest), "common", install_dir)
+        return {
+            "source": "steam",
+            "id": state.get("appid"),
+            "name": state.get("name") or install_dir,
+            "install_dir": path,
+            "executables": self._scan_executables(path),
+        }
+    
+    def _parse_epic(self, manifest: str) -> Optional[dict]:
+        with open(manifest, "r", encoding="utf-8", errors="replace") as f:
+            data = json.load(f)
+        
+        path = data.get("InstallLocation")
+        if not path:
+            return None
+        
+        executables = self._scan_executables(path)
+        launch = data.get("LaunchExecutable")
+        if launch:
+            launch_path = os.path.join(path, launch)
+            if launch_path not in executables:
+                executables.insert(0, launch_path)
+        
+        return {
+            "source": "epic",
+            "id": data.get("AppName"),
+            "name": data.get("DisplayName") or data.get("AppName"),
+            "install_dir": path,
+            "executables": executables,
+        }
+    
+    def _scan_executables(self, path: str) -> list:
+        executables = []
+        base_depth = path.rstrip("\\/").count(os.sep)
+        
+        for dirpath, dirnames, filenames in os.walk(path):
+            if dirpath.count(os.sep) - base_depth >= self._max_depth:
+                dirnames[:] = []
+            for filename in filenames:
+                lower = filename.lower()
+                if not lower.endswith(".exe") or any(word in lower for word in IGNORED_EXECUTABLES):
+                    continue
+                executables.append(os.path.join(dirpath, filename))
+                if len(executables) >= self._max_executables:
+                    return executables
+        
+        return executables
+    
+    def refresh(self) -> dict:
+        stats = {"parsed": 0, "reused": 0, "removed": 0, "errors": 0}
+        
+        with self._lock:
+            entries = {}
+            for source, manifest in self._steam_manifests() + self._epic_manifests():
+                try:
+                    mtime = os.path.getmtime(manifest)
+                except OSError:
+                    continue
+                
+                cached = self.entries.get(manifest)
+                if cached and cached.get("mtime") == mtime:
+                    entries[manifest] = cached
+                    stats["reused"] += 1
+                    continue
+                
+                try:
+                    parser = self._parse_steam if source == "steam" else self._parse_epic
+                    entry = parser(manifest)
+                except (OSError, ValueError):
+                    stats["errors"] += 1
+                    continue
+                
+                if entry:
+                    entry["mtime"] = mtime
+                    entries[manifest] = entry
+                    stats["parsed"] += 1
+            
+            stats["removed"] = len(set(self.entries) - set(entries))
+            self.entries = entries
+            self._rebuild_index()
+            
+            if stats["parsed"] or stats["removed"]:
+                self._save()
+        
+        return stats
+    
+    def lookup(self, exe_path: Optional[str]) -> Optional[dict]:
+        if not exe_path:
+            return None
+        return self._exe_index.get(normalize_path(exe_path))
+    
+    def is_game(self, exe_path: Optional[str]) -> bool:
+        return self.lookup(exe_path) is not None
+    
+    def games(self) -> list:
+        return sorted(self.entries.values(), key=lambda entry: (entry.get("name") or "").lower())
+
+
+class GameWatcher:
+    
+    def __init__(
+        self,
+        games: Optional[list] = None,
+        profiles: Optional[dict] = None,
+        default_profile: Optional[dict] = None,
+        power: Optional[PowerPlanController] = None,
+        library: Optional[GameLibrary] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        interval: float = 1.0
+    ):
+        self._log = log_callback or print
+        self._default_profile = dict(default_profile or DEFAULT_PROFILE)
+        self._profiles = {}
+        for name in games if games is not None else KNOWN_GAMES:
+            self._profiles[name.lower()] = None
+        for name, profile in (profiles or {}).items():
+            self._profiles[name.lower()] = profile
+        self._power = power or PowerPlanController()
+        self._library = library
+        self.interval = interval
+        
+        self._seen = {}
+        self.active = {}
+        self._saved_power_plan = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.stats = {"polls": 0, "new": 0, "matched": 0, "poll_ms": 0.0}
+    
+    def add_game(self, exe_name: str, profile: Optional[dict] = None):
+        self._profiles[exe_name.lower()] = profile
+    
+    def profile_for(self, name: str) -> Optional[dict]:
+        name = (name or "").lower()
+        if name not in self._profiles:
+            return None
+        return dict(self._default_profile, **(self._profiles[name] or {}))
+    
+    def match(self, proc: psutil.Process) -> Optional[dict]:
+        profile = self.profile_for(proc.name())
+        if profile is not None or self._library is None:
+            return profile
+        
+        try:
+            exe = proc.exe()
+        except (psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+        
+        if self._library.is_game(exe):
+            return dict(self._default_profile)
+        return None
+    
+    def poll(self) -> dict:
+        with self._lock:
+            started = time.perf_counter()
+            events = {"started": [], "exited": []}
+            
+            pids = set(psutil.pids())
+            for pid in list(self._seen):
+                if pid not in pids:
+                    del self._seen[pid]
+            
+            fresh = {}
+            for pid in pids - self._seen.keys():
+                try:
+                    proc = psutil.Process(pid)
+                    self._seen[pid] = proc.create_time()
+                    fresh[pid] = proc
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+            
+            for pid, record in list(self.active.items()):
+                proc = None
+                if pid in pids:
+                    try:
+                        proc = psutil.Process(pid)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                        pass
+                if proc is not None and proc.create_time() == record["key"][1]:
+                    continue
+                self._revert(record)
+                del self.active[pid]
+                events["exited"].append(record["name"])
+                if proc is not None:
+                    self._seen[pid] = proc.create_time()
+                    fresh[pid] = proc
+            
+            for pid, proc in fresh.items():
+                try:
+                    profile = self.match(proc)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+                if profile is None:
+                    continue
+                
+                record = self._apply(proc, profile)
+                if record:
+                    self.active[pid] = record
+                    events["started"].append(record["name"])
+            
+            self.stats["polls"] += 1
+            self.stats["new"] += len(fresh)
+            self.stats["matched"] += len(events["started"])
+            self.stats["poll_ms"] = (time.perf_counter() - started) * 1000
+            return events
+    
+    def _apply(self, proc: psutil.Process, profile: dict) -> Optional[dict]:
+        try:
+            name = proc.name()
+            record = {
+                "process": proc,
+                "key": (proc.pid, proc.create_time()),
+                "name": name,
+                "profile": profile,
+                "nice": proc.nice(),
+                "affinity": None,
+            }
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        
+        self._log(f"Обнаружена игра: {name} (PID {proc.pid})")
+        
+        priority = profile.get("priority")
+        if priority:
+            try:
+                proc.nice(PRIORITY_CLASSES[priority])
+                self._log(f"  Приоритет: {priority}")
+            except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError) as e:
+                self._log(f"  Ошибка установки приоритета: {e}")
+        
+        affinity = profile.get("affinity")
+        if affinity:
+            try:
+                record["affinity"] = proc.cpu_affinity()
+                if affinity == "auto":
+                    affinity = get_affinity_plan()["game"]
+                proc.cpu_affinity(affinity)
+                self._log(f"  Ядра: {affinity}")
+            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError, ValueError) as e:
+                self._log(f"  Ошибка установки affinity: {e}")
+        
+        plan = profile.get("power_plan")
+        if plan and not self.active and self._saved_power_plan is None:
+            current = self._power.get_active()
+            if current and current != plan and self._power.set_active(plan):
+                self._saved_power_plan = current
+                self._log("  План электропитания: Высокая производительность")
+        
+        return record
+    
+    def _revert(self, record: dict):
+        proc = record["process"]
+        self._log(f"Игра завершена: {record['name']}")
+        
+        if proc.is_running():
+            try:
+                proc.nice(record["nice"])
+                if record["affinity"]:
+                    proc.cpu_affinity(record["affinity"])
+            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError, ValueError):
+                pass
+        
+        remaining = [r for r in self.active.values() if r is not record]
+        if not remaining and self._saved_power_plan:
+            if self._power.set_active(self._saved_power_plan):
+                self._log("  План электропитания восстановлен")
+            self._saved_power_plan = None
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        
+        def loop():
+            if self._library is not None:
+                self._library.refresh()
+                self._log(f"  Библиотека игр: {len(self._library.entries)} установленных игр")
+            
+            while not self._stop.is_set():
+                try:
+                    self.poll()
+                except Exception as e:
+                    self._log(f"  Ошибка наблюдения за играми: {e}")
+                self._stop.wait(self.interval)
+        
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+        self._log("Автоматический игровой профиль включён")
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.interval + 1)
+            self._thread = None
+        
+        with self._lock:
+            for pid, record in list(self.active.items()):
+                self._revert(record)
+                del self.active[pid]
+            self._seen = {}
+        
+        self._log("Автоматический игровой профиль выключен")
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
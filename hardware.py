@@ -0,0 +1,370 @@
+import os
+import json
+import time
+import threading
+import psutil
+from typing import Callable, Optional
+
+
+INVENTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hardware_cache.json")
+
+
+def default_wmi_provider():
+    import pythoncom
+    import wmi
+    pythoncom.CoInitialize()
+    return wmi.WMI()
+
+
+def get_boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id", "r") as f:
+            return f.read().strip()
+    except OSError:
+        pass
+    
+    try:
+        return str(int(psutil.boot_time()))
+    except Exception:
+        return "unknown"
+
+
+class HardwareInventory:
+    
+    def __init__(
+        self,
+        wmi_provider: Optional[Callable] = None,
+        cache_file: str = INVENTORY_FILE,
+        boot_id: Optional[str] = None,
+        log_callback: Optional[Callable[[str], None]] = None
+    ):
+        self._log = log_callback or (lambda message: None)
+        self._wmi_provider = wmi_provider or default_wmi_provider
+        self._cache_file = cache_file
+        self._boot_id = boot_id or get_boot_id()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._data = None
+        self._is_fresh = False
+        self._started = False
+        self._refresh_thread = None
+        self.wmi_connections = 0
+    
+    def connection(self):
+        conn = getattr(self._local, "wmi", None)
+        if conn is None:
+            conn = self._wmi_provider()
+            self._local.wmi = conn
+            with self._lock:
+                self.wmi_connections += 1
+        return conn
+    
+    def load(self) -> bool:
+        try:
+            with open(self._cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        with self._lock:
+            self._data = data
+            self._is_fresh = data.get("boot_id") == self._boot_id
+        return True
+    
+    def start(self):
+        self._started = True
+        if self._data is None:
+            self.load()
+        if not self._is_fresh:
+            self.refresh_async()
+    
+    def refresh_async(self):
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+            self._refresh_thread.start()
+            return self._refresh_thread
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        thread = self._refresh_thread
+        if thread:
+            thread.join(timeout)
+        return self._is_fresh
+    
+    def refresh(self) -> dict:
+        try:
+            conn = self.connection()
+        except Exception as e:
+            self._log(f"  WMI недоступен: {e}")
+            return self.snapshot()
+        
+        data = {
+            "boot_id": self._boot_id,
+            "updated": time.time(),
+            "cpu": self._query(conn, "Win32_Processor", lambda p: {
+                "name": (p.Name or "").strip(),
+                "cores": p.NumberOfCores,
+                "threads": p.NumberOfLogicalProcessors,
+            }),
+            "gpu": self._query(conn, "Win32_VideoController", lambda g: {
+                "name": g.Name,
+                "driver_version": g.DriverVersion,
+                "vram_mb": int(g.AdapterRAM or 0) // (1024 * 1024),
+            }),
+            "disks": self._query(conn, "Win32_DiskDrive", lambda d: {
+                "model": d.Model,
+                "interface": d.InterfaceType,
+                "media_type": d.MediaType,
+                "size_gb": int(d.Size or 0) / (1024 ** 3),
+            }),
+            "nics": self._query(conn, "Win32_NetworkAdapter", lambda n: {
+                "name": n.Name,
+                "mac": n.MACAddress,
+                "speed": n.Speed,
+            }, PhysicalAdapter=True),
+        }
+        
+        with self._lock:
+            self._data = data
+            self._is_fresh = True
+        
+        self._save(data)
+        return data
+    
+    def _query(self, conn, wmi_class: str, convert, **filters) -> list:
+        items = []
+        try:
+            for obj in getattr(conn, wmi_class)(**filters):
+                try:
+                    items.append(convert(obj))
+                except Exception:
+                    pass
+        except Exception as e:
+            self._log(f"  Ошибка WMI {wmi_class}: {e}")
+        return items
+    
+    def _save(self, data: dict):
+        try:
+            tmp_file = self._cache_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self._cache_file)
+        except OSError:
+            pass
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._data) if self._data else {}
+    
+    def get(self, key: str, default=None):
+        if not self._started:
+            self.start()
+        with self._lock:
+            if not self._data:
+                return default
+            return self._data.get(key, default)
+    
+    def cpu_name(self) -> str:
+        cpus = self.get("cpu") or []
+        if cpus:
+            return cpus[0]["name"]
+        return "Unknown" if self._is_fresh else ""
+    
+    def gpu_name(self) -> str:
+        gpus = self.get("gpu") or []
+        if gpus:
+            return gpus[0]["name"]
+        return "Unknown" if self._is_fresh else ""
+    
+    @property
+    def is_fresh(self) -> bool:
+        return self._is_fresh
+
+
+CPU_SYSFS = "/sys/devices/system/cpu"
+
+
+def _parse_cpu_list(text: str) -> list:
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read_sysfs(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_hybrid_cpus(root: str = CPU_SYSFS) -> set:
+    cpus = _read_sysfs(os.path.normpath(os.path.join(root, "..", "..", "cpu_core", "cpus")))
+    return set(_parse_cpu_list(cpus)) if cpus else set()
+
+
+def _read_linux_topology(root: str = CPU_SYSFS) -> list:
+    online = _read_sysfs(os.path.join(root, "online"))
+    if online is None:
+        return []
+    
+    performance = _read_hybrid_cpus(root)
+    
+    cpus = []
+    for cpu in _parse_cpu_list(online):
+        base = os.path.join(root, f"cpu{cpu}")
+        core = _read_sysfs(os.path.join(base, "topology", "core_id"))
+        package = _read_sysfs(os.path.join(base, "topology", "physical_package_id"))
+        cache = _read_sysfs(os.path.join(base, "cache", "index3", "shared_cpu_list"))
+        capacity = _read_sysfs(os.path.join(base, "cpu_capacity"))
+        
+        if performance:
+            efficiency = 1 if cpu in performance else 0
+        else:
+            efficiency = int(capacity) if capacity and capacity.isdigit() else 0
+        
+        cpus.append({
+            "cpu": cpu,
+            "core": (int(package or 0), int(core if core is not None else cpu)),
+            "package": int(package or 0),
+            "cache_group": min(_parse_cpu_list(cache)) if cache else int(package or 0),
+            "efficiency": efficiency,
+        })
+    return cpus
+
+
+def _read_windows_topology() -> list:
+    import ctypes
+    import struct
+    
+    kernel32 = ctypes.windll.kernel32
+    length = ctypes.c_ulong(0)
+    kernel32.GetLogicalProcessorInformationEx(0xFFFF, None, ctypes.byref(length))
+    buffer = ctypes.create_string_buffer(length.value)
+    if not kernel32.GetLogicalProcessorInformationEx(0xFFFF, buffer, ctypes.byref(length)):
+        return []
+    
+    raw = buffer.raw[:length.value]
+    mask_size = ctypes.sizeof(ctypes.c_size_t)
+    mask_format = "Q" if mask_size == 8 else "I"
+    cores = []
+    caches = []
+    offset = 0
+    
+    while offset < len(raw):
+        relationship, size = struct.unpack_from("II", raw, offset)
+        body = offset + 8
+        if relationship == 0:
+            efficiency = raw[body + 1]
+            mask = struct.unpack_from(mask_format, raw, body + 24)[0]
+            cores.append((mask, efficiency))
+        elif relationship == 2 and raw[body] == 3:
+            mask = struct.unpack_from(mask_format, raw, body + 32)[0]
+            caches.append(mask)
+        offset += size
+    
+    cpus = []
+    for core_index, (mask, efficiency) in enumerate(cores):
+        for cpu in range(mask_size * 8):
+            if not mask & (1 << cpu):
+                continue
+            cache_group = next((c for c in caches if c & (1 << cpu)), 0)
+            cpus.append({
+                "cpu": cpu,
+                "core": (0, core_index),
+                "package": 0,
+                "cache_group": cache_group,
+                "efficiency": efficiency,
+            })
+    return sorted(cpus, key=lambda item: item["cpu"])
+
+
+def read_cpu_topology(root: str = CPU_SYSFS) -> list:
+    try:
+        if os.name == "nt":
+            cpus = _read_windows_topology()
+        else:
+            cpus = _read_linux_topology(root)
+    except Exception:
+        cpus = []
+    
+    if not cpus:
+        count = psutil.cpu_count() or 1
+        cpus = [
+            {"cpu": cpu, "core": (0, cpu), "package": 0, "cache_group": 0, "efficiency": 0}
+            for cpu in range(count)
+        ]
+    return cpus
+
+
+class AffinityPlanner:
+    
+    def __init__(self, topology: Optional[list] = None, background_cores: int = 1):
+        self.topology = topology if topology is not None else read_cpu_topology()
+        self.background_cores = background_cores
+    
+    def cores(self) -> dict:
+        cores = {}
+        for cpu in self.topology:
+            core = cores.setdefault(cpu["core"], {
+                "cpus": [],
+                "efficiency": cpu["efficiency"],
+                "cache_group": cpu["cache_group"],
+            })
+            core["cpus"].append(cpu["cpu"])
+        return cores
+    
+    def plan(self) -> dict:
+        cores = self.cores()
+        all_cpus = sorted(cpu["cpu"] for cpu in self.topology)
+        
+        if len(cores) <= 1:
+            return {"game": all_cpus, "background": all_cpus, "isolated": False}
+        
+        best_efficiency = max(core["efficiency"] for core in cores.values())
+        fast = {key: core for key, core in cores.items() if core["efficiency"] == best_efficiency}
+        
+        groups = {}
+        for key, core in fast.items():
+            groups.setdefault(core["cache_group"], []).append(key)
+        group = max(
+            groups.values(),
+            key=lambda keys: (len(keys), -min(min(cores[key]["cpus"]) for key in keys))
+        )
+        group.sort()
+        
+        slow_cores = len(cores) - len(fast) + (len(fast) - len(group))
+        reserve = max(0, self.background_cores - slow_cores)
+        reserve = min(reserve, len(group) - 1)
+        
+        game_cores = group[reserve:]
+        game = sorted(cpu for key in game_cores for cpu in cores[key]["cpus"])
+        background = [cpu for cpu in all_cpus if cpu not in set(game)]
+        
+        return {
+            "game": game,
+            "background": background or all_cpus,
+            "isolated": bool(background),
+            "game_cores": len(game_cores),
+            "smt": any(len(cores[key]["cpus"]) > 1 for key in game_cores),
+        }
+
+
+_affinity_plan = None
+_affinity_lock = threading.Lock()
+
+
+def get_affinity_plan() -> dict:
+    global _affinity_plan
+    with _affinity_lock:
+        if _affinity_plan is None:
+            _affinity_plan = AffinityPlanner().plan()
+        return _affinity_plan
@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+import statistics
+from typing import Callable, Optional
+
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_history.db")
+LEGACY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark.json")
+
+METRIC_COLUMNS = (
+    "cpu_usage",
+    "ram_percent",
+    "ram_available_gb",
+    "disk_read_speed",
+    "disk_write_speed",
+    "processes_count",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    tag TEXT NOT NULL DEFAULT '',
+    kind TEXT NOT NULL DEFAULT 'ambient',
+    cpu_usage REAL,
+    ram_percent REAL,
+    ram_available_gb REAL,
+    disk_read_speed REAL,
+    disk_write_speed REAL,
+    processes_count INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_tag_timestamp ON runs (tag, timestamp);
+"""
+
+KIND_TAGS = (
+    ("synthetic", "synthetic%"),
+    ("timer", "timer%"),
+    ("sched", "sched latency%"),
+    ("network", "network %"),
+    ("experiment", "experiment %"),
+)
+
+AGGREGATES = {
+    "median": statistics.median,
+    "mean": statistics.fmean,
+    "min": min,
+    "max": max,
+}
+
+
+class BenchmarkHistory:
+    
+    def __init__(
+        self,
+        db_file: str = HISTORY_FILE,
+        legacy_file: Optional[str] = LEGACY_FILE,
+        log_callback: Optional[Callable[[str], None]] = None
+    ):
+        self._db_file = db_file
+        self._legacy_file = legacy_file
+        self._log = log_callback or (lambda message: None)
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._ready = threading.Event()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_file, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+    
+    def _write_loop(self):
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+        self._import_legacy(conn)
+        self._ready.set()
+        
+        while True:
+            job, done = self._queue.get()
+            try:
+                job(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                self._log(f"  Ошибка записи истории бенчмарков: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+                self._queue.task_done()
+    
+    def _migrate(self, conn: sqlite3.Connection):
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(runs)")}
+        if "kind" not in columns:
+            conn.execute("ALTER TABLE runs ADD COLUMN kind TEXT NOT NULL DEFAULT 'ambient'")
+            for kind, pattern in KIND_TAGS:
+                conn.execute("UPDATE runs SET kind = ? WHERE tag LIKE ?", (kind, pattern))
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_kind_timestamp ON runs (kind, timestamp)")
+        conn.commit()
+    
+    def _import_legacy(self, conn: sqlite3.Connection):
+        if not self._legacy_file or not os.path.exists(self._legacy_file):
+            return
+        if conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+            return
+        try:
+            with open(self._legacy_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._insert(conn, data, "legacy")
+        conn.commit()
+    
+    def _insert(self, conn: sqlite3.Connection, result: dict, tag: str, kind: str = "ambient"):
+        values = [result.get(column) for column in METRIC_COLUMNS]
+        conn.execute(
+            f"INSERT INTO runs (timestamp, tag, kind, {', '.join(METRIC_COLUMNS)}, data) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in METRIC_COLUMNS)}, ?)",
+            [result.get("timestamp") or time.time(), tag or "", kind] + values + [json.dumps(result)]
+        )
+    
+    def _submit(self, job, wait: bool = False):
+        self._ensure_writer()
+        done = threading.Event() if wait else None
+        self._queue.put((job, done))
+        return done
+    
+    def append(self, result: dict, tag: str = "", kind: str = "ambient"):
+        self._submit(lambda conn: self._insert(conn, result, tag, kind))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self._submit(lambda conn: None, wait=True).wait(timeout)
+    
+    def _read(self, sql: str, params: tuple = ()) -> list:
+        self._ensure_writer()
+        self._ready.wait(10)
+        return self._connect().execute(sql, params).fetchall()
+    
+    def _decode(self, row: sqlite3.Row) -> dict:
+        data = json.loads(row["data"])
+        data.update(id=row["id"], tag=row["tag"], kind=row["kind"], timestamp=row["timestamp"])
+        return data
+    
+    def query(
+        self,
+        tag: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+        kind: Optional[str] = None
+    ) -> list:
+        where, params = self._filters(tag, since, until, kind)
+        sql = f"SELECT id, tag, kind, timestamp, data FROM runs {where} ORDER BY timestamp DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return [self._decode(row) for row in self._read(sql, params)]
+    
+    def latest(self, tag: Optional[str] = None, kind: Optional[str] = None) -> Optional[dict]:
+        runs = self.query(tag=tag, limit=1, kind=kind)
+        return runs[0] if runs else None
+    
+    def latest_matching(self, pattern: str, kind: Optional[str] = None) -> Optional[dict]:
+        where, params = self._filters(None, None, None, kind)
+        where += (" AND " if where else "WHERE ") + "tag LIKE ?"
+        rows = self._read(
+            f"SELECT id, tag, kind, timestamp, data FROM runs {where} ORDER BY timestamp DESC LIMIT 1",
+            params + (pattern,)
+        )
+        return self._decode(rows[0]) if rows else None
+    
+    def tags(self) -> list:
+        return [row["tag"] for row in self._read("SELECT DISTINCT tag FROM runs ORDER BY tag")]
+    
+    def aggregate(
+        self,
+        metric: str,
+        func: str = "median",
+        tag: Optional[str] = None,
+        last: Optional[int] = 30,
+        since: Optional[float] = None,
+        kind: Optional[str] = None
+    ) -> Optional[float]:
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Неизвестная метрика: {metric}")
+        where, params = self._filters(tag, since, None, kind)
+        where += (" AND " if where else "WHERE ") + f"{metric} IS NOT NULL"
+        sql = f"SELECT {metric} FROM runs {where} ORDER BY timestamp DESC"
+        if last:
+            sql += " LIMIT ?"
+            params += (last,)
+        values = [row[0] for row in self._read(sql, params)]
+        return AGGREGATES[func](values) if values else None
+    
+    def _filters(self, tag: Optional[str], since: Optional[float], until: Optional[float], kind: Optional[str] = None) -> tuple:
+        clauses, params = [], ()
+        if tag is not None:
+            clauses.append("tag = ?")
+            params += (tag,)
+        if kind is not None:
+            clauses.append("kind = ?")
+            params += (kind,)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params += (since,)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params += (until,)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
+    def compact(self, keep_days: float = 90, wait: bool = False):
+        cutoff = time.time() - keep_days * 86400
+        
+        def job(conn: sqlite3.Connection):
+            removed = conn.execute(
+                "DELETE FROM runs WHERE timestamp < ? AND id NOT IN ("
+                "SELECT MAX(id) FROM runs WHERE timestamp < ? "
+                "GROUP BY tag, CAST(timestamp / 86400 AS INTEGER))",
+                (cutoff, cutoff)
+            ).rowcount
+            conn.commit()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if removed:
+                self._log(f"  История бенчмарков: сжато {removed} записей")
+        
+        done = self._submit(job, wait=wait)
+        if done is not None:
+            done.wait()
+    
+    def count(self) -> int:
+        return self._read("SELECT COUNT(*) FROM runs")[0][0]
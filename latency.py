@@ -0,0 +1,267 @@
+import os
+import sys
+import json
+import time
+import threading
+import multiprocessing
+import psutil
+from typing import Optional
+
+from benchmarks import percentile, pin_process, start_load, stop_load
+
+
+HISTOGRAM_EDGES_US = (0, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000)
+
+DEFAULT_SLEEPS = (0.0001, 0.0005, 0.001, 0.002)
+
+
+def histogram(values_us: list, edges: tuple = HISTOGRAM_EDGES_US) -> list:
+    counts = [0] * len(edges)
+    for value in values_us:
+        index = len(edges) - 1
+        for i in range(1, len(edges)):
+            if value < edges[i]:
+                index = i - 1
+                break
+        counts[index] += 1
+    return counts
+
+
+def histogram_distance(a: list, b: list) -> float:
+    total_a, total_b = sum(a) or 1, sum(b) or 1
+    cdf_a = cdf_b = distance = 0.0
+    for count_a, count_b in zip(a, b):
+        cdf_a += count_a / total_a
+        cdf_b += count_b / total_b
+        distance = max(distance, abs(cdf_a - cdf_b))
+    return distance
+
+
+def pin_current_thread(cpu: int) -> bool:
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+            return True
+        if os.name == "nt":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetCurrentThread.restype = ctypes.c_void_p
+            kernel32.SetThreadAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            return bool(kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << cpu))
+    except (OSError, ValueError, AttributeError):
+        pass
+    return False
+
+
+def perf_counter_resolution(samples: int = 20000) -> float:
+    smallest = float("inf")
+    previous = time.perf_counter()
+    for _ in range(samples):
+        current = time.perf_counter()
+        if current > previous:
+            smallest = min(smallest, current - previous)
+        previous = current
+    return smallest * 1e9 if smallest != float("inf") else 0.0
+
+
+def _summarize_wakeups(overshoot_us: list) -> dict:
+    return {
+        "count": len(overshoot_us),
+        "p50_us": percentile(overshoot_us, 50),
+        "p99_us": percentile(overshoot_us, 99),
+        "max_us": max(overshoot_us) if overshoot_us else 0.0,
+        "histogram": histogram(overshoot_us),
+    }
+
+
+def _probe_core(cpu: Optional[int], sleeps: tuple, samples: int, budget: float, result: dict):
+    pinned = pin_current_thread(cpu) if cpu is not None else False
+    report = {"cpu": cpu, "pinned": pinned, "sleeps": {}}
+    all_overshoot = []
+    
+    for requested in sleeps:
+        actual_us = []
+        deadline = time.perf_counter() + budget
+        for _ in range(samples):
+            started = time.perf_counter()
+            time.sleep(requested)
+            finished = time.perf_counter()
+            actual_us.append((finished - started) * 1e6)
+            if finished > deadline:
+                break
+        overshoot = [value - requested * 1e6 for value in actual_us]
+        all_overshoot.extend(overshoot)
+        summary = _summarize_wakeups(overshoot)
+        summary["achieved_p50_us"] = percentile(actual_us, 50)
+        report["sleeps"][f"{requested * 1000:g}ms"] = summary
+    
+    report["perf_counter_ns"] = perf_counter_resolution()
+    report["wakeup"] = _summarize_wakeups(all_overshoot)
+    result[cpu] = report
+
+
+def timer_probe(
+    cpus: Optional[list] = None,
+    sleeps: tuple = DEFAULT_SLEEPS,
+    samples: int = 200,
+    budget: float = 0.5
+) -> dict:
+    if cpus is None:
+        try:
+            cpus = sorted(psutil.Process().cpu_affinity())
+        except (AttributeError, psutil.Error):
+            cpus = [None]
+    
+    started = time.perf_counter()
+    per_core = {}
+    for cpu in cpus:
+        thread = threading.Thread(target=_probe_core, args=(cpu, sleeps, samples, budget, per_core), daemon=True)
+        thread.start()
+        thread.join()
+    
+    combined = [0] * len(HISTOGRAM_EDGES_US)
+    for report in per_core.values():
+        combined = [a + b for a, b in zip(combined, report["wakeup"]["histogram"])]
+    
+    smallest = min(sleeps)
+    granularity = [r["sleeps"][f"{smallest * 1000:g}ms"]["achieved_p50_us"] for r in per_core.values()]
+    info = time.get_clock_info("perf_counter")
+    
+    return {
+        "timestamp": time.time(),
+        "platform": sys.platform,
+        "edges_us": list(HISTOGRAM_EDGES_US),
+        "sleep_granularity_us": max(granularity) if granularity else 0.0,
+        "perf_counter_ns": min(r["perf_counter_ns"] for r in per_core.values()),
+        "perf_counter_declared_ns": info.resolution * 1e9,
+        "p50_us": max(r["wakeup"]["p50_us"] for r in per_core.values()),
+        "p99_us": max(r["wakeup"]["p99_us"] for r in per_core.values()),
+        "max_us": max(r["wakeup"]["max_us"] for r in per_core.values()),
+        "histogram": combined,
+        "cores": [per_core[cpu] for cpu in cpus],
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+def compare_timer_probes(before: dict, after: dict) -> dict:
+    return {
+        "sleep_granularity_us": after["sleep_granularity_us"] - before["sleep_granularity_us"],
+        "p50_us": after["p50_us"] - before["p50_us"],
+        "p99_us": after["p99_us"] - before["p99_us"],
+        "max_us": after["max_us"] - before["max_us"],
+        "histogram_shift": histogram_distance(before["histogram"], after["histogram"]),
+    }
+
+
+def _cyclic_worker(cpu: Optional[int], interval: float, loops: int, queue):
+    pin_process([cpu] if cpu is not None else None)
+    samples = []
+    next_wake = time.perf_counter() + interval
+    for _ in range(loops):
+        delay = next_wake - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        latency = time.perf_counter() - next_wake
+        samples.append(latency * 1e6)
+        next_wake += interval
+        if latency > interval:
+            next_wake = time.perf_counter() + interval
+    queue.put(samples)
+
+
+LOAD_MODES = (None, "same", "others", "all")
+
+
+def _repin_load(workers: list, cpus: list):
+    for index, worker in enumerate(workers):
+        cpu = cpus[index % len(cpus)]
+        if cpu is None:
+            continue
+        try:
+            psutil.Process(worker.pid).cpu_affinity([cpu])
+        except (psutil.Error, AttributeError, ValueError, OSError):
+            pass
+
+
+def scheduling_latency_probe(
+    cpus: Optional[list] = None,
+    interval: float = 0.001,
+    duration: float = 1.0,
+    load: Optional[str] = None,
+    load_workers: Optional[int] = None
+) -> dict:
+    if load not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode: {load}")
+    all_cpus = sorted(psutil.Process().cpu_affinity()) if hasattr(psutil.Process, "cpu_affinity") else [None]
+    cpus = cpus if cpus is not None else all_cpus
+    loops = max(1, int(duration / interval))
+    ctx = multiprocessing.get_context()
+    cores = []
+    started = time.perf_counter()
+    
+    if load == "same":
+        count = load_workers or 1
+    elif load == "others":
+        count = load_workers or max(1, len(all_cpus) - 1)
+    else:
+        count = 0 if load is None else (load_workers or len(all_cpus))
+    
+    stop = ctx.Event()
+    workers = start_load(ctx, [[all_cpus[i % len(all_cpus)]] for i in range(count)], stop)
+    
+    try:
+        for cpu in cpus:
+            if load == "same":
+                _repin_load(workers, [cpu])
+            elif load == "others":
+                _repin_load(workers, [c for c in all_cpus if c != cpu] or all_cpus)
+            
+            queue = ctx.Queue()
+            probe = ctx.Process(target=_cyclic_worker, args=(cpu, interval, loops, queue), daemon=True)
+            probe.start()
+            try:
+                samples = queue.get(timeout=duration * 5 + 30)
+            except Exception:
+                samples = []
+            finally:
+                probe.join(5)
+            
+            cores.append({
+                "cpu": cpu,
+                "count": len(samples),
+                "min_us": min(samples) if samples else 0.0,
+                "avg_us": sum(samples) / len(samples) if samples else 0.0,
+                "p50_us": percentile(samples, 50),
+                "p99_us": percentile(samples, 99),
+                "max_us": max(samples) if samples else 0.0,
+                "overruns": sum(1 for value in samples if value > interval * 1e6),
+                "histogram": histogram(samples),
+            })
+    finally:
+        stop_load(workers, stop)
+    
+    return {
+        "timestamp": time.time(),
+        "interval_us": interval * 1e6,
+        "duration_s": duration,
+        "load": load,
+        "cores": [{k: v for k, v in core.items() if k != "histogram"} for core in cores],
+        "heatmap": {
+            "cpus": [core["cpu"] for core in cores],
+            "edges_us": list(HISTOGRAM_EDGES_US),
+            "counts": [core["histogram"] for core in cores],
+        },
+        "worst_p99_us": max((core["p99_us"] for core in cores), default=0.0),
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if "--cyclic" in sys.argv:
+        load = sys.argv[sys.argv.index("--load") + 1] if "--load" in sys.argv else None
+        result = scheduling_latency_probe(load=load)
+    else:
+        count = int(sys.argv[sys.argv.index("--samples") + 1]) if "--samples" in sys.argv else 200
+        result = timer_probe(samples=count)
+    print(json.dumps(result, indent=2))
@@ -1,17 +1,31 @@
-import customtkinter as ctk
-from tkinter import messagebox
-import threading
+import time
+
+_STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
-from datetime import datetime
-import psutil
 
 if getattr(sys, 'frozen', False):
     bundle_dir = sys._MEIPASS
     sys.path.insert(0, bundle_dir)
 
+_IMPORT_PROFILER = None
+if "--profile-startup" in sys.argv or "--startup-probe" in sys.argv:
+    from profiling import ImportProfiler
+    _IMPORT_PROFILER = ImportProfiler().install()
+
+import customtkinter as ctk
+from tkinter import messagebox
+import threading
+import json
+from datetime import datetime
+import psutil
+
 from optimizer import SystemOptimizer, ProcessOptimizer
-from updater import Updater, get_version
+from processes import ProcessRanker, get_shared_snapshot, priority_name
+from updater import get_version
+
+_IMPORTS_DONE = time.perf_counter()
 
 
 ctk.set_appearance_mode("dark")
@@ -34,6 +48,13 @@ TEXT_MAIN = "#00ff41"
 TEXT_DIM = "#00aa2a"
 TEXT_BRIGHT = "#33ff66"
 
+REDRAW_STATS = {"applied": 0, "avoided": 0}
+
+PROCESS_PANEL_LIMIT = 20
+PROCESS_PANEL_INTERVAL = 1.0
+PROCESS_PANEL_MAX_INTERVAL = 5.0
+PROCESS_PANEL_CPU_BUDGET = 3.0
+
 
 class NeonFrame(ctk.CTkFrame):
     
@@ -107,9 +128,23 @@ class SystemCard(NeonFrame):
             text_color=glow
         )
         self.value_label.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="w")
+        self._last_text = value
+        self._last_color = glow
     
-    def update_value(self, value: str):
-        self.value_label.configure(text=value)
+    def update_value(self, value: str, color: str = None):
+        changes = {}
+        if value != self._last_text:
+            changes["text"] = value
+            self._last_text = value
+        if color and color != self._last_color:
+            changes["text_color"] = color
+            self._last_color = color
+        
+        if changes:
+            self.value_label.configure(**changes)
+            REDRAW_STATS["applied"] += 1
+        else:
+            REDRAW_STATS["avoided"] += 1
 
 
 class ProgressCard(NeonFrame):
@@ -146,14 +181,49 @@ class ProgressCard(NeonFrame):
             text_color=glow
         )
         self.value_label.grid(row=2, column=0, padx=10, pady=(3, 10), sticky="w")
+        self._last_text = f"{value:.1f}%"
+        self._last_color = glow
+        self._last_pixel = self._to_pixel(value)
+    
+    def _to_pixel(self, value: float) -> int:
+        width = self.progress.winfo_width()
+        if width <= 1:
+            width = self.progress.cget("width")
+        return round(max(0.0, min(value, 100.0)) / 100 * width)
     
     def update_value(self, value: float, color: str = None):
-        self.progress.set(value / 100)
-        self.value_label.configure(text=f"{value:.1f}%")
-        if color:
+        text = f"{value:.1f}%"
+        pixel = self._to_pixel(value)
+        redrawn = 0
+        
+        if pixel != self._last_pixel:
+            self.progress.set(value / 100)
+            self._last_pixel = pixel
+            redrawn += 1
+        else:
+            REDRAW_STATS["avoided"] += 1
+        
+        label_changes = {}
+        if text != self._last_text:
+            label_changes["text"] = text
+            self._last_text = text
+        
+        if color and color != self._last_color:
+            label_changes["text_color"] = color
             self.progress.configure(progress_color=color, border_color=color)
-            self.value_label.configure(text_color=color)
             self.configure(border_color=color)
+            self._last_color = color
+            redrawn += 2
+        else:
+            REDRAW_STATS["avoided"] += 2
+        
+        if label_changes:
+            self.value_label.configure(**label_changes)
+            redrawn += 1
+        else:
+            REDRAW_STATS["avoided"] += 1
+        
+        REDRAW_STATS["applied"] += redrawn
 
 
 class HackerToolButton(NeonFrame):
@@ -199,6 +269,157 @@ class HackerToolButton(NeonFrame):
             self._command()
 
 
+class LazySection(ctk.CTkFrame):
+    
+    def __init__(self, master, title: str, builder, glow=NEON_GREEN, **kwargs):
+        kwargs.setdefault('fg_color', "transparent")
+        super().__init__(master, **kwargs)
+        
+        self._title = title
+        self._builder = builder
+        self._expanded = False
+        self.body = None
+        
+        self.toggle_btn = CyberButton(
+            self,
+            text=f"▸ {title}",
+            neon_color=glow,
+            height=30,
+            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
+            command=self.toggle
+        )
+        self.toggle_btn.pack(fill="x")
+    
+    def toggle(self):
+        if self.body is None:
+            self.body = ctk.CTkFrame(self, fg_color="transparent")
+            self._builder(self.body)
+        
+        if self._expanded:
+            self.body.pack_forget()
+            self.toggle_btn.configure(text=f"▸ {self._title}")
+        else:
+            self.body.pack(fill="x", pady=(4, 0))
+            self.toggle_btn.configure(text=f"▾ {self._title}")
+        
+        self._expanded = not self._expanded
+    
+    @property
+    def expanded(self) -> bool:
+        return self._expanded
+
+
+class ProcessRow(ctk.CTkFrame):
+    
+    COLUMNS = (("pid", 60), ("name", 200), ("cpu", 70), ("ram", 90), ("io", 90), ("prio", 100))
+    
+    def __init__(self, master, on_select=None, header: bool = False, **kwargs):
+        kwargs.setdefault('fg_color', "transparent")
+        kwargs.setdefault('corner_radius', 4)
+        super().__init__(master, **kwargs)
+        
+        self.pid = None
+        self.index = None
+        self._on_select = on_select
+        self._cells = {}
+        self._values = {}
+        
+        for col, (key, width) in enumerate(self.COLUMNS):
+            label = ctk.CTkLabel(
+                self,
+                text=key.upper() if header else "",
+                width=width,
+                anchor="w",
+                font=ctk.CTkFont(family="Consolas", size=11, weight="bold" if header else "normal"),
+                text_color=TEXT_DIM if header else NEON_GREEN
+            )
+            label.grid(row=0, column=col, padx=4, sticky="w")
+            if on_select:
+                label.bind("<Button-1>", self._on_click)
+            self._cells[key] = label
+        
+        if on_select:
+            self.bind("<Button-1>", self._on_click)
+    
+    def _on_click(self, event):
+        if self.pid is not None:
+            self._on_select(self.pid)
+    
+    def set_values(self, values: dict):
+        for key, text in values.items():
+            if self._values.get(key) == text:
+                REDRAW_STATS["avoided"] += 1
+                continue
+            self._cells[key].configure(text=text)
+            self._values[key] = text
+            REDRAW_STATS["applied"] += 1
+    
+    def set_selected(self, selected: bool):
+        self.configure(fg_color=BG_DARKER if selected else "transparent")
+
+
+class ProcessTable(NeonFrame):
+    
+    def __init__(self, master, glow=NEON_CYAN, **kwargs):
+        super().__init__(master, glow_color=glow, **kwargs)
+        
+        self.grid_columnconfigure(0, weight=1)
+        ProcessRow(self).grid(row=0, column=0, padx=6, pady=(6, 2), sticky="ew")
+        
+        self._rows = {}
+        self._free = []
+        self.selected_pid = None
+    
+    def _select(self, pid: int):
+        previous = self._rows.get(self.selected_pid)
+        if previous:
+            previous.set_selected(False)
+        self.selected_pid = pid
+        self._rows[pid].set_selected(True)
+    
+    def update_rows(self, rows: list) -> dict:
+        stats = {"added": 0, "removed": 0, "moved": 0}
+        pids = {row['pid'] for row in rows}
+        
+        for pid in [pid for pid in self._rows if pid not in pids]:
+            row = self._rows.pop(pid)
+            row.grid_forget()
+            row.set_selected(False)
+            row.pid = None
+            row.index = None
+            self._free.append(row)
+            stats["removed"] += 1
+            if pid == self.selected_pid:
+                self.selected_pid = None
+        
+        for index, data in enumerate(rows):
+            pid = data['pid']
+            row = self._rows.get(pid)
+            
+            if row is None:
+                row = self._free.pop() if self._free else ProcessRow(self, on_select=self._select)
+                row.pid = pid
+                self._rows[pid] = row
+                stats["added"] += 1
+            
+            if row.index != index:
+                row.grid(row=index + 1, column=0, padx=6, pady=0, sticky="ew")
+                row.index = index
+                stats["moved"] += 1
+            
+            io_rate = data.get('io_read_rate', 0.0) + data.get('io_write_rate', 0.0)
+            row.set_values({
+                "pid": str(pid),
+                "name": (data.get('name') or "?")[:26],
+                "cpu": f"{data.get('cpu_percent') or 0.0:.1f}%",
+                "ram": f"{(data.get('rss') or 0) / (1024 * 1024):.0f} MB",
+                "io": f"{io_rate / 1024:.0f} KB/s",
+                "prio": priority_name(data.get('nice')),
+            })
+        
+        return stats
+
+
 class OptimizerApp(ctk.CTk):
     
     def __init__(self):
@@ -210,17 +431,95 @@ class OptimizerApp(ctk.CTk):
         
         self.configure(fg_color=BG_DARK)
         
+        self.startup_metrics = {
+            "import_ms": (_IMPORTS_DONE - _STARTUP_T0) * 1000,
+            "first_paint_ms": None,
+            "interactive_ms": None,
+        }
+        self._tools_built = False
+        self.optimizer = None
+        self.backend_error = None
+        self._updater = None
+        self.game_watcher = None
+        self.throttler = None
+        self.policy_engine = None
+        self.leak_detector = None
+        
         self._setup_grid()
         self._create_sidebar()
         self._create_main_area()
         
-        self.optimizer = SystemOptimizer(log_callback=self._log)
         self.process_optimizer = ProcessOptimizer(log_callback=self._log)
-        self.updater = Updater(log_callback=self._log)
         
         self._is_running = False
-        self._update_system_info()
+        self._init_backend()
         self._start_monitoring()
+        self.after(0, lambda: self.after_idle(self._on_first_paint))
+    
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - _STARTUP_T0) * 1000
+    
+    def _init_backend(self):
+        def build():
+            try:
+                optimizer = SystemOptimizer(log_callback=self._log)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                self.after(0, lambda: self._on_backend_failed(error))
+                return
+            self.after(0, lambda: self._on_backend_ready(optimizer))
+        
+        threading.Thread(target=build, daemon=True).start()
+    
+    def _on_backend_ready(self, optimizer):
+        self.optimizer = optimizer
+        self._update_system_info()
+        self._check_interactive()
+        
+        from memory import LeakDetector
+        self.leak_detector = LeakDetector(log_callback=self._log)
+        self.leak_detector.start()
+    
+    def _on_backend_failed(self, error: str):
+        self.backend_error = error
+        self.startup_metrics["error"] = error
+        self._log(f"✕ [ERROR] Backend init failed: {error}")
+        self.status_label.configure(text="[✕✕✕✕✕✕✕✕✕✕] BACKEND FAILED", text_color=NEON_RED)
+    
+    def _on_first_paint(self):
+        self.startup_metrics["first_paint_ms"] = self._elapsed_ms()
+        self._build_tools()
+        self._check_interactive()
+    
+    def _check_interactive(self):
+        if self.startup_metrics["interactive_ms"] is not None:
+            return
+        if self.optimizer is None or not self._tools_built:
+            return
+        
+        self.startup_metrics["interactive_ms"] = self._elapsed_ms()
+        self._log(
+            f"> Startup: first paint {self.startup_metrics['first_paint_ms']:.0f} ms, "
+            f"interactive {self.startup_metrics['interactive_ms']:.0f} ms"
+        )
+        
+        if _IMPORT_PROFILER:
+            self._log_import_profile()
+    
+    def _log_import_profile(self):
+        self._log(
+            f"> Imports: {self.startup_metrics['import_ms']:.0f} ms "
+            f"({len(_IMPORT_PROFILER.records)} modules)"
+        )
+        for item in _IMPORT_PROFILER.top_level_summary(top=10):
+            self._log(f"  {item['package']:<24} {item['ms']:>8.1f} ms")
+    
+    @property
+    def updater(self):
+        if self._updater is None:
+            from updater import Updater
+            self._updater = Updater(log_callback=self._log)
+        return self._updater
     
     def _setup_grid(self):
         self.grid_columnconfigure(0, weight=0, minsize=280)
@@ -294,52 +593,40 @@ class OptimizerApp(ctk.CTk):
             btn.pack(fill="x", padx=15, pady=4)
             setattr(self, f'btn_{i}', btn)
         
-        ctk.CTkLabel(
-            self.sidebar,
-            text="━" * 24,
-            font=ctk.CTkFont(family="Consolas", size=10),
-            text_color=TEXT_DIM
-        ).pack(pady=(10, 5))
-        
-        self.benchmark_btn = CyberButton(
+        self.game_watch_btn = CyberButton(
             self.sidebar,
-            text="📊 БЕНЧМАРК",
-            neon_color=NEON_CYAN,
-            height=35,
-            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
-            command=self._run_benchmark
+            text="🎮 АВТО-ПРОФИЛЬ: ВЫКЛ",
+            neon_color=NEON_PURPLE,
+            height=38,
+            font=ctk.CTkFont(family="Consolas", size=12, weight="bold"),
+            command=self._toggle_game_watcher
         )
-        self.benchmark_btn.pack(fill="x", padx=15, pady=3)
+        self.game_watch_btn.pack(fill="x", padx=15, pady=4)
         
-        self.rollback_btn = CyberButton(
+        self.policy_btn = CyberButton(
             self.sidebar,
-            text="↩ ОТКАТ ИЗМЕНЕНИЙ",
-            neon_color=NEON_RED,
-            height=35,
-            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
-            command=self._run_rollback
+            text="⚙ ПОЛИТИКИ: ВЫКЛ",
+            neon_color=NEON_PURPLE,
+            height=38,
+            font=ctk.CTkFont(family="Consolas", size=12, weight="bold"),
+            command=self._toggle_policy_engine
         )
-        self.rollback_btn.pack(fill="x", padx=15, pady=3)
+        self.policy_btn.pack(fill="x", padx=15, pady=4)
         
-        self.open_logs_btn = CyberButton(
+        ctk.CTkLabel(
             self.sidebar,
-            text="📄 ОТКРЫТЬ ЛОГИ",
-            neon_color=NEON_ORANGE,
-            height=35,
-            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
-            command=self._open_logs
-        )
-        self.open_logs_btn.pack(fill="x", padx=15, pady=3)
+            text="━" * 24,
+            font=ctk.CTkFont(family="Consolas", size=10),
+            text_color=TEXT_DIM
+        ).pack(pady=(10, 5))
         
-        self.update_btn = CyberButton(
+        self.service_section = LazySection(
             self.sidebar,
-            text="🔄 ПРОВЕРИТЬ ОБНОВЛЕНИЯ",
-            neon_color=NEON_GREEN,
-            height=35,
-            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
-            command=self._check_updates
+            "СЕРВИС",
+            self._build_service_buttons,
+            glow=NEON_CYAN
         )
-        self.update_btn.pack(fill="x", padx=15, pady=3)
+        self.service_section.pack(fill="x", padx=15, pady=3)
         
         stats_frame = NeonFrame(self.sidebar, glow_color=NEON_GREEN)
         stats_frame.pack(fill="x", padx=15, pady=(15, 10))
@@ -383,6 +670,47 @@ class OptimizerApp(ctk.CTk):
             text_color=TEXT_DIM
         ).pack()
     
+    def _build_service_buttons(self, parent):
+        self.benchmark_btn = CyberButton(
+            parent,
+            text="📊 БЕНЧМАРК",
+            neon_color=NEON_CYAN,
+            height=35,
+            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
+            command=self._run_benchmark
+        )
+        self.benchmark_btn.pack(fill="x", pady=3)
+        
+        self.rollback_btn = CyberButton(
+            parent,
+            text="↩ ОТКАТ ИЗМЕНЕНИЙ",
+            neon_color=NEON_RED,
+            height=35,
+            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
+            command=self._run_rollback
+        )
+        self.rollback_btn.pack(fill="x", pady=3)
+        
+        self.open_logs_btn = CyberButton(
+            parent,
+            text="📄 ОТКРЫТЬ ЛОГИ",
+            neon_color=NEON_ORANGE,
+            height=35,
+            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
+            command=self._open_logs
+        )
+        self.open_logs_btn.pack(fill="x", pady=3)
+        
+        self.update_btn = CyberButton(
+            parent,
+            text="🔄 ПРОВЕРИТЬ ОБНОВЛЕНИЯ",
+            neon_color=NEON_GREEN,
+            height=35,
+            font=ctk.CTkFont(family="Consolas", size=11, weight="bold"),
+            command=self._check_updates
+        )
+        self.update_btn.pack(fill="x", pady=3)
+    
     def _create_main_area(self):
         self.main_area = ctk.CTkScrollableFrame(self, fg_color="transparent", scrollbar_button_color=NEON_GREEN, scrollbar_button_hover_color=NEON_CYAN)
         self.main_area.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
@@ -439,9 +767,15 @@ class OptimizerApp(ctk.CTk):
             text_color=NEON_GREEN
         ).grid(row=3, column=0, columnspan=4, sticky="w", pady=(15, 8))
         
-        tools_frame = ctk.CTkFrame(self.main_area, fg_color="transparent")
-        tools_frame.grid(row=4, column=0, columnspan=4, sticky="ew")
-        tools_frame.grid_columnconfigure((0, 1), weight=1, uniform="tools")
+        self.tools_frame = ctk.CTkFrame(self.main_area, fg_color="transparent")
+        self.tools_frame.grid(row=4, column=0, columnspan=4, sticky="ew")
+        self.tools_frame.grid_columnconfigure((0, 1), weight=1, uniform="tools")
+        
+        self._create_terminal()
+    
+    def _build_tools(self):
+        if self._tools_built:
+            return
         
         tools = [
             ("ULTIMATE_OPT", "Max FPS + Min Input Lag", "★", self._run_ultimate_optimization, NEON_CYAN),
@@ -458,16 +792,153 @@ class OptimizerApp(ctk.CTk):
             ("CORE_UNPARK", "100% CPU cores active", "●", self._run_core_unpark, NEON_GREEN),
             ("KILL_BG_APPS", "Disable background apps", "✕", self._run_disable_bg_apps, NEON_RED),
             ("KILL_SERVICES", "Disable telemetry", "⚡", self._run_services_optimization, NEON_YELLOW),
+            ("RAM_ANALYSIS", "USS/PSS по приложениям", "▤", self._run_memory_analysis, NEON_CYAN),
+            ("SYNTH_BENCH", "CPU/RAM/Disk/Scheduler", "⏱", self._run_synthetic_benchmark, NEON_PURPLE),
+            ("TIMER_PROBE", "Sleep jitter / timer resolution", "◴", self._run_timer_probe, NEON_YELLOW),
+            ("SCHED_LATENCY", "Per-core wakeup latency", "▥", self._run_sched_latency, NEON_GREEN),
+            ("NET_LATENCY", "TCP/UDP RTT + jitter", "⇄", self._run_network_benchmark, NEON_CYAN),
         ]
         
         for i, (title, desc, icon, cmd, color) in enumerate(tools):
             row = i // 2
             col = i % 2
             HackerToolButton(
-                tools_frame, title, desc, icon, cmd, glow=color
+                self.tools_frame, title, desc, icon, cmd, glow=color
             ).grid(row=row, column=col, padx=3, pady=3, sticky="ew")
         
-        self._create_terminal()
+        self._tools_built = True
+    
+    def _create_process_section(self):
+        self.process_section = LazySection(
+            self.main_area,
+            "PROCESS MONITOR",
+            self._build_process_panel,
+            glow=NEON_CYAN
+        )
+        self.process_section.grid(row=7, column=0, columnspan=4, sticky="ew", pady=(0, 10))
+    
+    def _build_process_panel(self, parent):
+        actions = ctk.CTkFrame(parent, fg_color="transparent")
+        actions.pack(fill="x", pady=(0, 4))
+        
+        for text, priority, color in [
+            ("▲ BOOST", "high", NEON_GREEN),
+            ("▼ LOWER", "below_normal", NEON_YELLOW),
+        ]:
+            CyberButton(
+                actions,
+                text=text,
+                neon_color=color,
+                height=30,
+                width=110,
+                command=lambda p=priority: self._run_process_action(
+                    lambda pid: self.process_optimizer.set_process_priority(pid, p)
+                )
+            ).pack(side="left", padx=(0, 6))
+        
+        CyberButton(
+            actions,
+            text="◉ AFFINITY",
+            neon_color=NEON_CYAN,
+            height=30,
+            width=110,
+            command=lambda: self._run_process_action(self.process_optimizer.set_process_affinity)
+        ).pack(side="left", padx=(0, 6))
+        
+        CyberButton(
+            actions,
+            text="✕ KILL",
+            neon_color=NEON_RED,
+            height=30,
+            width=110,
+            command=self._terminate_selected_process
+        ).pack(side="left", padx=(0, 6))
+        
+        CyberButton(
+            actions,
+            text="▤ APPS",
+            neon_color=NEON_PURPLE,
+            height=30,
+            width=110,
+            command=lambda: self._run_in_thread(self._log_heavy_applications, needs_optimizer=False)
+        ).pack(side="left", padx=(0, 6))
+        
+        self.process_stats_label = ctk.CTkLabel(
+            actions,
+            text="",
+            font=ctk.CTkFont(family="Consolas", size=10),
+            text_color=TEXT_DIM
+        )
+        self.process_stats_label.pack(side="right")
+        
+        self.process_table = ProcessTable(parent)
+        self.process_table.pack(fill="x")
+        
+        self._start_process_monitor()
+    
+    def _run_process_action(self, action):
+        pid = self.process_table.selected_pid
+        if pid is None:
+            self._log("⚠ [WARN] Select a process first")
+            return
+        self._run_in_thread(lambda: action(pid), needs_optimizer=False)
+    
+    def _log_heavy_applications(self):
+        self._log("> Top applications (process trees):")
+        for app in self.process_optimizer.get_resource_heavy_applications(limit=10):
+            self._log(
+                f"  {app['app']:<24} x{app['processes']:<3} CPU {app['cpu']:5.1f}%  "
+                f"RAM {app['rss'] / (1024 * 1024):6.0f} MB  thr {app['threads']:<4} "
+                f"h {app['handles']:<5} IO {app['io_rate'] / 1024:7.0f} KB/s"
+            )
+    
+    def _terminate_selected_process(self):
+        pid = self.process_table.selected_pid
+        if pid is None:
+            self._log("⚠ [WARN] Select a process first")
+            return
+        
+        if messagebox.askyesno("⚠ TERMINATE", f"Завершить процесс PID {pid}?"):
+            self._run_process_action(self.process_optimizer.terminate_process)
+    
+    def _start_process_monitor(self):
+        ranker = ProcessRanker(get_shared_snapshot(), score="weighted", limit=PROCESS_PANEL_LIMIT)
+        
+        def loop():
+            me = psutil.Process()
+            me.cpu_percent(None)
+            interval = PROCESS_PANEL_INTERVAL
+            
+            while True:
+                if self.process_section.expanded:
+                    top = ranker.update(max_age=interval / 2)
+                    scan_ms = get_shared_snapshot().scan_ms
+                    app_cpu = me.cpu_percent(None)
+                    
+                    if app_cpu > PROCESS_PANEL_CPU_BUDGET:
+                        interval = min(interval * 2, PROCESS_PANEL_MAX_INTERVAL)
+                    elif app_cpu < PROCESS_PANEL_CPU_BUDGET / 2:
+                        interval = max(interval / 2, PROCESS_PANEL_INTERVAL)
+                    
+                    try:
+                        self.after(0, lambda t=top, s=scan_ms, c=app_cpu, i=interval: self._render_processes(t, s, c, i))
+                    except RuntimeError:
+                        return
+                
+                time.sleep(interval)
+        
+        threading.Thread(target=loop, daemon=True).start()
+    
+    def _render_processes(self, top: list, scan_ms: float, app_cpu: float, interval: float):
+        started = time.perf_counter()
+        self.process_table.update_rows(top)
+        ui_ms = (time.perf_counter() - started) * 1000
+        
+        color = TEXT_DIM if app_cpu <= PROCESS_PANEL_CPU_BUDGET else NEON_YELLOW
+        self.process_stats_label.configure(
+            text=f"scan {scan_ms:.0f} ms | ui {ui_ms:.0f} ms | app CPU {app_cpu:.1f}% | {interval:.0f}s",
+            text_color=color
+        )
     
     def _create_terminal(self):
         ctk.CTkLabel(
@@ -484,6 +955,8 @@ class OptimizerApp(ctk.CTk):
         self.log_text = TerminalText(log_frame, height=120, wrap="word")
         self.log_text.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
         
+        self._create_process_section()
+        
         self._log("╔═══════════════════════════════════════════════╗")
         self._log("║  YALOKGAR SYSTEM OPTIMIZER v2.0               ║")
         self._log("║  [READY] All modules loaded                   ║")
@@ -503,6 +976,9 @@ class OptimizerApp(ctk.CTk):
             self.log_text.see("end")
     
     def _update_system_info(self):
+        if self.optimizer is None:
+            return
+        
         try:
             info = self.optimizer.get_system_info()
             
@@ -536,11 +1012,19 @@ class OptimizerApp(ctk.CTk):
         
         self.after(1000, update_loop)
     
-    def _run_in_thread(self, func, button=None):
+    def _run_in_thread(self, func, button=None, needs_optimizer: bool = True):
         if self._is_running:
             self._log("⚠ [WARN] Operation already in progress...")
             return
         
+        if needs_optimizer and self.backend_error:
+            self._log(f"✕ [ERROR] Backend unavailable: {self.backend_error}")
+            return
+        
+        if needs_optimizer and self.optimizer is None:
+            self._log("⚠ [WARN] Modules are still loading, try again in a moment...")
+            return
+        
         def task():
             self._is_running = True
             self.status_label.configure(text="[▓▓▓▓▓░░░░░] WORKING", text_color=NEON_YELLOW)
@@ -578,6 +1062,10 @@ class OptimizerApp(ctk.CTk):
         self._log("> Executing RAM_OPTIMIZE...")
         self._run_in_thread(lambda: self.optimizer.optimize_ram())
     
+    def _run_memory_analysis(self):
+        self._log("> Executing RAM_ANALYSIS...")
+        self._run_in_thread(lambda: self.optimizer.analyze_memory())
+    
     def _run_game_mode(self):
         self._log("> Executing GAME_MODE activation...")
         self._run_in_thread(lambda: self.optimizer.enable_game_mode())
@@ -692,19 +1180,101 @@ class OptimizerApp(ctk.CTk):
     
     def _run_cpu_affinity(self):
         self._log("> Executing CPU_AFFINITY optimization...")
-        self._run_in_thread(lambda: self.optimizer.set_cpu_affinity())
+        self._run_in_thread(self._cpu_affinity_with_validation)
+    
+    def _cpu_affinity_with_validation(self):
+        from benchmarks import validate_affinity_plan
+        
+        result = self.optimizer.set_cpu_affinity()
+        plan = result.get("plan") or {}
+        if not plan.get("isolated"):
+            return
+        
+        self._log("> Validating affinity plan (scheduling jitter)...")
+        report = validate_affinity_plan(plan, duration=1.5)
+        before, after = report["before"], report["after"]
+        if not before.get("count") or not after.get("count"):
+            self._log("⚠ [WARN] Latency probe failed")
+            return
+        self._log(f"  p99 wakeup: {before['p99_us']:.0f} -> {after['p99_us']:.0f} us")
+        self._log(f"  jitter: {before['jitter_us']:.0f} -> {after['jitter_us']:.0f} us ({report['improvement_pct']:+.1f}%)")
     
     def _run_disable_prefetch(self):
         self._log("> Executing PREFETCH/SUPERFETCH disable...")
         self._run_in_thread(lambda: self.optimizer.optimize_prefetch(enable=False))
     
+    def _run_synthetic_benchmark(self):
+        self._log("> Executing SYNTH_BENCH...")
+        self._run_in_thread(lambda: self.optimizer.run_synthetic_benchmark())
+    
+    def _run_timer_probe(self):
+        self._log("> Executing TIMER_PROBE...")
+        self._run_in_thread(lambda: self.optimizer.probe_timer())
+    
+    def _run_sched_latency(self):
+        self._log("> Executing SCHED_LATENCY...")
+        self._run_in_thread(lambda: self.optimizer.probe_scheduling_latency())
+    
+    def _run_network_benchmark(self):
+        self._log("> Executing NET_LATENCY...")
+        self._run_in_thread(lambda: self.optimizer.benchmark_network())
+    
     def _run_trim(self):
         self._log("> Executing SSD TRIM optimization...")
-        self._run_in_thread(lambda: self.optimizer.run_trim())
+        self._run_in_thread(lambda: self.optimizer.run_trim(benchmark=True))
+    
+    def _toggle_game_watcher(self):
+        if self.game_watcher is None:
+            from games import GameLibrary, GameWatcher
+            from throttler import BackgroundThrottler
+            self.game_watcher = GameWatcher(library=GameLibrary(), log_callback=self._log)
+            self.throttler = BackgroundThrottler(
+                foreground=lambda: list(self.game_watcher.active),
+                log_callback=self._log
+            )
+        
+        if self.game_watcher.running:
+            self.game_watch_btn.configure(text="🎮 АВТО-ПРОФИЛЬ: ВЫКЛ")
+            
+            def stop():
+                self.throttler.stop()
+                self.game_watcher.stop()
+            
+            threading.Thread(target=stop, daemon=True).start()
+        else:
+            self.game_watch_btn.configure(text="🎮 АВТО-ПРОФИЛЬ: ВКЛ")
+            self.game_watcher.start()
+            self.throttler.start()
+    
+    def _toggle_policy_engine(self):
+        if self.policy_engine is None:
+            from policies import PolicyEngine
+            self.policy_engine = PolicyEngine(log_callback=self._log)
+        
+        if self.policy_engine.running:
+            self.policy_btn.configure(text="⚙ ПОЛИТИКИ: ВЫКЛ")
+            stats = self.policy_engine.stats
+            fired = ", ".join(f"{name}: {count}" for name, count in self.policy_engine.rule_stats.items() if count)
+            self._log(f"> Policies: {stats['applied']} applied to {stats['new']} new processes, {stats['total_ms']:.1f} ms total")
+            if fired:
+                self._log(f"  {fired}")
+            threading.Thread(target=self.policy_engine.stop, daemon=True).start()
+        else:
+            self.policy_btn.configure(text="⚙ ПОЛИТИКИ: ВКЛ")
+            self.policy_engine.start()
     
     def _run_benchmark(self):
         self._log("> Executing BENCHMARK...")
-        self._run_in_thread(lambda: self.optimizer.run_benchmark_comparison())
+        self._log(f"> UI redraws: {REDRAW_STATS['applied']} applied, {REDRAW_STATS['avoided']} avoided")
+        self._run_in_thread(self._benchmark_with_history)
+    
+    def _benchmark_with_history(self):
+        result = self.optimizer.run_benchmark_comparison()
+        tag = result["tag"]
+        self.optimizer.history.flush(5)
+        median = self.optimizer.history.aggregate("cpu_usage", tag=tag, last=30, kind="ambient")
+        if median is not None:
+            self._log(f"> CPU median over last 30 '{tag}' runs: {median:.1f}%")
     
     def _run_rollback(self):
         result = messagebox.askyesno(
@@ -724,7 +1294,7 @@ class OptimizerApp(ctk.CTk):
             self._run_in_thread(lambda: self.optimizer.rollback_all())
     
     def _open_logs(self):
-        log_path = self.optimizer.get_log_file_path()
+        log_path = self.optimizer.get_log_file_path() if self.optimizer else None
         if log_path and os.path.exists(log_path):
             self._log(f"> Opening logs: {log_path}")
             os.startfile(os.path.dirname(log_path))
@@ -756,7 +1326,7 @@ class OptimizerApp(ctk.CTk):
                     f"У вас последняя версия: v{result['current_version']}"
                 ))
         
-        self._run_in_thread(check_task, self.update_btn)
+        self._run_in_thread(check_task, self.update_btn, needs_optimizer=False)
     
     def _prompt_update(self, result):
         answer = messagebox.askyesno(
@@ -797,7 +1367,7 @@ class OptimizerApp(ctk.CTk):
                     "Не удалось загрузить обновление"
                 ))
         
-        self._run_in_thread(update_task, self.update_btn)
+        self._run_in_thread(update_task, self.update_btn, needs_optimizer=False)
     
     def _show_restart_dialog(self):
         answer = messagebox.askyesno(
@@ -815,6 +1385,21 @@ class OptimizerApp(ctk.CTk):
         os.execl(python, python, *sys.argv)
 
 
+def _report_startup_probe(app):
+    if app.startup_metrics["interactive_ms"] is None and app.backend_error is None:
+        app.after(50, lambda: _report_startup_probe(app))
+        return
+    
+    print(json.dumps(app.startup_metrics), flush=True)
+    app.destroy()
+
+
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = OptimizerApp()
-    app.mainloop()
\ No newline at end of file
+    if "--startup-probe" in sys.argv:
+        _report_startup_probe(app)
+    app.mainloop()
+    if "--startup-probe" in sys.argv and app.backend_error:
+        sys.exit(1)
\ No newline at end of file
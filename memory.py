@@ -0,0 +1,320 @@
+import time
+import threading
+import psutil
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from processes import ProcessSnapshot, ProcessTree, get_shared_snapshot
+
+
+class MemoryAnalyzer:
+    
+    def __init__(
+        self,
+        snapshot: Optional[ProcessSnapshot] = None,
+        workers: int = 4,
+        budget: float = 2.0,
+        change_ratio: float = 0.05,
+        log_callback: Optional[Callable[[str], None]] = None
+    ):
+        self._snapshot = snapshot if snapshot is not None else get_shared_snapshot()
+        self._log = log_callback or (lambda message: None)
+        self.workers = workers
+        self.budget = budget
+        self.change_ratio = change_ratio
+        self._tree = None
+        self._pool = None
+        self._pending = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+    
+    def _query(self, key: tuple, proc: psutil.Process, rss: int):
+        try:
+            full = proc.memory_full_info()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            full = None
+        
+        entry = {
+            "uss": getattr(full, "uss", 0),
+            "pss": getattr(full, "pss", 0),
+            "swap": getattr(full, "swap", 0),
+            "rss": rss,
+            "denied": full is None,
+        }
+        with self._lock:
+            self._cache[key] = entry
+            self._pending.pop(key, None)
+    
+    def _needs_query(self, key: tuple, rss: int) -> bool:
+        entry = self._cache.get(key)
+        if entry is None:
+            return True
+        if entry["denied"]:
+            return False
+        return abs(rss - entry["rss"]) > entry["rss"] * self.change_ratio
+    
+    def collect(self) -> dict:
+        started = time.perf_counter()
+        rows = self._snapshot.get()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="memory")
+        
+        futures = []
+        with self._lock:
+            live = {(pid, row["create_time"]) for pid, row in rows.items()}
+            for key in list(self._cache):
+                if key not in live:
+                    del self._cache[key]
+            
+            for pid, row in rows.items():
+                key = (pid, row["create_time"])
+                proc = self._snapshot.process(pid)
+                if proc is None or key in self._pending or not self._needs_query(key, row["rss"]):
+                    continue
+                future = self._pool.submit(self._query, key, proc, row["rss"])
+                self._pending[key] = future
+                futures.append(future)
+        
+        done, not_done = wait(futures, timeout=self.budget)
+        for future in not_done:
+            future.cancel()
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if future.cancelled():
+                    del self._pending[key]
+            cache = dict(self._cache)
+        
+        return {
+            "rows": rows,
+            "cache": cache,
+            "queried": len(done),
+            "timed_out": len(not_done),
+            "cached": len(cache) - len(done),
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        }
+    
+    def _app_key(self, pid: int, rows: dict, roots: Optional[dict]) -> str:
+        row = rows[pid]
+        if roots is not None:
+            row = rows.get(roots.get(pid), row)
+        return (row.get("name") or f"pid {pid}").lower()
+    
+    def analyze(self, group_by: str = "name", top: Optional[int] = None) -> dict:
+        result = self.collect()
+        rows = result.pop("rows")
+        cache = result.pop("cache")
+        roots = None
+        if group_by == "tree":
+            if self._tree is None:
+                self._tree = ProcessTree(self._snapshot)
+            roots = self._tree.update()
+        
+        apps = {}
+        for pid, row in rows.items():
+            entry = cache.get((pid, row["create_time"]))
+            app = apps.setdefault(self._app_key(pid, rows, roots), {
+                "processes": 0, "uss": 0, "pss": 0, "swap": 0, "rss": 0, "partial": False,
+            })
+            app["processes"] += 1
+            app["rss"] += row["rss"]
+            if entry is None or entry["denied"]:
+                app["partial"] = True
+                continue
+            app["uss"] += entry["uss"]
+            app["pss"] += entry["pss"]
+            app["swap"] += entry["swap"]
+        
+        ranked = sorted(apps.items(), key=lambda item: (item[1]["uss"], item[1]["rss"]), reverse=True)
+        result["apps"] = [dict(app, app=name) for name, app in ranked[:top]]
+        result["total_uss"] = sum(app["uss"] for app in apps.values())
+        return result
+    
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+MB = 1024 * 1024
+
+
+class _Series:
+    
+    __slots__ = ("times", "values", "start", "count", "next")
+    
+    def __init__(self, size: int, start: float):
+        self.times = array("f", bytes(4 * size))
+        self.values = array("f", bytes(4 * size))
+        self.start = start
+        self.count = 0
+        self.next = 0
+    
+    def add(self, timestamp: float, rss: int):
+        size = len(self.times)
+        self.times[self.next] = timestamp - self.start
+        self.values[self.next] = rss / MB
+        self.next = (self.next + 1) % size
+        self.count = min(self.count + 1, size)
+    
+    def points(self) -> tuple:
+        size = len(self.times)
+        first = (self.next - self.count) % size
+        order = [(first + i) % size for i in range(self.count)]
+        return [self.times[i] for i in order], [self.values[i] for i in order]
+    
+    def fit(self) -> Optional[dict]:
+        xs, ys = self.points()
+        n = len(xs)
+        if n < 3:
+            return None
+        
+        mean_x = sum(xs) / n
+        mean_y = sum(ys) / n
+        sxx = sum((x - mean_x) ** 2 for x in xs)
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        syy = sum((y - mean_y) ** 2 for y in ys)
+        if sxx <= 0:
+            return None
+        
+        slope = sxy / sxx
+        r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 0.0
+        return {
+            "slope_mb_per_hour": slope * 3600,
+            "r2": r2,
+            "growth_mb": ys[-1] - ys[0],
+            "rss_mb": ys[-1],
+            "span_s": xs[-1] - xs[0],
+            "samples": n,
+        }
+
+
+class LeakDetector:
+    
+    def __init__(
+        self,
+        snapshot: Optional[ProcessSnapshot] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        interval: float = 30.0,
+        window: int = 60,
+        min_samples: int = 10,
+        min_age: float = 300.0,
+        slope_threshold: float = 50.0,
+        min_growth: float = 20.0,
+        min_r2: float = 0.8,
+        max_tracked: int = 256
+    ):
+        self._snapshot = snapshot if snapshot is not None else get_shared_snapshot()
+        self._log = log_callback or print
+        self.interval = interval
+        self.window = window
+        self.min_samples = min_samples
+        self.min_age = min_age
+        self.slope_threshold = slope_threshold
+        self.min_growth = min_growth
+        self.min_r2 = min_r2
+        self.max_tracked = max_tracked
+        
+        self._series = {}
+        self.suspects = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.stats = {"samples": 0, "tracked": 0, "evicted": 0, "sample_ms": 0.0}
+    
+    def sample(self) -> dict:
+        with self._lock:
+            started = time.perf_counter()
+            rows = self._snapshot.get(self.interval / 2)
+            now = time.monotonic()
+            wall = time.time()
+            
+            for key in list(self._series):
+                row = rows.get(key[0])
+                if row is None or row["create_time"] != key[1]:
+                    del self._series[key]
+                    self.suspects.pop(key, None)
+            
+            candidates = [
+                row for row in rows.values()
+                if wall - row["create_time"] >= self.min_age and row["rss"]
+            ]
+            if len(candidates) > self.max_tracked:
+                candidates.sort(key=lambda row: row["rss"], reverse=True)
+                keep = {(row["pid"], row["create_time"]) for row in candidates[:self.max_tracked]}
+                for key in list(self._series):
+                    if key not in keep:
+                        del self._series[key]
+                        self.suspects.pop(key, None)
+                        self.stats["evicted"] += 1
+                candidates = candidates[:self.max_tracked]
+            
+            new_suspects = {}
+            for row in candidates:
+                key = (row["pid"], row["create_time"])
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series(self.window, now)
+                series.add(now, row["rss"])
+                
+                if series.count < self.min_samples:
+                    continue
+                fit = series.fit()
+                if fit and self._is_leak(fit):
+                    fit.update(pid=row["pid"], name=row.get("name"))
+                    if key not in self.suspects:
+                        new_suspects[key] = fit
+                    self.suspects[key] = fit
+                else:
+                    self.suspects.pop(key, None)
+            
+            for fit in new_suspects.values():
+                self._log(
+                    f"⚠ Возможная утечка памяти: {fit['name']} (PID {fit['pid']}) "
+                    f"+{fit['slope_mb_per_hour']:.0f} MB/ч, R²={fit['r2']:.2f}"
+                )
+            
+            self.stats["samples"] += 1
+            self.stats["tracked"] = len(self._series)
+            self.stats["sample_ms"] = (time.perf_counter() - started) * 1000
+            return new_suspects
+    
+    def _is_leak(self, fit: dict) -> bool:
+        return (
+            fit["slope_mb_per_hour"] >= self.slope_threshold
+            and fit["growth_mb"] >= self.min_growth
+            and fit["r2"] >= self.min_r2
+        )
+    
+    def report(self) -> list:
+        with self._lock:
+            return sorted(self.suspects.values(), key=lambda fit: fit["slope_mb_per_hour"], reverse=True)
+    
+    def memory_bytes(self) -> int:
+        return len(self._series) * self.window * 8
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.sample()
+                except Exception as e:
+                    self._log(f"  Ошибка детектора утечек: {e}")
+                self._stop.wait(self.interval)
+        
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(1)
+            self._thread = None
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
@@ -0,0 +1,229 @@
+import sys
+import json
+import time
+import socket
+import struct
+import threading
+import statistics
+from typing import Optional
+
+from benchmarks import percentile
+
+
+PACKET_HEADER = struct.Struct("!Id")
+DEFAULT_PORT = 27015
+
+
+class EchoServer:
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.bind((host, port))
+        self._tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._tcp.bind((host, port))
+        self._tcp.listen(8)
+        self.udp_port = self._udp.getsockname()[1]
+        self.tcp_port = self._tcp.getsockname()[1]
+        self._stop = threading.Event()
+        self._threads = []
+    
+    def start(self) -> "EchoServer":
+        for target in (self._serve_udp, self._serve_tcp):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+    
+    def _serve_udp(self):
+        self._udp.settimeout(0.2)
+        while not self._stop.is_set():
+            try:
+                data, address = self._udp.recvfrom(65535)
+                self._udp.sendto(data, address)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+    
+    def _serve_tcp(self):
+        self._tcp.settimeout(0.2)
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._tcp.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._echo_tcp, args=(conn,), daemon=True).start()
+    
+    def _echo_tcp(self, conn: socket.socket):
+        conn.settimeout(0.5)
+        with conn:
+            while not self._stop.is_set():
+                try:
+                    data = conn.recv(65535)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    return
+                if not data:
+                    return
+                conn.sendall(data)
+    
+    def stop(self):
+        self._stop.set()
+        for sock in (self._udp, self._tcp):
+            try:
+                sock.close()
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join(1)
+    
+    def __enter__(self) -> "EchoServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def summarize_rtt(sent: int, rtts_ms: list) -> dict:
+    received = len(rtts_ms)
+    jitter = statistics.fmean(abs(b - a) for a, b in zip(rtts_ms, rtts_ms[1:])) if received > 1 else 0.0
+    return {
+        "sent": sent,
+        "received": received,
+        "loss_pct": (sent - received) / sent * 100 if sent else 0.0,
+        "mean_ms": statistics.fmean(rtts_ms) if rtts_ms else 0.0,
+        "p50_ms": percentile(rtts_ms, 50),
+        "p95_ms": percentile(rtts_ms, 95),
+        "p99_ms": percentile(rtts_ms, 99),
+        "max_ms": max(rtts_ms) if rtts_ms else 0.0,
+        "jitter_ms": jitter,
+    }
+
+
+def measure_rtt(
+    host: str,
+    port: int,
+    protocol: str = "udp",
+    tick_rate: float = 64.0,
+    duration: float = 3.0,
+    payload: int = 64,
+    timeout: float = 0.5,
+    nodelay: Optional[bool] = None
+) -> dict:
+    size = max(payload, PACKET_HEADER.size)
+    padding = b"\0" * (size - PACKET_HEADER.size)
+    sent_at = {}
+    rtts = []
+    lock = threading.Lock()
+    done = threading.Event()
+    
+    if protocol == "udp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.connect((host, port))
+    elif protocol == "tcp":
+        sock = socket.create_connection((host, port), timeout=timeout * 4)
+        if nodelay is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(nodelay))
+    else:
+        raise ValueError(f"Unknown protocol: {protocol}")
+    sock.settimeout(0.1)
+    
+    def receive():
+        buffer = bytearray()
+        while not done.is_set():
+            try:
+                data = sock.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if not data:
+                return
+            now = time.perf_counter()
+            
+            if protocol == "udp":
+                frames = [data]
+            else:
+                buffer.extend(data)
+                frames = []
+                while len(buffer) >= size:
+                    frames.append(bytes(buffer[:size]))
+                    del buffer[:size]
+            
+            for frame in frames:
+                seq, _ = PACKET_HEADER.unpack_from(frame)
+                with lock:
+                    started = sent_at.pop(seq, None)
+                if started is not None and now - started <= timeout:
+                    rtts.append((now - started) * 1000)
+    
+    receiver = threading.Thread(target=receive, daemon=True)
+    receiver.start()
+    
+    period = 1.0 / tick_rate
+    count = int(duration * tick_rate)
+    next_tick = time.perf_counter()
+    try:
+        for seq in range(count):
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_tick += period
+            now = time.perf_counter()
+            with lock:
+                sent_at[seq] = now
+            sock.sendall(PACKET_HEADER.pack(seq, now) + padding)
+        time.sleep(timeout)
+    finally:
+        done.set()
+        receiver.join(1)
+        sock.close()
+    
+    result = summarize_rtt(count, rtts)
+    result.update(protocol=protocol, tick_rate=tick_rate, payload=size, nodelay=nodelay)
+    return result
+
+
+def run_network_benchmark(
+    host: Optional[str] = None,
+    udp_port: Optional[int] = None,
+    tcp_port: Optional[int] = None,
+    tick_rate: float = 64.0,
+    duration: float = 3.0,
+    payload: int = 64
+) -> dict:
+    server = None
+    if host is None:
+        server = EchoServer().start()
+        host, udp_port, tcp_port = server.host, server.udp_port, server.tcp_port
+    else:
+        udp_port = udp_port or DEFAULT_PORT
+        tcp_port = tcp_port or DEFAULT_PORT
+    
+    try:
+        return {
+            "timestamp": time.time(),
+            "host": host,
+            "udp": measure_rtt(host, udp_port, "udp", tick_rate, duration, payload),
+            "tcp": measure_rtt(host, tcp_port, "tcp", tick_rate, duration, payload),
+        }
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[sys.argv.index("--port") + 1]) if "--port" in sys.argv else None
+    if "--serve" in sys.argv:
+        with EchoServer("0.0.0.0", port or DEFAULT_PORT) as server:
+            print(f"Echo server on UDP {server.udp_port} / TCP {server.tcp_port}")
+            while True:
+                time.sleep(3600)
+    else:
+        host = sys.argv[sys.argv.index("--host") + 1] if "--host" in sys.argv else None
+        print(json.dumps(run_network_benchmark(host, port, port), indent=2))
@@ -1,32 +1,66 @@
 import os
+import re
 import subprocess
 import ctypes
-import winreg
 import shutil
 import tempfile
 import psutil
-import wmi
 import json
 import time
-from pathlib import Path
 from typing import Callable, Optional
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+from hardware import HardwareInventory, get_affinity_plan
+from processes import PRIORITY_CLASSES, ProcessSnapshot, ProcessRanker, ProcessTree, get_shared_snapshot
+
 
 LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
 BACKUP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rollback_backup.json")
+SYSTEM_DRIVE = os.environ.get("SystemDrive", "C:") + "\\" if os.name == "nt" else "/"
+
+VISUAL_EFFECT_VALUES = (
+    (r"Software\Microsoft\Windows\CurrentVersion\Explorer\VisualEffects", "VisualFXSetting"),
+    (r"Control Panel\Desktop", "DragFullWindows"),
+    (r"Control Panel\Desktop\WindowMetrics", "MinAnimate"),
+)
+
+
+def is_admin() -> bool:
+    try:
+        return ctypes.windll.shell32.IsUserAnAdmin() != 0
+    except AttributeError:
+        return os.geteuid() == 0
 
 
 class SystemOptimizer:
     
-    def __init__(self, log_callback: Optional[Callable[[str], None]] = None):
+    def __init__(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        hardware: Optional[HardwareInventory] = None,
+        snapshot: Optional[ProcessSnapshot] = None
+    ):
         self._log = log_callback or print
-        self._is_admin = ctypes.windll.shell32.IsUserAnAdmin() != 0
-        self._wmi = wmi.WMI()
+        self._is_admin = is_admin()
+        self._snapshot = snapshot if snapshot is not None else get_shared_snapshot()
         self._rollback_data = {"registry": [], "services": [], "power_plan": None}
         self._log_file = None
+        self._memory = None
+        self._history = None
+        self._last_profile = None
+        self._storage = None
         self._init_logging()
+        self._hardware = hardware or HardwareInventory(log_callback=self._log_to_file)
+        self._hardware.start()
+    
+    @property
+    def _wmi(self):
+        return self._hardware.connection()
     
     def _init_logging(self):
         try:
@@ -249,6 +283,29 @@ class SystemOptimizer:
         
         return {"freed_gb": freed, "available_gb": after.available / (1024 * 1024 * 1024)}
     
+    def analyze_memory(self, top: int = 10, group_by: str = "name") -> dict:
+        self._log("Анализ использования памяти...")
+        
+        if self._memory is None:
+            from memory import MemoryAnalyzer
+            self._memory = MemoryAnalyzer(snapshot=self._snapshot, log_callback=self._log_to_file)
+        
+        result = self._memory.analyze(group_by=group_by, top=top)
+        
+        for app in result["apps"]:
+            mark = "*" if app["partial"] else ""
+            self._log(
+                f"  {app['app']}{mark}: USS {app['uss'] / (1024 * 1024):.0f} MB, "
+                f"PSS {app['pss'] / (1024 * 1024):.0f} MB, "
+                f"RSS {app['rss'] / (1024 * 1024):.0f} MB ({app['processes']} проц.)"
+            )
+        
+        self._log(
+            f"  Опрошено: {result['queried']}, из кэша: {result['cached']}, "
+            f"не успели: {result['timed_out']} ({result['elapsed_ms']:.0f} мс)"
+        )
+        return result
+    
     def enable_game_mode(self) -> dict:
         self._log("Активация игрового режима Windows...")
         
@@ -308,11 +365,44 @@ class SystemOptimizer:
         
         return results
     
-    def restore_visual_effects(self) -> dict:
+    def get_visual_effects(self) -> Optional[dict]:
+        state = {}
+        
+        try:
+            for key_path, name in VISUAL_EFFECT_VALUES:
+                try:
+                    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_READ) as key:
+                        state[(key_path, name)] = winreg.QueryValueEx(key, name)
+                except FileNotFoundError:
+                    state[(key_path, name)] = None
+        except Exception as e:
+            self._log(f"  Не удалось прочитать визуальные эффекты: {e}")
+            return None
+        
+        return state
+    
+    def restore_visual_effects(self, state: Optional[dict] = None) -> dict:
         self._log("Восстановление визуальных эффектов...")
         
         results = {"success": False}
         
+        if state is not None:
+            try:
+                for (key_path, name), saved in state.items():
+                    with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_WRITE) as key:
+                        if saved is None:
+                            try:
+                                winreg.DeleteValue(key, name)
+                            except FileNotFoundError:
+                                pass
+                        else:
+                            winreg.SetValueEx(key, name, 0, saved[1], saved[0])
+                results["success"] = True
+                self._log("  Визуальные эффекты возвращены к сохранённым значениям")
+            except Exception as e:
+                self._log(f"  Ошибка: {e}")
+            return results
+        
         try:
             key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\VisualEffects"
             with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_WRITE) as key:
@@ -358,17 +448,25 @@ class SystemOptimizer:
         
         return results
     
-    def restore_power_plan(self) -> dict:
-        self._log("Восстановление сбалансированного плана питания...")
+    def get_power_plan(self) -> Optional[str]:
+        success, output = self._execute_cmd('powercfg /getactivescheme')
+        match = re.search(r"[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}", output) if success else None
+        if match is None:
+            self._log("  Не удалось определить текущий план электропитания")
+            return None
+        return match.group(0).lower()
+    
+    def restore_power_plan(self, guid: Optional[str] = None) -> dict:
+        self._log("Восстановление плана питания..." if guid else "Восстановление сбалансированного плана питания...")
         
         results = {"success": False}
         
         balanced_guid = "381b4222-f694-41f0-9685-ff5bb260df2e"
         
-        success, _ = self._execute_cmd(f'powercfg /setactive {balanced_guid}')
+        success, _ = self._execute_cmd(f'powercfg /setactive {guid or balanced_guid}')
         
         if success:
-            self._log("  План электропитания: Сбалансированный")
+            self._log(f"  План электропитания: {guid}" if guid else "  План электропитания: Сбалансированный")
             results["success"] = True
         else:
             self._log("  Не удалось изменить план электропитания")
@@ -411,24 +509,53 @@ class SystemOptimizer:
         
         return results
     
-    def optimize_dns(self) -> dict:
+    def benchmark_dns(self, servers: Optional[dict] = None, repeats: int = 3) -> dict:
+        from resolvers import DNS_RESOLVERS, benchmark_resolvers
+        
+        servers = servers or DNS_RESOLVERS
+        names = {pair[0]: name for name, pair in servers.items()}
+        result = benchmark_resolvers(list(names), repeats=repeats)
+        
+        for entry in result["ranking"]:
+            name = names.get(entry["server"], entry["server"])
+            if entry["median_ms"] is None:
+                self._log(f"  {name}: нет ответа")
+            else:
+                self._log(
+                    f"  {name}: медиана {entry['median_ms']:.1f} мс, p95 {entry['p95_ms']:.1f} мс, "
+                    f"ошибки {entry['failure_pct']:.0f}%"
+                )
+        result["winner_name"] = names.get(result["winner"])
+        return result
+    
+    def optimize_dns(self, servers: Optional[dict] = None, benchmark: bool = True) -> dict:
+        from resolvers import DNS_RESOLVERS
+        
         self._log("Оптимизация DNS...")
         
         results = {"success": False}
         
-        dns_servers = [
-            ("1.1.1.1", "1.0.0.1"),
-            ("8.8.8.8", "8.8.4.4"),
-        ]
+        dns_servers = servers or DNS_RESOLVERS
+        provider = next(iter(dns_servers))
+        
+        if benchmark:
+            try:
+                ranking = self.benchmark_dns(dns_servers)
+                results["benchmark"] = ranking
+                if ranking["winner_name"]:
+                    provider = ranking["winner_name"]
+            except Exception as e:
+                self._log(f"  Замер DNS не удался: {e}")
         
-        primary, secondary = dns_servers[0]
+        primary, secondary = dns_servers[provider]
+        results.update(provider=provider, servers=[primary, secondary])
         
         try:
             for nic in self._wmi.Win32_NetworkAdapterConfiguration(IPEnabled=True):
                 nic.SetDNSServerSearchOrder([primary, secondary])
             
             results["success"] = True
-            self._log(f"  DNS настроен: {primary}, {secondary} (Cloudflare)")
+            self._log(f"  DNS настроен: {primary}, {secondary} ({provider})")
             
         except Exception as e:
             success, _ = self._execute_cmd(
@@ -644,26 +771,10 @@ class SystemOptimizer:
     def get_system_info(self) -> dict:
         cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('C:\\')
-        
-        if not hasattr(self, '_cached_cpu_name'):
-            try:
-                for processor in self._wmi.Win32_Processor():
-                    self._cached_cpu_name = processor.Name
-                    break
-            except:
-                self._cached_cpu_name = "Unknown"
-        
-        if not hasattr(self, '_cached_gpu_name'):
-            try:
-                for gpu in self._wmi.Win32_VideoController():
-                    self._cached_gpu_name = gpu.Name
-                    break
-            except:
-                self._cached_gpu_name = "Unknown"
+        disk = psutil.disk_usage(SYSTEM_DRIVE)
         
-        cpu_info = self._cached_cpu_name
-        gpu_info = self._cached_gpu_name
+        cpu_info = self._hardware.cpu_name()
+        gpu_info = self._hardware.gpu_name()
         
         return {
             "cpu_name": cpu_info,
@@ -889,6 +1000,7 @@ class SystemOptimizer:
                 results[name] = {"error": str(e)}
         
         self._log("=" * 50)
+        self._last_profile = "ultimate"
         self._log("ULTIMATE OPTIMIZATION COMPLETE")
         self._log("⚠️ Перезагрузите компьютер для применения всех настроек!")
         self._log("=" * 50)
@@ -927,6 +1039,7 @@ class SystemOptimizer:
                 results[name] = {"error": str(e)}
         
         self._log("=" * 50)
+        self._last_profile = "full optimization"
         self._log("ОПТИМИЗАЦИЯ ЗАВЕРШЕНА")
         self._log("=" * 50)
         
@@ -1030,34 +1143,31 @@ class SystemOptimizer:
     def set_cpu_affinity(self, process_name: str = None, cores: list = None) -> dict:
         self._log_both(f"Настройка CPU Affinity...")
         
-        results = {"success": False, "processes": []}
+        results = {"success": False, "processes": [], "plan": get_affinity_plan()}
         
         try:
             if process_name:
-                for proc in psutil.process_iter(['pid', 'name']):
+                for row in self._snapshot.find_by_name(process_name):
                     try:
-                        if process_name.lower() in proc.info['name'].lower():
-                            p = psutil.Process(proc.info['pid'])
-                            if cores:
-                                p.cpu_affinity(cores)
-                            else:
-                                all_cores = list(range(psutil.cpu_count()))
-                                if len(all_cores) > 1:
-                                    p.cpu_affinity(all_cores[1:])
-                            results["processes"].append(proc.info['name'])
-                            self._log_both(f"  {proc.info['name']} -> ядра {cores or 'все'}")
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        p = self._snapshot.process(row['pid'])
+                        target = cores or get_affinity_plan()["game"]
+                        p.cpu_affinity(target)
+                        results["processes"].append(row['name'])
+                        self._log_both(f"  {row['name']} -> ядра {target}")
+                    except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
                         pass
             else:
+                plan = results["plan"]
+                if not plan["isolated"]:
+                    self._log_both("  Недостаточно ядер для изоляции")
                 system_procs = ['dwm.exe', 'csrss.exe']
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if proc.info['name'].lower() in system_procs:
-                            p = psutil.Process(proc.info['pid'])
-                            p.cpu_affinity([0])
-                            self._log_both(f"  {proc.info['name']} -> ядро 0 (система)")
-                    except:
-                        pass
+                for name in system_procs:
+                    for row in self._snapshot.find_by_name(name, exact=True):
+                        try:
+                            self._snapshot.process(row['pid']).cpu_affinity(plan["background"])
+                            self._log_both(f"  {row['name']} -> ядра {plan['background']} (система)")
+                        except:
+                            pass
             
             results["success"] = True
             self._log_both("  CPU Affinity настроен")
@@ -1113,116 +1223,338 @@ class SystemOptimizer:
         
         return results
     
-    def run_trim(self) -> dict:
+    @property
+    def storage(self):
+        if self._storage is None:
+            from storage import StorageBenchmark
+            self._storage = StorageBenchmark(log_callback=self._log)
+        return self._storage
+    
+    def benchmark_storage(self, mountpoint: str, max_age: Optional[float] = None) -> dict:
+        self._log_both(f"Замер накопителя {mountpoint}...")
+        result = self.storage.measure(mountpoint, max_age)
+        qd = ", ".join(f"{depth.upper()} {stats['iops']:.0f}" for depth, stats in result["random_read"].items())
+        self._log_both(
+            f"  {result['media'].upper()}: запись {result['seq_write_mbs']:.0f} MB/s, "
+            f"чтение {result['seq_read_mbs']:.0f} MB/s, fsync p99 {result['fsync_p99_ms']:.1f} мс"
+        )
+        self._log_both(f"  4K IOPS: {qd}")
+        return result
+    
+    def _trim_volume(self, volume: dict, benchmark: bool, runner: Callable[[str], tuple]) -> Optional[dict]:
+        drive, mountpoint = volume["drive"], volume["mountpoint"]
+        outcome = {"trimmed": False}
+        
+        if benchmark:
+            decision = self.storage.needs_trim(mountpoint, media=volume["media"])
+            outcome["decision"] = decision["reason"]
+            benchmark = decision["media"] == "ssd"
+            if benchmark and not decision["trim"]:
+                self._log_both(f"  {drive} пропущен: {decision['reason']}")
+                return outcome
+        
+        if os.name == "nt":
+            command = f'defrag {drive} /O /U'
+        else:
+            command = f'fstrim -v "{mountpoint}"'
+        success, _ = runner(command)
+        if not success:
+            return None
+        outcome["trimmed"] = True
+        
+        if benchmark:
+            self.storage.measure(mountpoint, media=volume["media"])
+            effect = self.storage.effect(mountpoint)
+            if effect:
+                outcome["effect"] = effect
+                self._log_both(
+                    f"  {drive} после TRIM: запись {effect['seq_write_pct']:+.1f}%, "
+                    f"fsync p99 {effect['fsync_p99_pct']:+.1f}%"
+                )
+        return outcome
+    
+    def run_trim(
+        self,
+        benchmark: bool = False,
+        volumes: Optional[list] = None,
+        runner: Optional[Callable[[str], tuple]] = None
+    ) -> dict:
+        from storage import discover_volumes, optimize_volumes
+        
         self._log_both("Запуск оптимизации накопителей (TRIM)...")
         
-        results = {"success": False, "drives": []}
+        results = {"success": False, "drives": [], "volumes": [], "decisions": {}, "effects": {}}
         
         if not self._is_admin:
             self._log_both("  Требуются права администратора")
             return results
         
+        runner = runner or self._execute_cmd
+        
         try:
-            success, output = self._execute_cmd('wmic diskdrive get model,mediatype')
-            
-            success, output = self._execute_cmd('defrag C: /O /U /V')
-            if success:
-                results["drives"].append("C:")
-                self._log_both("  TRIM выполнен для диска C:")
-            
-            for letter in "DEFGHIJ":
-                if os.path.exists(f"{letter}:\\"):
-                    success, _ = self._execute_cmd(f'defrag {letter}: /O /U')
-                    if success:
-                        results["drives"].append(f"{letter}:")
-                        self._log_both(f"  TRIM выполнен для диска {letter}:")
-            
+            volumes = volumes if volumes is not None else discover_volumes(runner=runner)
+            volumes = [v for v in volumes if not v.get("removable")]
+            disks = len({v["disk"] for v in volumes})
+            self._log_both(f"  Томов: {len(volumes)}, физических дисков: {disks}")
+            
+            started = time.perf_counter()
+            for entry in optimize_volumes(volumes, lambda v: self._trim_volume(v, benchmark, runner)):
+                volume, outcome = entry["volume"], entry["outcome"] or {}
+                drive = volume["drive"]
+                results["volumes"].append({
+                    "drive": drive,
+                    "disk": volume["disk"],
+                    "media": volume["media"],
+                    "success": entry["success"],
+                    "trimmed": outcome.get("trimmed", False),
+                    "elapsed_s": entry["elapsed_s"],
+                    "error": entry["error"],
+                })
+                if "decision" in outcome:
+                    results["decisions"][drive] = outcome["decision"]
+                if "effect" in outcome:
+                    results["effects"][drive] = outcome["effect"]
+                
+                if outcome.get("trimmed"):
+                    results["drives"].append(drive)
+                    action = "TRIM" if volume["media"] == "ssd" else "Оптимизация"
+                    self._log_both(
+                        f"  {action} выполнен(а) для {drive} ({volume['media'].upper()}, диск {volume['disk']}) "
+                        f"за {entry['elapsed_s']:.1f} с"
+                    )
+                elif not entry["success"]:
+                    self._log_both(f"  Ошибка оптимизации {drive} — {entry['error'] or 'команда не выполнена'}")
+            
+            results["elapsed_s"] = time.perf_counter() - started
             results["success"] = True
-            self._log_both("  Оптимизация накопителей завершена")
-            self._log_both("  SSD диски оптимизированы (TRIM)")
+            self._log_both(f"  Оптимизация накопителей завершена за {results['elapsed_s']:.1f} с")
             
         except Exception as e:
             self._log_both(f"  Ошибка: {e}")
         
         return results
     
-    def get_benchmark(self) -> dict:
-        results = {
-            "cpu_usage": psutil.cpu_percent(interval=1),
-            "ram_percent": psutil.virtual_memory().percent,
-            "ram_available_gb": psutil.virtual_memory().available / (1024**3),
-            "disk_read_speed": 0,
-            "disk_write_speed": 0,
-            "processes_count": len(list(psutil.process_iter())),
-            "boot_time": psutil.boot_time(),
-            "timestamp": time.time()
-        }
-        
-        try:
-            disk_io_start = psutil.disk_io_counters()
-            time.sleep(1)
-            disk_io_end = psutil.disk_io_counters()
-            
-            results["disk_read_speed"] = (disk_io_end.read_bytes - disk_io_start.read_bytes) / (1024*1024)
-            results["disk_write_speed"] = (disk_io_end.write_bytes - disk_io_start.write_bytes) / (1024*1024)
-        except:
-            pass
+    def start_benchmark(
+        self,
+        window: float = 2.0,
+        hz: float = 10.0,
+        callback: Optional[Callable[[dict], None]] = None
+    ) -> "BenchmarkSampler":
+        from benchmarks import BenchmarkSampler
+        
+        def finish(results: dict):
+            results["processes_count"] = len(self._snapshot.get())
+            results["boot_time"] = psutil.boot_time()
+            results["timestamp"] = time.time()
+            if callback:
+                callback(results)
+        
+        return BenchmarkSampler(window, hz, callback=finish).start()
+    
+    def get_benchmark(self, window: float = 2.0, hz: float = 10.0) -> dict:
+        return self.start_benchmark(window, hz).result()
+    
+    def run_synthetic_benchmark(self, repeats: int = 3, quick: bool = False) -> dict:
+        self._log_both("Синтетический бенчмарк (CPU, память, диск, планировщик)...")
+        
+        from benchmarks import compare_metric, flatten_suite, run_suite
+        
+        tag = f"synthetic after {self._last_profile}" if self._last_profile else "synthetic"
+        previous = self.history.latest(kind="synthetic")
+        results = run_suite(repeats=repeats, quick=quick, log_callback=self._log_to_file)
+        self.history.append(results, tag, kind="synthetic")
+        
+        current = flatten_suite(results)
+        before = flatten_suite(previous) if previous else None
+        
+        for metric, stats in current["stats"].items():
+            line = f"  {metric}: {stats['mean']:.1f} {stats['unit']} (±{stats['cv_pct']:.1f}%)"
+            if before and metric in before:
+                change = compare_metric(before, current, metric, lower_is_better=stats["unit"].startswith("us"))
+                if change["verdict"] == "improvement":
+                    line += f"  ✓ {change['delta']:+.1f}"
+                elif change["verdict"] == "regression":
+                    line += f"  ✗ {change['delta']:+.1f}"
+                else:
+                    line += "  ≈"
+            self._log_both(line)
+        
+        return {"results": results, "previous": previous, "tag": tag}
+    
+    def probe_timer(self, samples: int = 200, tag: Optional[str] = None) -> dict:
+        from latency import compare_timer_probes, timer_probe
+        
+        self._log_both("Замер точности таймера и задержки пробуждения...")
+        
+        if tag is None:
+            tag = f"timer after {self._last_profile}" if self._last_profile else "timer"
+        previous = self.history.latest(kind="timer")
+        result = timer_probe(samples=samples)
+        self.history.append(result, tag, kind="timer")
+        
+        self._log_both(f"  Гранулярность sleep: {result['sleep_granularity_us']:.0f} мкс")
+        self._log_both(f"  perf_counter: {result['perf_counter_ns']:.0f} нс")
+        self._log_both(
+            f"  Пробуждение: p50 {result['p50_us']:.0f} / p99 {result['p99_us']:.0f} / "
+            f"max {result['max_us']:.0f} мкс ({len(result['cores'])} ядер)"
+        )
+        
+        if previous and previous.get("histogram"):
+            diff = compare_timer_probes(previous, result)
+            self._log_both(
+                f"  Δ с прошлым замером ({previous['tag']}): гранулярность {diff['sleep_granularity_us']:+.0f}, "
+                f"p99 {diff['p99_us']:+.0f} мкс, сдвиг распределения {diff['histogram_shift']:.2f}"
+            )
         
-        return results
+        return result
     
-    def run_benchmark_comparison(self) -> dict:
-        self._log_both("Запуск бенчмарка системы...")
+    def probe_scheduling_latency(self, load: Optional[str] = "others", duration: float = 1.0) -> dict:
+        from latency import scheduling_latency_probe
         
-        benchmark_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark.json")
+        self._log_both(f"Задержка планировщика по ядрам (нагрузка: {load or 'нет'})...")
+        result = scheduling_latency_probe(duration=duration, load=load)
+        self.history.append(result, f"sched latency {load or 'idle'}", kind="sched")
         
-        current = self.get_benchmark()
-        previous = None
+        for core in result["cores"]:
+            self._log_both(
+                f"  CPU{core['cpu']}: avg {core['avg_us']:.0f} / p99 {core['p99_us']:.0f} / "
+                f"max {core['max_us']:.0f} мкс"
+            )
+        self._log_both(f"  Худший p99: {result['worst_p99_us']:.0f} мкс ({result['elapsed_s']:.0f} с)")
+        return result
+    
+    def benchmark_network(self, host: Optional[str] = None, port: Optional[int] = None, duration: float = 3.0) -> dict:
+        from network import DEFAULT_PORT, run_network_benchmark
+        
+        if host:
+            port = port or DEFAULT_PORT
+        target = f"{host}:{port}" if host else "loopback"
+        self._log_both(f"Замер сетевой задержки ({target}, 64 тика/с)...")
+        
+        previous = self.history.latest_matching(f"network {target}%", kind="network")
+        tag = f"network {target}" + (f" after {self._last_profile}" if self._last_profile else "")
+        result = run_network_benchmark(host, port, port, duration=duration)
+        self.history.append(result, tag, kind="network")
+        
+        for protocol in ("udp", "tcp"):
+            stats = result[protocol]
+            line = (
+                f"  {protocol.upper()}: RTT p50 {stats['p50_ms']:.2f} / p99 {stats['p99_ms']:.2f} мс, "
+                f"джиттер {stats['jitter_ms']:.2f} мс, потери {stats['loss_pct']:.1f}%"
+            )
+            if previous and protocol in previous:
+                line += f" (p99 {stats['p99_ms'] - previous[protocol]['p99_ms']:+.2f} мс)"
+            self._log_both(line)
         
-        try:
-            if os.path.exists(benchmark_file):
-                with open(benchmark_file, "r") as f:
-                    previous = json.load(f)
-        except:
-            pass
+        return result
+    
+    def _experiment_tweaks(self) -> dict:
+        return {
+            "power_plan": (self.get_power_plan, self.optimize_power_plan, self.restore_power_plan),
+            "visual_effects": (self.get_visual_effects, self.optimize_visual_effects, self.restore_visual_effects),
+            "xbox_services": (None, self.disable_xbox_services, self.enable_xbox_services),
+            "scheduled_tasks": (None, self.disable_scheduled_tasks, self.enable_scheduled_tasks),
+        }
+    
+    def run_tweak_experiment(
+        self,
+        tweak: str,
+        workload: str = "cpu_single",
+        rounds: int = 6,
+        apply: Optional[Callable] = None,
+        revert: Optional[Callable] = None
+    ) -> dict:
+        from benchmarks import cpu_benchmark, measure_wakeup_latency, memory_benchmark
+        from experiments import ABExperiment, format_report
+        
+        if apply is None or revert is None:
+            tweaks = self._experiment_tweaks()
+            if tweak not in tweaks:
+                raise ValueError(f"Нет пары применить/откатить для {tweak}: {', '.join(tweaks)}")
+            capture, apply, restore = tweaks[tweak]
+            revert = restore
+            if capture is not None:
+                state = capture()
+                if state is None:
+                    raise RuntimeError(f"Не удалось сохранить текущее состояние {tweak}, эксперимент не запущен")
+                revert = lambda: restore(state)
+        
+        workloads = {
+            "cpu_single": (lambda: cpu_benchmark(1, 1_000_000, 1)["mean"], True),
+            "memory": (lambda: memory_benchmark(64, 1)["mean"], True),
+            "scheduler": (lambda: measure_wakeup_latency(duration=1.0)["p99_us"], False),
+        }
+        measure, higher_is_better = workloads[workload]
+        
+        self._log_both(f"A/B эксперимент: {tweak} / {workload}")
+        experiment = ABExperiment(
+            apply, revert, measure,
+            rounds=rounds,
+            higher_is_better=higher_is_better,
+            name=f"{tweak} / {workload}",
+            log_callback=self._log_to_file
+        )
+        result = experiment.run()
+        
+        for line in format_report(result):
+            self._log_both(line)
+        self.history.append(dict(result, timestamp=time.time()), f"experiment {tweak}", kind="experiment")
+        return result
+    
+    @property
+    def history(self):
+        if self._history is None:
+            from history import BenchmarkHistory
+            self._history = BenchmarkHistory(log_callback=self._log_to_file)
+            self._history.compact()
+        return self._history
+    
+    def run_benchmark_comparison(self, tag: Optional[str] = None, compare_tag: Optional[str] = None) -> dict:
+        self._log_both("Запуск бенчмарка системы...")
         
-        try:
-            with open(benchmark_file, "w") as f:
-                json.dump(current, f, indent=2)
-        except:
-            pass
+        if tag is None:
+            tag = f"after {self._last_profile}" if self._last_profile else "manual"
         
-        self._log_both(f"  CPU загрузка: {current['cpu_usage']:.1f}%")
-        self._log_both(f"  RAM использовано: {current['ram_percent']:.1f}%")
+        current = self.get_benchmark()
+        previous = self.history.latest(compare_tag, kind="ambient")
+        self.history.append(current, tag)
+        
+        self._log_both(f"  Метка: {tag}")
+        stats = current["stats"]
+        self._log_both(f"  Сэмплов: {current['samples']} за {current['window']:.0f} с")
+        self._log_both(
+            f"  CPU загрузка: {current['cpu_usage']:.1f}% "
+            f"(медиана {stats['cpu_usage']['median']:.1f}, p95 {stats['cpu_usage']['p95']:.1f}, "
+            f"σ {stats['cpu_usage']['stddev']:.1f})"
+        )
+        self._log_both(f"  RAM использовано: {current['ram_percent']:.1f}% (σ {stats['ram_percent']['stddev']:.2f})")
         self._log_both(f"  RAM доступно: {current['ram_available_gb']:.2f} GB")
         self._log_both(f"  Процессов: {current['processes_count']}")
         self._log_both(f"  Диск чтение: {current['disk_read_speed']:.1f} MB/s")
         self._log_both(f"  Диск запись: {current['disk_write_speed']:.1f} MB/s")
         
         if previous:
-            self._log_both("  --- Сравнение с предыдущим ---")
-            
-            cpu_diff = previous['cpu_usage'] - current['cpu_usage']
-            ram_diff = previous['ram_percent'] - current['ram_percent']
-            procs_diff = previous['processes_count'] - current['processes_count']
-            
-            if cpu_diff > 0:
-                self._log_both(f"  ✓ CPU: -{cpu_diff:.1f}% (улучшение)")
-            elif cpu_diff < 0:
-                self._log_both(f"  ✗ CPU: +{abs(cpu_diff):.1f}% (ухудшение)")
+            from benchmarks import compare_metric
             
-            if ram_diff > 0:
-                self._log_both(f"  ✓ RAM: -{ram_diff:.1f}% (освобождено)")
-            elif ram_diff < 0:
-                self._log_both(f"  ✗ RAM: +{abs(ram_diff):.1f}% (больше занято)")
+            self._log_both("  --- Сравнение с предыдущим ---")
             
-            if procs_diff > 0:
-                self._log_both(f"  ✓ Процессы: -{procs_diff} (меньше)")
-            elif procs_diff < 0:
-                self._log_both(f"  ✗ Процессы: +{abs(procs_diff)} (больше)")
+            for metric, label, unit, floor in [
+                ("cpu_usage", "CPU", "%", 0.5),
+                ("ram_percent", "RAM", "%", 0.5),
+                ("processes_count", "Процессы", "", 2),
+            ]:
+                change = compare_metric(previous, current, metric, floor=floor)
+                delta = change["delta"]
+                if change["verdict"] == "improvement":
+                    self._log_both(f"  ✓ {label}: {delta:+.1f}{unit} (улучшение)")
+                elif change["verdict"] == "regression":
+                    self._log_both(f"  ✗ {label}: {delta:+.1f}{unit} (ухудшение)")
+                elif change["verdict"] == "noise":
+                    self._log_both(f"  ≈ {label}: {delta:+.1f}{unit} (в пределах шума ±{change['band']:.1f})")
         else:
             self._log_both("  Первый запуск бенчмарка (нет данных для сравнения)")
         
-        return {"current": current, "previous": previous}
+        return {"current": current, "previous": previous, "tag": tag}
     
     def rollback_all(self) -> dict:
         self._log_both("=" * 50)
@@ -1295,47 +1627,60 @@ class SystemOptimizer:
 
 class ProcessOptimizer:
     
-    def __init__(self, log_callback: Optional[Callable[[str], None]] = None):
+    def __init__(
+        self,
+        log_callback: Optional[Callable[[str], None]] = None,
+        snapshot: Optional[ProcessSnapshot] = None
+    ):
         self._log = log_callback or print
+        self._snapshot = snapshot if snapshot is not None else get_shared_snapshot()
+        self._rankers = {}
+        self._tree = None
     
-    def get_resource_heavy_processes(self, limit: int = 10) -> list:
-        processes = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                info = proc.info
-                if info['cpu_percent'] is not None and info['memory_percent'] is not None:
-                    processes.append({
-                        'pid': info['pid'],
-                        'name': info['name'],
-                        'cpu': info['cpu_percent'],
-                        'memory': info['memory_percent']
-                    })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
-        processes.sort(key=lambda x: x['cpu'] + x['memory'], reverse=True)
-        return processes[:limit]
+    def get_resource_heavy_processes(self, limit: int = 10, score: str = "weighted") -> list:
+        ranker = self._rankers.get(score)
+        if ranker is None:
+            ranker = self._rankers[score] = ProcessRanker(self._snapshot, score=score, limit=limit)
+        ranker.limit = limit
+        
+        return [
+            {
+                'pid': info['pid'],
+                'name': info['name'],
+                'cpu': info['cpu_percent'] or 0.0,
+                'memory': info['memory_percent'] or 0.0,
+                'score': info['score'],
+            }
+            for info in ranker.update()
+        ]
+    
+    def get_resource_heavy_applications(self, limit: int = 10, sort: str = "cpu") -> list:
+        if self._tree is None:
+            self._tree = ProcessTree(self._snapshot)
+        return self._tree.applications(sort=sort, limit=limit)
     
     def set_process_priority(self, pid: int, priority: str = "high") -> bool:
-        priority_map = {
-            "realtime": psutil.REALTIME_PRIORITY_CLASS,
-            "high": psutil.HIGH_PRIORITY_CLASS,
-            "above_normal": psutil.ABOVE_NORMAL_PRIORITY_CLASS,
-            "normal": psutil.NORMAL_PRIORITY_CLASS,
-            "below_normal": psutil.BELOW_NORMAL_PRIORITY_CLASS,
-            "idle": psutil.IDLE_PRIORITY_CLASS,
-        }
-        
         try:
             proc = psutil.Process(pid)
-            proc.nice(priority_map.get(priority, psutil.HIGH_PRIORITY_CLASS))
+            proc.nice(PRIORITY_CLASSES.get(priority, PRIORITY_CLASSES["high"]))
             self._log(f"Приоритет процесса {proc.name()} установлен: {priority}")
             return True
         except (psutil.NoSuchProcess, psutil.AccessDenied, PermissionError) as e:
             self._log(f"Ошибка установки приоритета: {e}")
             return False
     
+    def set_process_affinity(self, pid: int, cores: list = None) -> bool:
+        try:
+            proc = psutil.Process(pid)
+            if not cores:
+                cores = get_affinity_plan()["game"]
+            proc.cpu_affinity(cores)
+            self._log(f"Процесс {proc.name()} -> ядра {cores}")
+            return True
+        except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError, ValueError) as e:
+            self._log(f"Ошибка установки affinity: {e}")
+            return False
+    
     def terminate_process(self, pid: int) -> bool:
         try:
             proc = psutil.Process(pid)
@@ -1348,12 +1693,8 @@ class ProcessOptimizer:
             return False
     
     def boost_game_process(self, process_name: str) -> bool:
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if process_name.lower() in proc.info['name'].lower():
-                    return self.set_process_priority(proc.info['pid'], "high")
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        for row in self._snapshot.find_by_name(process_name):
+            return self.set_process_priority(row['pid'], "high")
         
         self._log(f"Процесс {process_name} не найден")
         return False
\ No newline at end of file
@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import fnmatch
+import threading
+import psutil
+from typing import Callable, Optional
+
+from hardware import get_affinity_plan
+from processes import IO_PRIORITIES, PRIORITY_CLASSES
+
+
+POLICY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "policies.json")
+
+DEFAULT_RULES = [
+    {"name": "Индексатор", "match": {"name": "searchindexer.exe"}, "priority": "idle", "io_priority": "very_low"},
+    {"name": "Облачная синхронизация", "match": {"name": "onedrive*.exe"}, "priority": "below_normal", "io_priority": "low"},
+    {"name": "Steam WebHelper", "match": {"name": "steamwebhelper.exe"}, "priority": "below_normal"},
+    {"name": "Обновления", "match": {"name": "*update*.exe"}, "priority": "idle", "io_priority": "very_low", "affinity": "background"},
+]
+
+
+class PolicyRule:
+    
+    def __init__(
+        self,
+        name: str,
+        match: dict,
+        priority: Optional[str] = None,
+        io_priority: Optional[str] = None,
+        affinity=None
+    ):
+        self.name = name
+        self.name_pattern = (match.get("name") or "").lower() or None
+        self.path_pattern = (match.get("path") or "").lower() or None
+        self.parent_pattern = (match.get("parent") or "").lower() or None
+        self.user = (match.get("user") or "").lower() or None
+        self.priority = priority
+        self.io_priority = io_priority
+        self.affinity = affinity
+        
+        if priority is not None and priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Неизвестный приоритет: {priority}")
+        if io_priority is not None and io_priority not in ("very_low", "low", "normal", "high"):
+            raise ValueError(f"Неизвестный IO приоритет: {io_priority}")
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PolicyRule":
+        return cls(
+            name=data.get("name") or "rule",
+            match=data.get("match") or {},
+            priority=data.get("priority"),
+            io_priority=data.get("io_priority"),
+            affinity=data.get("affinity"),
+        )
+    
+    def matches(self, row: dict, parent_name: str) -> bool:
+        if self.name_pattern and not fnmatch.fnmatchcase((row.get("name") or "").lower(), self.name_pattern):
+            return False
+        if self.path_pattern and not fnmatch.fnmatchcase((row.get("exe") or "").lower(), self.path_pattern):
+            return False
+        if self.parent_pattern and not fnmatch.fnmatchcase(parent_name.lower(), self.parent_pattern):
+            return False
+        if self.user:
+            username = (row.get("username") or "").lower()
+            if username != self.user and username.rsplit("\\", 1)[-1] != self.user:
+                return False
+        return True
+    
+    def apply(self, proc: psutil.Process):
+        if self.priority:
+            proc.nice(PRIORITY_CLASSES[self.priority])
+        if self.io_priority and self.io_priority in IO_PRIORITIES:
+            proc.ionice(*IO_PRIORITIES[self.io_priority])
+        if self.affinity:
+            if self.affinity in ("game", "background"):
+                cores = get_affinity_plan()[self.affinity]
+            else:
+                cores = list(self.affinity)
+            proc.cpu_affinity(cores)
+
+
+def load_rules(path: str = POLICY_FILE) -> list:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = DEFAULT_RULES
+    return [PolicyRule.from_dict(item) for item in data]
+
+
+class PolicyEngine:
+    
+    def __init__(
+        self,
+        rules: Optional[list] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        interval: float = 1.0
+    ):
+        self._log = log_callback or print
+        self.rules = list(rules) if rules is not None else load_rules()
+        self.interval = interval
+        
+        self._seen = {}
+        self._attrs = ["name", "ppid"]
+        self._needs_parent = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.stats = {"evaluations": 0, "new": 0, "applied": 0, "errors": 0, "eval_ms": 0.0, "total_ms": 0.0}
+        self.rule_stats = {}
+        self._update_required()
+    
+    def _update_required(self):
+        self.rule_stats = {rule.name: self.rule_stats.get(rule.name, 0) for rule in self.rules}
+        self._attrs = ["name", "ppid"]
+        if any(rule.path_pattern for rule in self.rules):
+            self._attrs.append("exe")
+        if any(rule.user for rule in self.rules):
+            self._attrs.append("username")
+        self._needs_parent = any(rule.parent_pattern for rule in self.rules)
+    
+    def add_rule(self, rule: PolicyRule):
+        with self._lock:
+            self.rules.append(rule)
+            self._update_required()
+    
+    def _parent_name(self, ppid: Optional[int]) -> str:
+        if not self._needs_parent or not ppid:
+            return ""
+        try:
+            return psutil.Process(ppid).name() or ""
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return ""
+    
+    def evaluate(self) -> list:
+        with self._lock:
+            started = time.perf_counter()
+            pids = set(psutil.pids())
+            
+            for pid in list(self._seen):
+                if pid not in pids:
+                    del self._seen[pid]
+            
+            fresh = dict.fromkeys(pids - self._seen.keys())
+            for pid, create_time in list(self._seen.items()):
+                try:
+                    proc = psutil.Process(pid)
+                    if proc.create_time() != create_time:
+                        fresh[pid] = proc
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    del self._seen[pid]
+            
+            applied = []
+            for pid, proc in fresh.items():
+                try:
+                    proc = proc or psutil.Process(pid)
+                    row = proc.as_dict(attrs=self._attrs, ad_value=None)
+                    row["create_time"] = proc.create_time()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+                row["pid"] = pid
+                self._seen[pid] = row["create_time"]
+                self.stats["new"] += 1
+                
+                parent_name = None
+                for rule in self.rules:
+                    if rule.parent_pattern and parent_name is None:
+                        parent_name = self._parent_name(row.get("ppid"))
+                    if not rule.matches(row, parent_name or ""):
+                        continue
+                    try:
+                        rule.apply(proc)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError, ValueError) as e:
+                        self.stats["errors"] += 1
+                        self._log(f"  Политика '{rule.name}' не применена к {row.get('name')}: {e}")
+                        break
+                    self.rule_stats[rule.name] += 1
+                    self.stats["applied"] += 1
+                    applied.append((pid, rule.name))
+                    self._log(f"  Политика '{rule.name}' -> {row.get('name')} (PID {pid})")
+                    break
+            
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stats["evaluations"] += 1
+            self.stats["eval_ms"] = elapsed
+            self.stats["total_ms"] += elapsed
+            return applied
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.evaluate()
+                except Exception as e:
+                    self._log(f"  Ошибка движка политик: {e}")
+                self._stop.wait(self.interval)
+        
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+        self._log(f"Политики процессов включены ({len(self.rules)} правил)")
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.interval + 1)
+            self._thread = None
+        self._log("Политики процессов выключены")
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
@@ -0,0 +1,432 @@
+import os
+import time
+import heapq
+import threading
+import psutil
+from typing import Callable, Iterable, Optional, Union
+
+
+DEFAULT_ATTRS = (
+    "name",
+    "exe",
+    "ppid",
+    "cpu_percent",
+    "memory_info",
+    "memory_percent",
+    "num_threads",
+    "nice",
+    "io_counters",
+)
+
+if hasattr(psutil, "HIGH_PRIORITY_CLASS"):
+    PRIORITY_CLASSES = {
+        "realtime": psutil.REALTIME_PRIORITY_CLASS,
+        "high": psutil.HIGH_PRIORITY_CLASS,
+        "above_normal": psutil.ABOVE_NORMAL_PRIORITY_CLASS,
+        "normal": psutil.NORMAL_PRIORITY_CLASS,
+        "below_normal": psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        "idle": psutil.IDLE_PRIORITY_CLASS,
+    }
+else:
+    PRIORITY_CLASSES = {
+        "realtime": -20,
+        "high": -10,
+        "above_normal": -5,
+        "normal": 0,
+        "below_normal": 5,
+        "idle": 19,
+    }
+
+if hasattr(psutil, "IOPRIO_VERYLOW"):
+    IO_PRIORITIES = {
+        "very_low": (psutil.IOPRIO_VERYLOW,),
+        "low": (psutil.IOPRIO_LOW,),
+        "normal": (psutil.IOPRIO_NORMAL,),
+        "high": (psutil.IOPRIO_HIGH,),
+    }
+elif hasattr(psutil, "IOPRIO_CLASS_IDLE"):
+    IO_PRIORITIES = {
+        "very_low": (psutil.IOPRIO_CLASS_IDLE,),
+        "low": (psutil.IOPRIO_CLASS_BE, 7),
+        "normal": (psutil.IOPRIO_CLASS_BE, 4),
+        "high": (psutil.IOPRIO_CLASS_BE, 0),
+    }
+else:
+    IO_PRIORITIES = {}
+
+
+def priority_name(nice) -> str:
+    if nice is None:
+        return "?"
+    for name, value in PRIORITY_CLASSES.items():
+        if value == nice:
+            return name
+    return str(nice)
+
+
+class ProcessSnapshot:
+    
+    def __init__(self, attrs: Iterable[str] = DEFAULT_ATTRS, max_age: float = 1.0):
+        self._attrs = set(attrs)
+        self._max_age = max_age
+        self._stale = True
+        self._lock = threading.RLock()
+        self._procs = {}
+        self._prev_io = {}
+        self.rows = {}
+        self.added = set()
+        self.removed = set()
+        self.tick = 0
+        self.timestamp = 0.0
+        self.scan_ms = 0.0
+    
+    def require(self, *attrs: str):
+        with self._lock:
+            if not self._attrs.issuperset(attrs):
+                self._attrs.update(attrs)
+                self._stale = True
+    
+    def key(self, pid: int) -> Optional[tuple]:
+        row = self.rows.get(pid)
+        return (pid, row["create_time"]) if row else None
+    
+    def process(self, pid: int) -> Optional[psutil.Process]:
+        return self._procs.get(pid)
+    
+    def get(self, max_age: Optional[float] = None) -> dict:
+        max_age = self._max_age if max_age is None else max_age
+        with self._lock:
+            if self._stale or time.monotonic() - self.timestamp >= max_age:
+                self.refresh()
+            return self.rows
+    
+    def refresh(self) -> dict:
+        with self._lock:
+            started = time.perf_counter()
+            now = time.monotonic()
+            elapsed = now - self.timestamp if self.timestamp else 0.0
+            attrs = list(self._attrs)
+            
+            rows = {}
+            added = set()
+            
+            for pid in psutil.pids():
+                proc = self._procs.get(pid)
+                
+                if proc is not None and not proc.is_running():
+                    proc = None
+                
+                if proc is None:
+                    try:
+                        proc = psutil.Process(pid)
+                        proc.cpu_percent(None)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                        continue
+                    self._procs[pid] = proc
+                    added.add(pid)
+                
+                try:
+                    info = proc.as_dict(attrs=attrs, ad_value=None)
+                except psutil.NoSuchProcess:
+                    continue
+                
+                info["pid"] = pid
+                info["create_time"] = proc.create_time()
+                self._fill_derived(info, (pid, info["create_time"]), elapsed)
+                rows[pid] = info
+            
+            removed = {
+                pid for pid, row in self.rows.items()
+                if pid not in rows or rows[pid]["create_time"] != row["create_time"]
+            }
+            for pid in list(self._procs):
+                if pid not in rows:
+                    del self._procs[pid]
+            for key in list(self._prev_io):
+                if key[0] not in rows or rows[key[0]]["create_time"] != key[1]:
+                    del self._prev_io[key]
+            
+            self.rows = rows
+            self.added = added
+            self.removed = removed
+            self.tick += 1
+            self.timestamp = now
+            self._stale = False
+            self.scan_ms = (time.perf_counter() - started) * 1000
+            return rows
+    
+    def _fill_derived(self, info: dict, key: tuple, elapsed: float):
+        memory = info.get("memory_info")
+        info["rss"] = memory.rss if memory else 0
+        
+        full = info.get("memory_full_info")
+        info["uss"] = getattr(full, "uss", 0) if full else 0
+        
+        io = info.get("io_counters")
+        info["io_read_rate"] = 0.0
+        info["io_write_rate"] = 0.0
+        if io is None:
+            return
+        
+        prev = self._prev_io.get(key)
+        if prev and elapsed > 0:
+            info["io_read_rate"] = max(0, io.read_bytes - prev.read_bytes) / elapsed
+            info["io_write_rate"] = max(0, io.write_bytes - prev.write_bytes) / elapsed
+        self._prev_io[key] = io
+    
+    def find_by_name(self, name: str, exact: bool = False) -> list:
+        name = name.lower()
+        matches = []
+        for row in self.get().values():
+            proc_name = (row.get("name") or "").lower()
+            if (proc_name == name) if exact else (name in proc_name):
+                matches.append(row)
+        return matches
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def __bool__(self) -> bool:
+        return True
+
+
+IO_SCALE = 100 * 1024 * 1024
+
+
+def cpu_score(row: dict) -> float:
+    return row.get("cpu_percent") or 0.0
+
+
+def rss_score(row: dict) -> float:
+    return row.get("rss") or 0
+
+
+def uss_score(row: dict) -> float:
+    return row.get("uss") or 0
+
+
+def io_score(row: dict) -> float:
+    return row.get("io_read_rate", 0.0) + row.get("io_write_rate", 0.0)
+
+
+def weighted_score(cpu: float = 1.0, memory: float = 1.0, io: float = 0.5) -> Callable[[dict], float]:
+    cpu_total = 100.0 * (psutil.cpu_count() or 1)
+    ram_total = float(psutil.virtual_memory().total)
+    
+    def score(row: dict) -> float:
+        return (
+            cpu * cpu_score(row) / cpu_total
+            + memory * rss_score(row) / ram_total
+            + io * io_score(row) / IO_SCALE
+        )
+    
+    return score
+
+
+SCORES = {
+    "cpu": cpu_score,
+    "rss": rss_score,
+    "uss": uss_score,
+    "io": io_score,
+}
+
+
+class ProcessRanker:
+    
+    def __init__(
+        self,
+        snapshot: ProcessSnapshot,
+        score: Union[str, Callable[[dict], float]] = "weighted",
+        limit: int = 20
+    ):
+        self._snapshot = snapshot
+        self.limit = limit
+        self.top = []
+        self.entered = set()
+        self.left = set()
+        self._top_pids = set()
+        self._tick = -1
+        self._ranked_limit = limit
+        self.set_score(score)
+    
+    def set_score(self, score: Union[str, Callable[[dict], float]]):
+        if score == "weighted":
+            self._score = weighted_score()
+        elif isinstance(score, str):
+            self._score = SCORES[score]
+        else:
+            self._score = score
+        
+        if score == "uss":
+            self._snapshot.require("memory_full_info")
+        self._tick = -1
+    
+    def update(self, max_age: Optional[float] = None) -> list:
+        rows = self._snapshot.get(max_age)
+        if self._snapshot.tick == self._tick and self.limit == self._ranked_limit:
+            return self.top
+        
+        heap = []
+        score = self._score
+        for pid, row in rows.items():
+            item = (score(row), pid)
+            if len(heap) < self.limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        
+        heap.sort(reverse=True)
+        self.top = [dict(rows[pid], score=value) for value, pid in heap]
+        
+        pids = {pid for _, pid in heap}
+        self.entered = pids - self._top_pids
+        self.left = self._top_pids - pids
+        self._top_pids = pids
+        self._tick = self._snapshot.tick
+        self._ranked_limit = self.limit
+        return self.top
+
+
+TREE_ROOTS = {
+    "explorer.exe", "services.exe", "svchost.exe", "wininit.exe", "winlogon.exe",
+    "userinit.exe", "systemd", "init", "launchd", "sshd", "login",
+}
+
+HANDLE_ATTR = "num_handles" if os.name == "nt" else "num_fds"
+
+
+def _exe_dir(row: dict) -> str:
+    exe = row.get("exe")
+    return os.path.normcase(os.path.dirname(exe)) if exe else ""
+
+
+class ProcessTree:
+    
+    def __init__(self, snapshot: ProcessSnapshot, max_depth: int = 2):
+        self._snapshot = snapshot
+        self._snapshot.require(HANDLE_ATTR)
+        self.max_depth = max_depth
+        self._apps = {}
+        self._members = {}
+        self._tick = -1
+        self.stats = {"linked": 0, "rebuilds": 0, "link_ms": 0.0}
+    
+    def _inherits(self, row: dict, parent: dict, root: dict) -> bool:
+        if (parent.get("name") or "").lower() in TREE_ROOTS:
+            return False
+        if row.get("name") == parent.get("name"):
+            return True
+        
+        child_dir, root_dir = _exe_dir(row), _exe_dir(root)
+        if not child_dir or not root_dir:
+            return not child_dir
+        if child_dir == root_dir:
+            return True
+        
+        relative = os.path.relpath(child_dir, root_dir)
+        if relative.startswith(os.pardir):
+            return False
+        return len(relative.split(os.sep)) <= self.max_depth
+    
+    def _link(self, pid: int, rows: dict, depth: int = 0) -> int:
+        root = self._apps.get(pid)
+        if root is not None:
+            return root
+        
+        row = rows[pid]
+        parent_pid = row.get("ppid")
+        root = pid
+        
+        if parent_pid in rows and parent_pid != pid and depth < 64:
+            parent_root = self._link(parent_pid, rows, depth + 1)
+            if self._inherits(row, rows[parent_pid], rows[parent_root]):
+                root = parent_root
+        
+        self._apps[pid] = root
+        self._members.setdefault(root, set()).add(pid)
+        self.stats["linked"] += 1
+        return root
+    
+    def update(self, max_age: Optional[float] = None) -> dict:
+        rows = self._snapshot.get(max_age)
+        if self._snapshot.tick == self._tick:
+            return self._apps
+        
+        started = time.perf_counter()
+        if self._tick >= 0 and self._snapshot.tick == self._tick + 1:
+            pending = set(self._snapshot.added)
+            for pid in self._snapshot.removed:
+                root = self._apps.pop(pid, None)
+                if root is not None and root in self._members:
+                    self._members[root].discard(pid)
+                for orphan in self._members.pop(pid, ()):
+                    self._apps.pop(orphan, None)
+                    pending.add(orphan)
+        else:
+            self._apps = {}
+            self._members = {}
+            self.stats["rebuilds"] += 1
+            pending = rows.keys()
+        
+        for pid in pending:
+            if pid in rows:
+                self._link(pid, rows)
+        
+        self._tick = self._snapshot.tick
+        self.stats["link_ms"] = (time.perf_counter() - started) * 1000
+        return self._apps
+    
+    def app_key(self, pid: int) -> Optional[str]:
+        root = self._apps.get(pid)
+        row = self._snapshot.rows.get(root)
+        if row is None:
+            return None
+        return os.path.normcase(row.get("exe") or "") or (row.get("name") or "").lower()
+    
+    def applications(self, sort: str = "cpu", limit: Optional[int] = None, max_age: Optional[float] = None) -> list:
+        apps = self.update(max_age)
+        rows = self._snapshot.rows
+        groups = {}
+        
+        for pid, root in apps.items():
+            row = rows.get(pid)
+            root_row = rows.get(root)
+            if row is None or root_row is None:
+                continue
+            
+            key = self.app_key(pid)
+            app = groups.get(key)
+            if app is None:
+                app = groups[key] = {
+                    "app": root_row.get("name") or key,
+                    "exe": root_row.get("exe"),
+                    "pids": [],
+                    "processes": 0,
+                    "cpu": 0.0,
+                    "rss": 0,
+                    "threads": 0,
+                    "handles": 0,
+                    "io_rate": 0.0,
+                }
+            app["pids"].append(pid)
+            app["processes"] += 1
+            app["cpu"] += row.get("cpu_percent") or 0.0
+            app["rss"] += row.get("rss") or 0
+            app["threads"] += row.get("num_threads") or 0
+            app["handles"] += row.get(HANDLE_ATTR) or 0
+            app["io_rate"] += io_score(row)
+        
+        ranked = sorted(groups.values(), key=lambda app: app[sort], reverse=True)
+        return ranked[:limit]
+
+
+_shared_snapshot = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_snapshot() -> ProcessSnapshot:
+    global _shared_snapshot
+    with _shared_lock:
+        if _shared_snapshot is None:
+            _shared_snapshot = ProcessSnapshot()
+        return _shared_snapshot
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+from typing import Optional
+
+
+class _TimedLoader:
+    
+    def __init__(self, loader, name: str, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+    
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+    
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+    
+    def exec_module(self, module):
+        self._profiler._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(self._name)
+
+
+class ImportProfiler:
+    
+    def __init__(self):
+        self.records = {}
+        self._stack = []
+        self._installed = False
+    
+    def install(self) -> "ImportProfiler":
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+        return self
+    
+    def uninstall(self):
+        if self._installed:
+            sys.meta_path.remove(self)
+            self._installed = False
+    
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, name, self)
+                return spec
+        return None
+    
+    def _enter(self, name: str):
+        self._stack.append([name, time.perf_counter(), 0.0])
+    
+    def _leave(self, name: str):
+        _, started, children = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        self.records[name] = {
+            "self_ms": (cumulative - children) * 1000,
+            "cumulative_ms": cumulative * 1000,
+        }
+        if self._stack:
+            self._stack[-1][2] += cumulative
+    
+    def total_ms(self) -> float:
+        return sum(r["self_ms"] for r in self.records.values())
+    
+    def summary(self, top: int = 15, by: str = "self_ms") -> list:
+        ranked = sorted(self.records.items(), key=lambda item: item[1][by], reverse=True)
+        return [
+            {"module": name, "self_ms": r["self_ms"], "cumulative_ms": r["cumulative_ms"]}
+            for name, r in ranked[:top]
+        ]
+    
+    def top_level_summary(self, top: int = 10) -> list:
+        packages = {}
+        for name, r in self.records.items():
+            root = name.split(".")[0]
+            packages[root] = packages.get(root, 0.0) + r["self_ms"]
+        ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        return [{"package": name, "ms": ms} for name, ms in ranked[:top]]
+
+
+def _get_arg(name: str, default=None):
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
+HEADLESS_MODULES = ("optimizer", "processes", "updater")
+
+
+def headless_probe() -> dict:
+    started = time.perf_counter()
+    for name in HEADLESS_MODULES:
+        __import__(name)
+    imported = time.perf_counter()
+    
+    from optimizer import SystemOptimizer, ProcessOptimizer
+    SystemOptimizer(log_callback=lambda message: None)
+    ProcessOptimizer(log_callback=lambda message: None)
+    ready = time.perf_counter()
+    
+    return {
+        "import_ms": (imported - started) * 1000,
+        "backend_ms": (ready - imported) * 1000,
+        "ready_ms": (ready - started) * 1000,
+        "modules": len(sys.modules),
+    }
+
+
+def run_startup_benchmark(
+    runs: int = 5,
+    budget_ms: Optional[float] = None,
+    baseline_file: Optional[str] = None,
+    tolerance: float = 0.2,
+    script: Optional[str] = None,
+    timeout: float = 60,
+    headless: bool = False
+) -> dict:
+    here = os.path.dirname(os.path.abspath(__file__))
+    if headless:
+        command = [sys.executable, os.path.join(here, "profiling.py"), "--headless-probe"]
+        metrics, target = ("import_ms", "backend_ms", "ready_ms"), "ready_ms"
+    else:
+        command = [sys.executable, script or os.path.join(here, "main.py"), "--startup-probe"]
+        metrics, target = ("import_ms", "first_paint_ms", "interactive_ms"), "interactive_ms"
+    samples = []
+    errors = []
+    
+    for _ in range(runs):
+        try:
+            proc = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            errors.append("timeout")
+            continue
+        
+        for line in reversed(proc.stdout.splitlines()):
+            if line.startswith("{"):
+                samples.append(json.loads(line))
+                break
+        else:
+            errors.append(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    
+    result = {"runs": len(samples), "errors": errors, "regression": False, "metric": target}
+    
+    for key in metrics:
+        values = [s[key] for s in samples if s.get(key) is not None]
+        if values:
+            result[key] = {
+                "median": statistics.median(values),
+                "min": min(values),
+                "max": max(values),
+            }
+    
+    interactive = result.get(target, {}).get("median")
+    
+    if interactive is not None and budget_ms is not None and interactive > budget_ms:
+        result["regression"] = True
+    
+    if baseline_file and interactive is not None:
+        try:
+            with open(baseline_file, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+            limit = baseline[target]["median"] * (1 + tolerance)
+            result["baseline_ms"] = baseline[target]["median"]
+            if interactive > limit:
+                result["regression"] = True
+        except FileNotFoundError:
+            with open(baseline_file, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            result["errors"].append(f"baseline {baseline_file}: {type(e).__name__}: {e}")
+            result["regression"] = True
+    
+    if not samples:
+        result["regression"] = True
+    
+    return result
+
+
+if __name__ == "__main__":
+    if "--headless-probe" in sys.argv:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        print(json.dumps(headless_probe()), flush=True)
+    else:
+        budget = _get_arg("--budget-ms")
+        result = run_startup_benchmark(
+            runs=int(_get_arg("--runs", 5)),
+            budget_ms=float(budget) if budget else None,
+            baseline_file=_get_arg("--baseline"),
+            headless="--headless" in sys.argv
+        )
+        print(json.dumps(result, indent=2))
+        sys.exit(1 if result["regression"] else 0)
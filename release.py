@@ -13,6 +13,20 @@ SOURCE_FILES = [
     "main.py",
     "optimizer.py", 
     "updater.py",
+    "hardware.py",
+    "profiling.py",
+    "processes.py",
+    "games.py",
+    "benchmarks.py",
+    "policies.py",
+    "throttler.py",
+    "memory.py",
+    "history.py",
+    "experiments.py",
+    "latency.py",
+    "network.py",
+    "resolvers.py",
+    "storage.py",
     "build.py",
     "requirements.txt",
     "icon.ico"
@@ -0,0 +1,253 @@
+import sys
+import json
+import time
+import random
+import socket
+import struct
+import asyncio
+import threading
+import statistics
+from typing import Optional
+
+from benchmarks import percentile
+
+
+DNS_RESOLVERS = {
+    "Cloudflare": ("1.1.1.1", "1.0.0.1"),
+    "Google": ("8.8.8.8", "8.8.4.4"),
+    "Quad9": ("9.9.9.9", "149.112.112.112"),
+}
+
+DEFAULT_DOMAINS = (
+    "steampowered.com",
+    "epicgames.com",
+    "riotgames.com",
+    "battle.net",
+    "discord.com",
+    "microsoft.com",
+)
+
+DNS_HEADER = struct.Struct("!HHHHHH")
+
+
+def build_query(domain: str, query_id: int, record_type: int = 1) -> bytes:
+    header = DNS_HEADER.pack(query_id, 0x0100, 1, 0, 0, 0)
+    name = b"".join(bytes([len(label)]) + label.encode("idna") for label in domain.strip(".").split("."))
+    return header + name + b"\0" + struct.pack("!HH", record_type, 1)
+
+
+def parse_response(data: bytes) -> Optional[tuple]:
+    if len(data) < DNS_HEADER.size:
+        return None
+    query_id, flags, _, answers, _, _ = DNS_HEADER.unpack_from(data)
+    if not flags & 0x8000:
+        return None
+    return query_id, flags & 0x000F, answers
+
+
+def _split_server(server: str, default_port: int) -> tuple:
+    host, _, port = server.rpartition(":") if server.count(":") == 1 else (server, "", "")
+    return host, int(port) if port else default_port
+
+
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    
+    def __init__(self):
+        self.transport = None
+        self.pending = {}
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def datagram_received(self, data, addr):
+        parsed = parse_response(data)
+        if parsed is None:
+            return
+        future = self.pending.pop(parsed[0], None)
+        if future is not None and not future.done():
+            future.set_result((time.perf_counter(), parsed[1]))
+    
+    def error_received(self, exc):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+async def _benchmark_server(
+    server: str,
+    domains: tuple,
+    repeats: int,
+    port: int,
+    timeout: float,
+    concurrency: int
+) -> dict:
+    loop = asyncio.get_running_loop()
+    host, port = _split_server(server, port)
+    transport, protocol = await loop.create_datagram_endpoint(_ResolverProtocol, remote_addr=(host, port))
+    limit = asyncio.Semaphore(concurrency)
+    ids = random.sample(range(1, 65536), len(domains) * repeats)
+    latencies, errors = [], {"timeout": 0, "rcode": 0, "socket": 0}
+    
+    async def query(domain: str, query_id: int):
+        async with limit:
+            future = loop.create_future()
+            protocol.pending[query_id] = future
+            started = time.perf_counter()
+            transport.sendto(build_query(domain, query_id))
+            try:
+                received, rcode = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                protocol.pending.pop(query_id, None)
+                errors["timeout"] += 1
+                return
+            except OSError:
+                errors["socket"] += 1
+                return
+            if rcode not in (0, 3):
+                errors["rcode"] += 1
+                return
+            latencies.append((received - started) * 1000)
+    
+    try:
+        for round_index in range(repeats):
+            offset = round_index * len(domains)
+            await asyncio.gather(*(query(domain, ids[offset + i]) for i, domain in enumerate(domains)))
+    finally:
+        transport.close()
+    
+    sent = len(domains) * repeats
+    failed = sent - len(latencies)
+    return {
+        "server": server,
+        "sent": sent,
+        "failed": failed,
+        "failure_pct": failed / sent * 100 if sent else 100.0,
+        "errors": errors,
+        "median_ms": statistics.median(latencies) if latencies else None,
+        "p95_ms": percentile(latencies, 95) if latencies else None,
+        "min_ms": min(latencies) if latencies else None,
+    }
+
+
+def rank_resolvers(results: list, max_failure_pct: float = 20.0) -> list:
+    def key(result: dict) -> tuple:
+        usable = result["median_ms"] is not None and result["failure_pct"] <= max_failure_pct
+        return (
+            not usable,
+            result["median_ms"] if result["median_ms"] is not None else float("inf"),
+            result["p95_ms"] if result["p95_ms"] is not None else float("inf"),
+            result["failure_pct"],
+        )
+    return sorted(results, key=key)
+
+
+async def _benchmark_all(servers: list, domains: tuple, repeats: int, port: int, timeout: float, concurrency: int) -> list:
+    results = await asyncio.gather(
+        *(_benchmark_server(server, domains, repeats, port, timeout, concurrency) for server in servers),
+        return_exceptions=True
+    )
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException):
+            sent = len(domains) * repeats
+            results[index] = {
+                "server": servers[index], "sent": sent, "failed": sent, "failure_pct": 100.0,
+                "errors": {"socket": sent}, "median_ms": None, "p95_ms": None, "min_ms": None,
+            }
+    return list(results)
+
+
+def benchmark_resolvers(
+    servers: Optional[list] = None,
+    domains: tuple = DEFAULT_DOMAINS,
+    repeats: int = 3,
+    port: int = 53,
+    timeout: float = 1.0,
+    concurrency: int = 4
+) -> dict:
+    servers = list(servers or [pair[0] for pair in DNS_RESOLVERS.values()])
+    started = time.perf_counter()
+    ranking = rank_resolvers(asyncio.run(_benchmark_all(servers, tuple(domains), repeats, port, timeout, concurrency)))
+    winner = ranking[0] if ranking and ranking[0]["median_ms"] is not None else None
+    return {
+        "timestamp": time.time(),
+        "domains": list(domains),
+        "repeats": repeats,
+        "ranking": ranking,
+        "winner": winner["server"] if winner else None,
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+class StubDnsServer:
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, drop_rate: float = 0.0, rcode: int = 0):
+        self.delay = delay
+        self.drop_rate = drop_rate
+        self.rcode = rcode
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+        self.address = "%s:%d" % self._sock.getsockname()
+        self._stop = threading.Event()
+        self._thread = None
+        self._random = random.Random(0)
+    
+    def _answer(self, query: bytes) -> bytes:
+        query_id, flags, _, _, _, _ = DNS_HEADER.unpack_from(query)
+        question = query[DNS_HEADER.size:]
+        header = DNS_HEADER.pack(query_id, 0x8180 | (flags & 0x0100) | self.rcode, 1, 0 if self.rcode else 1, 0, 0)
+        if self.rcode:
+            return header + question
+        answer = struct.pack("!HHHIH", 0xC00C, 1, 1, 60, 4) + socket.inet_aton("127.0.0.1")
+        return header + question + answer
+    
+    def _serve(self):
+        self._sock.settimeout(0.2)
+        while not self._stop.is_set():
+            try:
+                data, address = self._sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if len(data) < DNS_HEADER.size or self._random.random() < self.drop_rate:
+                continue
+            if self.delay:
+                threading.Timer(self.delay, self._reply, args=(data, address)).start()
+            else:
+                self._reply(data, address)
+    
+    def _reply(self, data: bytes, address: tuple):
+        try:
+            self._sock.sendto(self._answer(data), address)
+        except OSError:
+            pass
+    
+    def start(self) -> "StubDnsServer":
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        self._sock.close()
+        if self._thread:
+            self._thread.join(1)
+    
+    def __enter__(self) -> "StubDnsServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    if "--stub" in sys.argv:
+        stubs = [StubDnsServer(delay=d, drop_rate=r).start() for d, r in ((0.002, 0.0), (0.010, 0.0), (0.001, 0.5))]
+        result = benchmark_resolvers([stub.address for stub in stubs])
+        for stub in stubs:
+            stub.stop()
+    else:
+        servers = sys.argv[sys.argv.index("--servers") + 1].split(",") if "--servers" in sys.argv else None
+        result = benchmark_resolvers(servers)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,387 @@
+import os
+import sys
+import json
+import time
+import random
+import threading
+import statistics
+import subprocess
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from benchmarks import open_unbuffered, percentile, read_at
+from hardware import _read_sysfs
+
+
+STORAGE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "storage_cache.json")
+
+QUEUE_DEPTHS = (1, 4, 16)
+
+BLOCK = 4096
+
+MB = 1024 * 1024
+
+
+def _drop_cache(fd: int):
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _random_reads(path: str, size: int, queue_depth: int, duration: float) -> dict:
+    blocks = size // BLOCK
+    latencies = [[] for _ in range(queue_depth)]
+    stop = threading.Event()
+    
+    def worker(index: int):
+        rng = random.Random(index)
+        fd, buffer = open_unbuffered(path)
+        try:
+            samples = latencies[index]
+            while not stop.is_set():
+                offset = rng.randrange(blocks) * BLOCK
+                started = time.perf_counter()
+                read_at(fd, offset, buffer)
+                samples.append(time.perf_counter() - started)
+        finally:
+            os.close(fd)
+            if buffer is not None:
+                buffer.close()
+    
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(queue_depth)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    merged = [value * 1000 for samples in latencies for value in samples]
+    return {
+        "iops": len(merged) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(merged, 50),
+        "p99_ms": percentile(merged, 99),
+    }
+
+
+def benchmark_volume(
+    mountpoint: str,
+    size_mb: int = 64,
+    queue_depths: tuple = QUEUE_DEPTHS,
+    duration: float = 1.0,
+    fsync_samples: int = 50
+) -> dict:
+    path = os.path.join(mountpoint, f".yalokgar_storage_{os.getpid()}.tmp")
+    chunk = os.urandom(MB)
+    size = size_mb * MB
+    flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    started = time.perf_counter()
+    
+    try:
+        fd = os.open(path, flags)
+        try:
+            write_started = time.perf_counter()
+            for _ in range(size_mb):
+                os.write(fd, chunk)
+            os.fsync(fd)
+            seq_write = size / (time.perf_counter() - write_started) / MB
+            _drop_cache(fd)
+            
+            read_fd, buffer = open_unbuffered(path, MB)
+            try:
+                read_started = time.perf_counter()
+                offset = 0
+                while offset < size:
+                    offset += read_at(read_fd, offset, buffer, MB) or size
+                seq_read = size / (time.perf_counter() - read_started) / MB
+            finally:
+                os.close(read_fd)
+                if buffer is not None:
+                    buffer.close()
+            
+            fsync_ms = []
+            small = os.urandom(BLOCK)
+            for _ in range(fsync_samples):
+                os.lseek(fd, random.randrange(size // BLOCK) * BLOCK, os.SEEK_SET)
+                os.write(fd, small)
+                sync_started = time.perf_counter()
+                os.fsync(fd)
+                fsync_ms.append((time.perf_counter() - sync_started) * 1000)
+            _drop_cache(fd)
+        finally:
+            os.close(fd)
+        
+        random_read = {f"qd{depth}": _random_reads(path, size, depth, duration) for depth in queue_depths}
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    return {
+        "timestamp": time.time(),
+        "mountpoint": mountpoint,
+        "size_mb": size_mb,
+        "seq_write_mbs": seq_write,
+        "seq_read_mbs": seq_read,
+        "random_read": random_read,
+        "fsync_p50_ms": statistics.median(fsync_ms),
+        "fsync_p99_ms": percentile(fsync_ms, 99),
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+def classify_media(result: dict) -> str:
+    qd1 = result["random_read"].get("qd1")
+    if qd1 is None:
+        return "unknown"
+    return "ssd" if qd1["p50_ms"] < 1.0 else "hdd"
+
+
+def compare_volume(before: dict, after: dict) -> dict:
+    def change(a: float, b: float) -> float:
+        return (b - a) / a * 100 if a else 0.0
+    
+    result = {
+        "seq_write_pct": change(before["seq_write_mbs"], after["seq_write_mbs"]),
+        "seq_read_pct": change(before["seq_read_mbs"], after["seq_read_mbs"]),
+        "fsync_p99_pct": change(before["fsync_p99_ms"], after["fsync_p99_ms"]),
+    }
+    for depth, stats in after["random_read"].items():
+        if depth in before["random_read"]:
+            result[f"{depth}_iops_pct"] = change(before["random_read"][depth]["iops"], stats["iops"])
+    return result
+
+
+BLOCK_SYSFS = "/sys/class/block"
+
+IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS = 0x560000
+
+SKIPPED_FSTYPES = {"", "squashfs", "tmpfs", "devtmpfs", "overlay", "iso9660", "udf"}
+
+
+def default_runner(command: str) -> tuple:
+    try:
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=600)
+        return result.returncode == 0, result.stdout + result.stderr
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return False, str(e)
+
+
+def _linux_disk(device: str, root: str = BLOCK_SYSFS) -> Optional[str]:
+    name = os.path.basename(device)
+    path = os.path.join(root, name)
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(os.path.join(path, "partition")):
+        return os.path.basename(os.path.dirname(os.path.realpath(path)))
+    return name
+
+
+def _windows_disk(mountpoint: str) -> Optional[str]:
+    import ctypes
+    from ctypes import wintypes
+    
+    drive = mountpoint.rstrip("\\")
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    handle = kernel32.CreateFileW(f"\\\\.\\{drive}", 0, 3, None, 3, 0, None)
+    if handle in (None, wintypes.HANDLE(-1).value):
+        return None
+    try:
+        buffer = ctypes.create_string_buffer(256)
+        returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(
+            wintypes.HANDLE(handle), IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS, None, 0,
+            buffer, len(buffer), ctypes.byref(returned), None
+        ):
+            return None
+        count = int.from_bytes(buffer.raw[0:4], "little")
+        return str(int.from_bytes(buffer.raw[8:12], "little")) if count else None
+    finally:
+        kernel32.CloseHandle(wintypes.HANDLE(handle))
+
+
+def _windows_media(runner: Callable[[str], tuple]) -> dict:
+    success, output = runner(
+        'powershell -NoProfile -Command "Get-PhysicalDisk | Select-Object DeviceId,MediaType | ConvertTo-Json"'
+    )
+    if not success:
+        return {}
+    try:
+        disks = json.loads(output)
+    except ValueError:
+        return {}
+    if isinstance(disks, dict):
+        disks = [disks]
+    return {str(d.get("DeviceId")): str(d.get("MediaType") or "unknown").lower() for d in disks}
+
+
+def _linux_media(disk: str, root: str = BLOCK_SYSFS) -> str:
+    rotational = _read_sysfs(os.path.join(root, disk, "queue", "rotational"))
+    return {"0": "ssd", "1": "hdd"}.get(rotational, "unknown")
+
+
+def discover_volumes(partitions: Optional[list] = None, runner: Optional[Callable[[str], tuple]] = None) -> list:
+    runner = runner or default_runner
+    partitions = partitions if partitions is not None else psutil.disk_partitions(all=False)
+    windows_media = _windows_media(runner) if os.name == "nt" else {}
+    volumes, seen = [], set()
+    
+    for part in partitions:
+        opts = set((part.opts or "").split(","))
+        if part.fstype.lower() in SKIPPED_FSTYPES or "cdrom" in opts or part.device in seen:
+            continue
+        seen.add(part.device)
+        
+        if os.name == "nt":
+            disk = _windows_disk(part.mountpoint)
+            media = windows_media.get(disk, "unknown")
+            if media not in ("ssd", "hdd"):
+                media = "unknown"
+        else:
+            disk = _linux_disk(part.device)
+            media = _linux_media(disk) if disk else "unknown"
+        
+        volumes.append({
+            "device": part.device,
+            "mountpoint": part.mountpoint,
+            "drive": part.mountpoint.rstrip("\\") if os.name == "nt" else part.mountpoint,
+            "fstype": part.fstype,
+            "disk": disk or part.device,
+            "media": media,
+            "removable": "removable" in opts,
+        })
+    return volumes
+
+
+def optimize_volumes(
+    volumes: list,
+    optimize: Callable[[dict], object],
+    max_workers: Optional[int] = None
+) -> list:
+    groups = {}
+    for volume in volumes:
+        groups.setdefault(volume["disk"], []).append(volume)
+    if not groups:
+        return []
+    
+    def run_disk(disk_volumes: list) -> list:
+        results = []
+        for volume in disk_volumes:
+            started = time.perf_counter()
+            try:
+                outcome, error = optimize(volume), None
+            except Exception as e:
+                outcome, error = None, str(e)
+            finished = time.perf_counter()
+            results.append({
+                "volume": volume,
+                "success": bool(outcome) and error is None,
+                "outcome": outcome,
+                "error": error,
+                "started": started,
+                "finished": finished,
+                "elapsed_s": finished - started,
+            })
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max_workers or len(groups), thread_name_prefix="trim") as pool:
+        futures = [pool.submit(run_disk, disk_volumes) for disk_volumes in groups.values()]
+        return [result for future in futures for result in future.result()]
+
+
+class StorageBenchmark:
+    
+    def __init__(
+        self,
+        cache_file: str = STORAGE_CACHE_FILE,
+        degradation_pct: float = 15.0,
+        log_callback: Optional[Callable[[str], None]] = None,
+        **options
+    ):
+        self._cache_file = cache_file
+        self.degradation_pct = degradation_pct
+        self.options = options
+        self._log = log_callback or (lambda message: None)
+        self._lock = threading.Lock()
+        self._cache = self._load()
+    
+    def _load(self) -> dict:
+        try:
+            with open(self._cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save(self):
+        try:
+            tmp_file = self._cache_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, indent=2)
+            os.replace(tmp_file, self._cache_file)
+        except OSError:
+            pass
+    
+    def cached(self, mountpoint: str) -> dict:
+        with self._lock:
+            return dict(self._cache.get(mountpoint, {}))
+    
+    def measure(self, mountpoint: str, max_age: Optional[float] = None, media: Optional[str] = None) -> dict:
+        known = media in ("ssd", "hdd")
+        entry = self.cached(mountpoint)
+        latest = entry.get("latest")
+        if max_age is not None and latest and time.time() - latest["timestamp"] < max_age:
+            return dict(latest, media=media, media_source="os") if known else latest
+        
+        result = benchmark_volume(mountpoint, **self.options)
+        result["media"] = media if known else classify_media(result)
+        result["media_source"] = "os" if known else "benchmark"
+        with self._lock:
+            entry = self._cache.setdefault(mountpoint, {})
+            baseline = entry.get("baseline")
+            if baseline is None or result["seq_write_mbs"] > baseline["seq_write_mbs"]:
+                entry["baseline"] = result
+            entry["previous"] = entry.get("latest")
+            entry["latest"] = result
+            self._save()
+        return result
+    
+    def needs_trim(self, mountpoint: str, max_age: Optional[float] = 3600, media: Optional[str] = None) -> dict:
+        if media == "hdd":
+            return {"trim": False, "reason": "не SSD", "media": media, "result": None}
+        
+        result = self.measure(mountpoint, max_age, media)
+        baseline = self.cached(mountpoint).get("baseline")
+        
+        if result["media"] != "ssd":
+            return {"trim": False, "reason": "не SSD", "media": result["media"], "result": result}
+        if baseline is None or baseline["timestamp"] == result["timestamp"]:
+            if self.cached(mountpoint).get("previous"):
+                return {"trim": False, "reason": "лучший замер за всё время", "media": "ssd", "result": result}
+            return {"trim": True, "reason": "нет базового замера", "media": "ssd", "result": result}
+        
+        delta = compare_volume(baseline, result)
+        if delta["seq_write_pct"] <= -self.degradation_pct or delta["fsync_p99_pct"] >= self.degradation_pct:
+            reason = f"запись {delta['seq_write_pct']:+.0f}%, fsync p99 {delta['fsync_p99_pct']:+.0f}% от лучшего замера"
+            return {"trim": True, "reason": reason, "media": "ssd", "result": result, "delta": delta}
+        return {"trim": False, "reason": "производительность в норме", "media": "ssd", "result": result, "delta": delta}
+    
+    def effect(self, mountpoint: str) -> Optional[dict]:
+        entry = self.cached(mountpoint)
+        if not entry.get("previous") or not entry.get("latest"):
+            return None
+        return compare_volume(entry["previous"], entry["latest"])
+
+
+if __name__ == "__main__":
+    target = sys.argv[sys.argv.index("--path") + 1] if "--path" in sys.argv else "."
+    size = int(sys.argv[sys.argv.index("--size") + 1]) if "--size" in sys.argv else 64
+    result = benchmark_volume(target, size_mb=size)
+    result["media"] = classify_media(result)
+    print(json.dumps(result, indent=2))
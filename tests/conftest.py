@@ -0,0 +1,26 @@
+import os
+import sys
+import subprocess
+
+import psutil
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def spawn(tmp_path):
+    children = []
+    
+    def start(name, code="import time; time.sleep(30)"):
+        exe = str(tmp_path / name)
+        if not os.path.exists(exe):
+            os.symlink(sys.executable, exe)
+        proc = subprocess.Popen([exe, "-c", code])
+        children.append(proc)
+        return psutil.Process(proc.pid)
+    
+    yield start
+    for proc in children:
+        proc.kill()
+        proc.wait()
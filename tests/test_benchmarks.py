@@ -0,0 +1,57 @@
+import os
+import multiprocessing
+import time
+
+import psutil
+import pytest
+
+from benchmarks import BenchmarkSampler, disk_benchmark, open_unbuffered, start_load, stop_load
+
+
+def test_load_workers_are_running_when_start_returns():
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    workers = start_load(ctx, [None, None], stop)
+    try:
+        procs = [psutil.Process(worker.pid) for worker in workers]
+        before = sum(sum(proc.cpu_times()[:2]) for proc in procs)
+        time.sleep(0.3)
+        after = sum(sum(proc.cpu_times()[:2]) for proc in procs)
+        assert all(worker.is_alive() for worker in workers)
+        assert after - before > 0.15
+    finally:
+        stop_load(workers, stop)
+    assert not any(worker.is_alive() for worker in workers)
+
+
+def test_sampler_reraises_callback_error():
+    def callback(result):
+        raise RuntimeError("callback failed")
+    
+    sampler = BenchmarkSampler(window=0.2, hz=10, callback=callback).start()
+    with pytest.raises(RuntimeError, match="callback failed"):
+        sampler.result(timeout=5)
+
+
+def test_sampler_result_times_out():
+    sampler = BenchmarkSampler(window=5, hz=10)
+    with pytest.raises(TimeoutError):
+        sampler.result(timeout=0.1)
+
+
+def test_disk_benchmark_reports_whether_reads_bypassed_cache(tmp_path):
+    probe = tmp_path / "probe.bin"
+    probe.write_bytes(bytes(4096))
+    fd, buffer = open_unbuffered(str(probe))
+    os.close(fd)
+    supported = buffer is not None
+    if supported:
+        buffer.close()
+    probe.unlink()
+    
+    result = disk_benchmark(str(tmp_path), size_mb=4, random_ops=32, repeats=1)
+    
+    assert result["unbuffered"] == supported
+    assert result["seq_read"]["mean"] > 0
+    assert result["random_read"]["mean"] > 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,61 @@
+import functools
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import experiments
+import optimizer
+from experiments import ABExperiment
+from history import BenchmarkHistory
+
+
+def make_experiment(apply, revert, **kwargs):
+    counter = itertools.count()
+    return ABExperiment(apply, revert, lambda: float(next(counter)), rounds=4, warmup=0, settle=0, **kwargs)
+
+
+def test_failed_apply_aborts_and_reverts():
+    calls = []
+    experiment = make_experiment(
+        lambda: calls.append("apply") or {"success": False},
+        lambda: calls.append("revert") or {"success": True}
+    )
+    with pytest.raises(RuntimeError, match="применение"):
+        experiment.run()
+    assert calls == ["apply", "revert"]
+
+
+def test_failed_revert_aborts():
+    calls = []
+    experiment = make_experiment(
+        lambda: calls.append("apply") or {"success": True},
+        lambda: calls.append("revert") or {"success": False}
+    )
+    with pytest.raises(RuntimeError, match="откат"):
+        experiment.run()
+    assert calls == ["apply", "revert", "revert"]
+
+
+def test_power_plan_experiment_restores_captured_plan(tmp_path, monkeypatch):
+    custom = "a1841308-3541-4fab-bc81-f71556f20b4a"
+    commands = []
+    
+    def execute(self, command, shell=True):
+        commands.append(command)
+        if command == "powercfg /getactivescheme":
+            return True, f"Power Scheme GUID: {custom.upper()}  (Power saver)"
+        return True, ""
+    
+    monkeypatch.setattr(optimizer, "LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setattr(optimizer.SystemOptimizer, "_execute_cmd", execute)
+    monkeypatch.setattr(experiments, "ABExperiment", functools.partial(ABExperiment, settle=0, warmup=0))
+    system = optimizer.SystemOptimizer(log_callback=lambda message: None, hardware=SimpleNamespace(start=lambda: None))
+    system._history = BenchmarkHistory(db_file=str(tmp_path / "history.db"), legacy_file=None)
+    
+    system.run_tweak_experiment("power_plan", rounds=2)
+    
+    switches = [command for command in commands if command.startswith("powercfg /setactive")]
+    assert commands[0] == "powercfg /getactivescheme"
+    assert switches[-1] == f"powercfg /setactive {custom}"
+    assert all(command.endswith(("8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c", custom)) for command in switches)
@@ -0,0 +1,98 @@
+import json
+import os
+
+from games import GameLibrary, parse_vdf
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb"):
+        pass
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def steam_manifest(appid, name, install_dir):
+    return (
+        '"AppState"\n{\n'
+        f'\t"appid"\t\t"{appid}"\n'
+        f'\t"name"\t\t"{name}"\n'
+        f'\t"installdir"\t\t"{install_dir}"\n'
+        '}\n'
+    )
+
+
+def make_fixture(tmp_path):
+    steam = tmp_path / "Steam"
+    extra = tmp_path / "SteamLibrary"
+    epic_dir = tmp_path / "Manifests"
+    epic_game = tmp_path / "Epic" / "Fortnite"
+    
+    write(str(steam / "steamapps" / "libraryfolders.vdf"), (
+        '"libraryfolders"\n{\n'
+        f'\t"0"\n\t{{\n\t\t"path"\t\t"{steam}"\n\t}}\n'
+        f'\t"1"\n\t{{\n\t\t"path"\t\t"{extra}"\n\t}}\n'
+        '}\n'
+    ).replace("\\", "\\\\"))
+    write(str(steam / "steamapps" / "appmanifest_730.acf"), steam_manifest(730, "Counter-Strike 2", "CS2"))
+    touch(str(steam / "steamapps" / "common" / "CS2" / "game" / "bin" / "cs2.exe"))
+    touch(str(steam / "steamapps" / "common" / "CS2" / "unins000.exe"))
+    
+    write(str(extra / "steamapps" / "appmanifest_570.acf"), steam_manifest(570, "Dota 2", "dota 2 beta"))
+    touch(str(extra / "steamapps" / "common" / "dota 2 beta" / "dota2.exe"))
+    touch(str(extra / "steamapps" / "common" / "dota 2 beta" / "_CommonRedist" / "vcredist_x64.exe"))
+    
+    write(str(epic_dir / "fortnite.item"), json.dumps({
+        "AppName": "Fortnite",
+        "DisplayName": "Fortnite",
+        "InstallLocation": str(epic_game),
+        "LaunchExecutable": "FortniteGame/Binaries/Win64/FortniteLauncher.exe",
+    }))
+    touch(str(epic_game / "FortniteGame" / "Binaries" / "Win64" / "FortniteLauncher.exe"))
+    
+    library = GameLibrary([str(steam)], [str(epic_dir)], str(tmp_path / "game_index.json"))
+    return library, steam, extra, epic_dir, epic_game
+
+
+def test_parse_vdf_nested_and_escaped():
+    data = parse_vdf('"root"\n{\n\t"path"\t"C:\\\\Games"\n\t"child"\n\t{\n\t\t"k"\t"v"\n\t}\n}')
+    assert data == {"root": {"path": "C:\\Games", "child": {"k": "v"}}}
+
+
+def test_refresh_indexes_steam_and_epic_games(tmp_path):
+    library, steam, extra, _, epic_game = make_fixture(tmp_path)
+    stats = library.refresh()
+    
+    assert stats == {"parsed": 3, "reused": 0, "removed": 0, "errors": 0}
+    assert [game["name"] for game in library.games()] == ["Counter-Strike 2", "Dota 2", "Fortnite"]
+    assert library.is_game(str(steam / "steamapps" / "common" / "CS2" / "game" / "bin" / "cs2.exe"))
+    assert library.is_game(str(extra / "steamapps" / "common" / "dota 2 beta" / "dota2.exe"))
+    assert library.lookup(str(epic_game / "FortniteGame" / "Binaries" / "Win64" / "FortniteLauncher.exe"))["source"] == "epic"
+    assert not library.is_game(str(steam / "steamapps" / "common" / "CS2" / "unins000.exe"))
+    assert not library.is_game(str(extra / "steamapps" / "common" / "dota 2 beta" / "_CommonRedist" / "vcredist_x64.exe"))
+
+
+def test_unchanged_manifests_are_reused_from_index(tmp_path):
+    library, steam, *_ = make_fixture(tmp_path)
+    library.refresh()
+    
+    reloaded = GameLibrary([str(steam)], [str(tmp_path / "Manifests")], str(tmp_path / "game_index.json"))
+    assert reloaded.is_game(str(steam / "steamapps" / "common" / "CS2" / "game" / "bin" / "cs2.exe"))
+    assert reloaded.refresh() == {"parsed": 0, "reused": 3, "removed": 0, "errors": 0}
+
+
+def test_changed_and_removed_manifests(tmp_path):
+    library, steam, _, epic_dir, _ = make_fixture(tmp_path)
+    library.refresh()
+    
+    manifest = str(steam / "steamapps" / "appmanifest_730.acf")
+    os.utime(manifest, (1, 1))
+    os.remove(str(epic_dir / "fortnite.item"))
+    write(str(epic_dir / "broken.item"), "{not json")
+    
+    assert library.refresh() == {"parsed": 1, "reused": 1, "removed": 1, "errors": 1}
+    assert [game["name"] for game in library.games()] == ["Counter-Strike 2", "Dota 2"]
@@ -0,0 +1,76 @@
+import psutil
+import pytest
+
+from games import GameWatcher, PowerPlanController
+
+
+NO_CHANGES = {"priority": None, "affinity": None, "power_plan": None}
+
+
+@pytest.fixture
+def child(spawn):
+    return spawn("fakegame")
+
+
+def make_watcher(games):
+    return GameWatcher(
+        games=games,
+        default_profile=NO_CHANGES,
+        power=PowerPlanController(runner=lambda command: (False, "")),
+        log_callback=lambda message: None,
+    )
+
+
+def test_detects_game_start_and_exit(child):
+    name = child.name()
+    watcher = make_watcher([])
+    watcher.poll()
+    watcher.add_game(name)
+    
+    assert watcher.poll()["started"] == []
+    
+    watcher = make_watcher([name])
+    assert name in watcher.poll()["started"]
+    assert child.pid in watcher.active
+    
+    child.kill()
+    child.wait()
+    assert watcher.poll()["exited"] == [name]
+    assert watcher.active == {}
+
+
+def test_recycled_pid_is_treated_as_new_process(child):
+    watcher = make_watcher([])
+    watcher.poll()
+    key = (child.pid, child.create_time())
+    assert watcher._seen[child.pid] == key[1]
+    
+    watcher._seen[child.pid] = key[1] - 60
+    watcher.active[child.pid] = {
+        "process": child, "key": (child.pid, key[1] - 60), "name": "old.exe",
+        "profile": NO_CHANGES, "nice": child.nice(), "affinity": None,
+    }
+    watcher.add_game(child.name())
+    
+    events = watcher.poll()
+    assert events["exited"] == ["old.exe"]
+    assert events["started"] == [child.name()]
+    assert watcher.active[child.pid]["key"] == key
+
+
+def test_steady_state_poll_only_inspects_new_pids(spawn, monkeypatch):
+    watcher = make_watcher([])
+    watcher.poll()
+    
+    calls = []
+    original = psutil.Process
+    monkeypatch.setattr(psutil, "Process", lambda pid=None: calls.append(pid) or original(pid))
+    
+    child = spawn("steadygame")
+    watcher.poll()
+    assert child.pid in calls
+    assert len(calls) < len(psutil.pids())
+    
+    calls.clear()
+    watcher.poll()
+    assert calls == []
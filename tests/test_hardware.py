@@ -0,0 +1,164 @@
+import os
+import json
+import threading
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+from hardware import AffinityPlanner, HardwareInventory, read_cpu_topology
+
+
+class FakeWMI:
+    
+    def __init__(self):
+        self.calls = []
+    
+    def _record(self, name, items, **filters):
+        self.calls.append((name, filters))
+        return items
+    
+    def Win32_Processor(self, **filters):
+        return self._record("Win32_Processor", [
+            SimpleNamespace(Name=" Fake CPU 9000 ", NumberOfCores=8, NumberOfLogicalProcessors=16),
+        ], **filters)
+    
+    def Win32_VideoController(self, **filters):
+        return self._record("Win32_VideoController", [
+            SimpleNamespace(Name="Fake GPU", DriverVersion="1.2.3", AdapterRAM=8 * 1024 ** 3),
+        ], **filters)
+    
+    def Win32_DiskDrive(self, **filters):
+        return self._record("Win32_DiskDrive", [
+            SimpleNamespace(Model="Fake SSD", InterfaceType="SCSI", MediaType="Fixed", Size=str(512 * 1024 ** 3)),
+        ], **filters)
+    
+    def Win32_NetworkAdapter(self, **filters):
+        return self._record("Win32_NetworkAdapter", [
+            SimpleNamespace(Name="Fake NIC", MACAddress="00:11:22:33:44:55", Speed=1000000000),
+        ], **filters)
+
+
+def make_inventory(tmp_path, boot_id="boot-1", providers=None):
+    providers = providers if providers is not None else []
+    
+    def provider():
+        conn = FakeWMI()
+        providers.append(conn)
+        return conn
+    
+    inventory = HardwareInventory(provider, str(tmp_path / "hardware_cache.json"), boot_id)
+    return inventory, providers
+
+
+def test_refresh_reads_wmi_and_writes_cache(tmp_path):
+    inventory, providers = make_inventory(tmp_path)
+    data = inventory.refresh()
+    
+    assert data["cpu"] == [{"name": "Fake CPU 9000", "cores": 8, "threads": 16}]
+    assert data["gpu"][0]["vram_mb"] == 8192
+    assert data["disks"][0]["size_gb"] == 512
+    assert providers[0].calls[-1] == ("Win32_NetworkAdapter", {"PhysicalAdapter": True})
+    
+    with open(tmp_path / "hardware_cache.json", encoding="utf-8") as f:
+        assert json.load(f)["boot_id"] == "boot-1"
+
+
+def test_cache_from_same_boot_skips_wmi(tmp_path):
+    make_inventory(tmp_path)[0].refresh()
+    
+    inventory, providers = make_inventory(tmp_path)
+    assert inventory.cpu_name() == "Fake CPU 9000"
+    assert inventory.is_fresh
+    assert providers == []
+
+
+def test_cache_from_previous_boot_is_served_then_refreshed(tmp_path):
+    make_inventory(tmp_path)[0].refresh()
+    
+    inventory, providers = make_inventory(tmp_path, boot_id="boot-2")
+    assert inventory.gpu_name() == "Fake GPU"
+    assert inventory.wait(5)
+    assert len(providers) == 1
+    with open(tmp_path / "hardware_cache.json", encoding="utf-8") as f:
+        assert json.load(f)["boot_id"] == "boot-2"
+
+
+def test_connection_is_opened_once_per_thread(tmp_path):
+    inventory, providers = make_inventory(tmp_path)
+    inventory.connection()
+    inventory.connection()
+    thread = threading.Thread(target=inventory.connection)
+    thread.start()
+    thread.join()
+    
+    assert inventory.wmi_connections == 2
+    assert len(providers) == 2
+
+
+def test_unavailable_wmi_leaves_empty_inventory(tmp_path):
+    def broken():
+        raise RuntimeError("no WMI")
+    
+    inventory = HardwareInventory(broken, str(tmp_path / "hardware_cache.json"), "boot-1")
+    assert inventory.refresh() == {}
+    assert inventory.cpu_name() == ""
+    assert not (tmp_path / "hardware_cache.json").exists()
+
+
+def make_cpu_sysfs(tmp_path, cores, hybrid=None):
+    root = tmp_path / "sys" / "devices" / "system" / "cpu"
+    cpus = sorted(cpu for siblings in cores.values() for cpu in siblings)
+    root.mkdir(parents=True)
+    (root / "online").write_text(f"{cpus[0]}-{cpus[-1]}\n")
+    for core_id, siblings in cores.items():
+        for cpu in siblings:
+            base = root / f"cpu{cpu}"
+            (base / "topology").mkdir(parents=True)
+            (base / "topology" / "core_id").write_text(f"{core_id}\n")
+            (base / "topology" / "physical_package_id").write_text("0\n")
+            (base / "cache" / "index3").mkdir(parents=True)
+            (base / "cache" / "index3" / "shared_cpu_list").write_text(f"{cpus[0]}-{cpus[-1]}\n")
+    if hybrid:
+        (tmp_path / "sys" / "devices" / "cpu_core").mkdir()
+        (tmp_path / "sys" / "devices" / "cpu_core" / "cpus").write_text(hybrid + "\n")
+    return str(root)
+
+
+linux_only = pytest.mark.skipif(os.name == "nt", reason="Linux sysfs topology")
+
+
+@linux_only
+def test_smt_siblings_share_a_core(tmp_path):
+    root = make_cpu_sysfs(tmp_path, {0: [0, 4], 1: [1, 5], 2: [2, 6], 3: [3, 7]})
+    planner = AffinityPlanner(read_cpu_topology(root), background_cores=1)
+    
+    assert {key: core["cpus"] for key, core in planner.cores().items()} == {
+        (0, 0): [0, 4], (0, 1): [1, 5], (0, 2): [2, 6], (0, 3): [3, 7],
+    }
+    plan = planner.plan()
+    assert plan["game"] == [1, 2, 3, 5, 6, 7]
+    assert plan["background"] == [0, 4]
+    assert plan["smt"] and plan["isolated"]
+
+
+@linux_only
+def test_hybrid_cpu_keeps_game_on_performance_cores(tmp_path):
+    root = make_cpu_sysfs(tmp_path, {0: [0, 1], 4: [2, 3], 8: [4], 9: [5], 10: [6], 11: [7]}, hybrid="0-3")
+    topology = read_cpu_topology(root)
+    
+    assert [cpu["efficiency"] for cpu in topology] == [1, 1, 1, 1, 0, 0, 0, 0]
+    plan = AffinityPlanner(topology, background_cores=2).plan()
+    assert plan["game"] == [0, 1, 2, 3]
+    assert plan["background"] == [4, 5, 6, 7]
+    assert plan["game_cores"] == 2
+
+
+@linux_only
+def test_missing_topology_falls_back_to_logical_cpus(tmp_path):
+    topology = read_cpu_topology(str(tmp_path / "missing"))
+    
+    assert [cpu["cpu"] for cpu in topology] == list(range(psutil.cpu_count() or 1))
+    assert len({cpu["core"] for cpu in topology}) == len(topology)
+    plan = AffinityPlanner(topology[:1]).plan()
+    assert plan == {"game": [0], "background": [0], "isolated": False}
@@ -0,0 +1,49 @@
+import sqlite3
+
+from history import BenchmarkHistory
+
+
+def test_latest_ambient_skips_other_kinds(tmp_path):
+    history = BenchmarkHistory(db_file=str(tmp_path / "history.db"), legacy_file=None)
+    history.append({"timestamp": 1.0, "cpu_usage": 10.0}, "manual")
+    history.append({"timestamp": 2.0, "cpu_usage": 90.0}, "synthetic", kind="synthetic")
+    history.append({"timestamp": 3.0}, "network loopback", kind="network")
+    history.flush(5)
+    
+    assert history.latest()["tag"] == "network loopback"
+    previous = history.latest(kind="ambient")
+    assert previous["tag"] == "manual"
+    assert previous["kind"] == "ambient"
+    assert history.aggregate("cpu_usage", kind="ambient") == 10.0
+
+
+def test_old_database_is_migrated(tmp_path):
+    db_file = str(tmp_path / "history.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, "
+        "tag TEXT NOT NULL DEFAULT '', cpu_usage REAL, ram_percent REAL, ram_available_gb REAL, "
+        "disk_read_speed REAL, disk_write_speed REAL, processes_count INTEGER, data TEXT NOT NULL)"
+    )
+    for timestamp, tag in ((1.0, "after Gaming"), (2.0, "synthetic after Gaming"), (3.0, "sched latency idle")):
+        conn.execute("INSERT INTO runs (timestamp, tag, data) VALUES (?, ?, '{}')", (timestamp, tag))
+    conn.commit()
+    conn.close()
+    
+    history = BenchmarkHistory(db_file=db_file, legacy_file=None)
+    kinds = {run["tag"]: run["kind"] for run in history.query()}
+    assert kinds == {"after Gaming": "ambient", "synthetic after Gaming": "synthetic", "sched latency idle": "sched"}
+    assert history.latest(kind="ambient")["tag"] == "after Gaming"
+
+
+def test_kind_decides_comparison_baseline(tmp_path):
+    history = BenchmarkHistory(db_file=str(tmp_path / "history.db"), legacy_file=None)
+    history.append({"timestamp": 1.0}, "nightly suite", kind="synthetic")
+    history.append({"timestamp": 2.0}, "synthetic-looking ambient run")
+    history.append({"timestamp": 3.0}, "network 10.0.0.2:27015", kind="network")
+    history.append({"timestamp": 4.0}, "network 10.0.0.2:27015 note")
+    history.flush(5)
+    
+    assert history.latest(kind="synthetic")["tag"] == "nightly suite"
+    assert history.latest_matching("network 10.0.0.2:27015%", kind="network")["timestamp"] == 3.0
+    assert history.latest_matching("synthetic%")["kind"] == "ambient"
@@ -0,0 +1,55 @@
+import multiprocessing
+
+import psutil
+
+from latency import HISTOGRAM_EDGES_US, histogram, scheduling_latency_probe, timer_probe
+
+
+def test_histogram_buckets():
+    assert histogram([5, 15, 15, 150, 50000], edges=(0, 10, 20, 100, 1000)) == [1, 2, 0, 1, 1]
+
+
+def test_loaded_probe_covers_every_core_and_cleans_up(monkeypatch):
+    spawned = []
+    ctx = multiprocessing.get_context()
+    original = ctx.Process
+    
+    def track(*args, **kwargs):
+        process = original(*args, **kwargs)
+        spawned.append(process)
+        return process
+    
+    monkeypatch.setattr(ctx, "Process", track)
+    cpus = sorted(psutil.Process().cpu_affinity())
+    result = scheduling_latency_probe(interval=0.002, duration=0.1, load="others")
+    
+    assert [core["cpu"] for core in result["cores"]] == cpus
+    assert all(core["count"] > 0 for core in result["cores"])
+    assert len(spawned) == len(cpus) + max(1, len(cpus) - 1)
+    assert not any(process.is_alive() for process in spawned)
+
+
+def test_timer_probe_reports_ordered_percentiles():
+    cpu = sorted(psutil.Process().cpu_affinity())[0]
+    result = timer_probe(cpus=[cpu], sleeps=(0.0005, 0.001), samples=20, budget=0.1)
+    
+    core = result["cores"][0]
+    assert core["cpu"] == cpu and core["pinned"]
+    assert set(core["sleeps"]) == {"0.5ms", "1ms"}
+    wakeup = core["wakeup"]
+    assert wakeup["count"] == sum(wakeup["histogram"]) > 0
+    assert wakeup["p50_us"] <= wakeup["p99_us"] <= wakeup["max_us"]
+    assert result["p99_us"] == wakeup["p99_us"]
+    assert result["sleep_granularity_us"] >= 500 * 0.9
+    assert len(result["histogram"]) == len(HISTOGRAM_EDGES_US)
+
+
+def test_idle_cyclic_probe_reports_overruns():
+    result = scheduling_latency_probe(interval=0.002, duration=0.1)
+    
+    for core in result["cores"]:
+        assert core["count"] == 50
+        assert core["min_us"] <= core["p50_us"] <= core["p99_us"] <= core["max_us"]
+        assert 0 <= core["overruns"] <= core["count"]
+    assert result["worst_p99_us"] == max(core["p99_us"] for core in result["cores"])
+    assert sum(result["heatmap"]["counts"][0]) == 50
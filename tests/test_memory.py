@@ -0,0 +1,169 @@
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import psutil
+
+from memory import LeakDetector, MemoryAnalyzer, _Series
+from processes import ProcessSnapshot, ProcessTree
+
+MB = 1024 * 1024
+
+
+LEAKER = """
+import time
+chunks = []
+while True:
+    chunks.append(bytearray(2 * 1024 * 1024))
+    time.sleep(0.05)
+"""
+
+STEADY = """
+import time
+data = bytearray(20 * 1024 * 1024)
+while True:
+    time.sleep(1)
+"""
+
+
+def test_series_fit_recovers_slope():
+    series = _Series(10, 0.0)
+    for i in range(10):
+        series.add(float(i), int((100 + 2 * i) * 1024 * 1024))
+    fit = series.fit()
+    assert abs(fit["slope_mb_per_hour"] - 7200) < 1
+    assert fit["r2"] > 0.999
+    
+    for i in range(10, 25):
+        series.add(float(i), 50 * 1024 * 1024)
+    assert series.count == 10
+    assert abs(series.fit()["slope_mb_per_hour"]) < 1
+
+
+def test_leaking_child_is_flagged_and_steady_one_is_not():
+    leaker = subprocess.Popen([sys.executable, "-c", LEAKER])
+    steady = subprocess.Popen([sys.executable, "-c", STEADY])
+    try:
+        detector = LeakDetector(
+            snapshot=ProcessSnapshot(attrs=("name", "memory_info"), max_age=0),
+            log_callback=lambda message: None,
+            interval=0.1,
+            window=20,
+            min_samples=8,
+            min_age=0,
+            slope_threshold=1000,
+            min_growth=10,
+            max_tracked=4096,
+        )
+        time.sleep(0.3)
+        for _ in range(12):
+            detector.sample()
+            time.sleep(0.1)
+        
+        flagged = {fit["pid"] for fit in detector.report()}
+        assert leaker.pid in flagged
+        assert steady.pid not in flagged
+        assert detector.memory_bytes() <= detector.max_tracked * detector.window * 8
+    finally:
+        for child in (leaker, steady):
+            child.kill()
+            child.wait()
+
+
+def test_tracking_is_bounded():
+    detector = LeakDetector(
+        snapshot=ProcessSnapshot(attrs=("name", "memory_info"), max_age=0),
+        log_callback=lambda message: None,
+        window=8,
+        min_age=0,
+        max_tracked=3,
+    )
+    detector.sample()
+    detector.sample()
+    assert detector.stats["tracked"] <= 3
+    assert detector.memory_bytes() <= 3 * 8 * 8
+
+
+class FakeProcess:
+    
+    def __init__(self, pid, uss):
+        self.pid = pid
+        self.uss = uss
+    
+    def memory_full_info(self):
+        if self.uss is None:
+            raise psutil.AccessDenied(self.pid)
+        return SimpleNamespace(uss=self.uss, pss=self.uss, swap=0)
+
+
+class FakeSnapshot:
+    
+    def __init__(self, rows, uss):
+        self.rows = rows
+        self.tick = 1
+        self.added = set()
+        self.removed = set()
+        self._procs = {pid: FakeProcess(pid, uss.get(pid)) for pid in rows}
+    
+    def require(self, *attrs):
+        pass
+    
+    def get(self, max_age=None):
+        return self.rows
+    
+    def process(self, pid):
+        return self._procs.get(pid)
+
+
+def fake_rows():
+    def row(pid, name, ppid, exe):
+        return {"pid": pid, "name": name, "ppid": ppid, "exe": exe, "create_time": 1000.0 + pid, "rss": 10 * MB}
+    
+    return {
+        1: row(1, "systemd", 0, "/usr/lib/systemd/systemd"),
+        100: row(100, "launcher", 1, "/games/app/launcher"),
+        101: row(101, "renderer", 100, "/games/app/bin/renderer"),
+        102: row(102, "launcher", 1, "/games/app/launcher"),
+        200: row(200, "helper", 100, "/usr/bin/helper"),
+    }
+
+
+def make_analyzer():
+    uss = {1: 1 * MB, 100: 5 * MB, 101: 7 * MB, 102: 3 * MB, 200: None}
+    snapshot = FakeSnapshot(fake_rows(), uss)
+    return MemoryAnalyzer(snapshot=snapshot, workers=2), snapshot
+
+
+def test_analyze_groups_by_name():
+    analyzer, _ = make_analyzer()
+    try:
+        apps = {app["app"]: app for app in analyzer.analyze(group_by="name")["apps"]}
+    finally:
+        analyzer.close()
+    
+    assert apps["launcher"]["processes"] == 2
+    assert apps["launcher"]["uss"] == 8 * MB
+    assert apps["renderer"]["uss"] == 7 * MB
+    assert apps["helper"]["partial"]
+    assert apps["helper"]["uss"] == 0
+
+
+def test_analyze_groups_by_tree_with_one_tree_update(monkeypatch):
+    analyzer, _ = make_analyzer()
+    updates = []
+    original = ProcessTree.update
+    monkeypatch.setattr(ProcessTree, "update", lambda self, *a: updates.append(1) or original(self, *a))
+    try:
+        result = analyzer.analyze(group_by="tree")
+    finally:
+        analyzer.close()
+    apps = {app["app"]: app for app in result["apps"]}
+    
+    assert len(updates) == 1
+    assert apps["launcher"]["processes"] == 3
+    assert apps["launcher"]["uss"] == 15 * MB
+    assert "renderer" not in apps
+    assert apps["helper"]["processes"] == 1
+    assert apps["systemd"]["processes"] == 1
+    assert result["total_uss"] == 16 * MB
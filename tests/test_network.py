@@ -0,0 +1,44 @@
+import os
+import sys
+import socket
+import subprocess
+
+import network
+from network import EchoServer, run_network_benchmark
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_host_without_port_uses_default_port(monkeypatch):
+    port = free_port()
+    monkeypatch.setattr(network, "DEFAULT_PORT", port)
+    with EchoServer("127.0.0.1", port):
+        result = run_network_benchmark("127.0.0.1", duration=0.25)
+    
+    assert result["udp"]["received"] > 0
+    assert result["tcp"]["received"] > 0
+
+
+def test_remote_run_against_serve_process():
+    port = free_port()
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "network.py")
+    server = subprocess.Popen([sys.executable, "-u", script, "--serve", "--port", str(port)], stdout=subprocess.PIPE, text=True)
+    try:
+        assert f"UDP {port} / TCP {port}" in server.stdout.readline()
+        result = run_network_benchmark("127.0.0.1", port, port, duration=0.5)
+    finally:
+        server.kill()
+        server.wait()
+    
+    assert result["host"] == "127.0.0.1"
+    for protocol in ("udp", "tcp"):
+        stats = result[protocol]
+        assert stats["protocol"] == protocol
+        assert stats["sent"] == 32
+        assert stats["received"] == stats["sent"]
+        assert stats["loss_pct"] == 0.0
+        assert 0 < stats["mean_ms"] <= stats["max_ms"]
@@ -0,0 +1,65 @@
+import psutil
+
+from policies import PolicyEngine, PolicyRule
+from processes import PRIORITY_CLASSES
+
+
+def test_rule_applies_once_to_new_process(spawn):
+    engine = PolicyEngine(
+        [PolicyRule("child", {"name": "policychild*"}, priority="below_normal", io_priority="very_low")],
+        log_callback=lambda message: None,
+    )
+    engine.evaluate()
+    
+    child = spawn("policychild")
+    assert (child.pid, "child") in engine.evaluate()
+    assert child.nice() == PRIORITY_CLASSES["below_normal"]
+    assert child.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+    
+    assert engine.evaluate() == []
+    assert engine.rule_stats["child"] == 1
+
+
+def test_parent_rule_matches_spawning_process(spawn):
+    parent = psutil.Process().name()
+    engine = PolicyEngine(
+        [PolicyRule("from parent", {"name": "orphan*", "parent": parent}, priority="below_normal")],
+        log_callback=lambda message: None,
+    )
+    engine.evaluate()
+    child = spawn("orphanchild")
+    
+    assert (child.pid, "from parent") in engine.evaluate()
+
+
+def test_steady_state_reads_attributes_only_for_new_pids(spawn, monkeypatch):
+    engine = PolicyEngine([PolicyRule("none", {"name": "nothing-matches"})], log_callback=lambda message: None)
+    engine.evaluate()
+    
+    calls = []
+    original = psutil.Process.as_dict
+    monkeypatch.setattr(psutil.Process, "as_dict", lambda self, *a, **k: calls.append(self.pid) or original(self, *a, **k))
+    
+    child = spawn("steadychild")
+    before = engine.stats["new"]
+    engine.evaluate()
+    
+    assert child.pid in calls
+    assert len(calls) == engine.stats["new"] - before
+    assert len(calls) < len(psutil.pids())
+
+
+def test_recycled_pid_gets_rules_applied_again(spawn):
+    engine = PolicyEngine(
+        [PolicyRule("child", {"name": "recycledchild*"}, priority="below_normal")],
+        log_callback=lambda message: None,
+    )
+    child = spawn("recycledchild")
+    assert (child.pid, "child") in engine.evaluate()
+    assert engine.evaluate() == []
+    
+    child.nice(0)
+    engine._seen[child.pid] = child.create_time() - 60
+    assert (child.pid, "child") in engine.evaluate()
+    assert child.nice() == PRIORITY_CLASSES["below_normal"]
+    assert engine.rule_stats["child"] == 2
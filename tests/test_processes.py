@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from optimizer import ProcessOptimizer
+from processes import ProcessSnapshot, get_shared_snapshot
+
+
+def test_injected_empty_snapshot_is_kept():
+    snapshot = ProcessSnapshot()
+    assert len(snapshot) == 0
+    assert snapshot
+    
+    optimizer = ProcessOptimizer(log_callback=lambda message: None, snapshot=snapshot)
+    assert optimizer._snapshot is snapshot
+    assert optimizer._snapshot is not get_shared_snapshot()
+
+
+def test_snapshot_reports_added_and_removed_pids():
+    snapshot = ProcessSnapshot(attrs=("name",))
+    snapshot.refresh()
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        snapshot.refresh()
+        assert child.pid in snapshot.added
+        assert snapshot.key(child.pid) is not None
+    finally:
+        child.kill()
+        child.wait()
+    
+    snapshot.refresh()
+    assert child.pid in snapshot.removed
+    assert child.pid not in snapshot.rows
+
+
+def test_heavy_processes_respects_limit_within_one_tick():
+    snapshot = ProcessSnapshot()
+    optimizer = ProcessOptimizer(log_callback=lambda message: None, snapshot=snapshot)
+    snapshot.refresh()
+    available = len(snapshot.rows)
+    
+    assert len(optimizer.get_resource_heavy_processes(limit=3)) == min(3, available)
+    assert len(optimizer.get_resource_heavy_processes(limit=10)) == min(10, available)
+    assert len(optimizer.get_resource_heavy_processes(limit=2)) == min(2, available)
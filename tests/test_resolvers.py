@@ -0,0 +1,27 @@
+from resolvers import StubDnsServer, benchmark_resolvers
+
+
+def test_fast_stub_wins_and_lossy_stub_ranks_last():
+    with StubDnsServer(delay=0.002) as fast, StubDnsServer(delay=0.02) as slow, StubDnsServer(drop_rate=0.5) as lossy:
+        result = benchmark_resolvers([lossy.address, slow.address, fast.address], repeats=2, timeout=0.3)
+    
+    ranking = {entry["server"]: entry for entry in result["ranking"]}
+    assert [entry["server"] for entry in result["ranking"]] == [fast.address, slow.address, lossy.address]
+    assert result["winner"] == fast.address
+    
+    assert ranking[fast.address]["failed"] == 0
+    assert ranking[fast.address]["median_ms"] < ranking[slow.address]["median_ms"]
+    lossy_entry = ranking[lossy.address]
+    assert lossy_entry["failed"] == lossy_entry["errors"]["timeout"] > 0
+    assert lossy_entry["failure_pct"] > 20.0
+
+
+def test_error_rcode_and_dead_server_are_counted():
+    with StubDnsServer(rcode=2) as servfail:
+        result = benchmark_resolvers([servfail.address, "127.0.0.1:9"], repeats=1, timeout=0.2)
+    
+    ranking = {entry["server"]: entry for entry in result["ranking"]}
+    assert result["winner"] is None
+    assert ranking[servfail.address]["errors"]["rcode"] == ranking[servfail.address]["sent"]
+    assert ranking["127.0.0.1:9"]["median_ms"] is None
+    assert ranking["127.0.0.1:9"]["failure_pct"] == 100.0
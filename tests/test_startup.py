@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import subprocess
+import importlib.util
+
+import pytest
+
+from profiling import run_startup_benchmark
+
+
+STARTUP_BUDGET_MS = 1000
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.skipif(
+    (os.name != "nt" and not os.environ.get("DISPLAY")) or importlib.util.find_spec("customtkinter") is None,
+    reason="GUI startup needs a display and customtkinter; headless CI covers only the backend startup"
+)
+def test_gui_startup_within_budget():
+    result = run_startup_benchmark(runs=1, budget_ms=STARTUP_BUDGET_MS * 3)
+    
+    assert result["errors"] == []
+    assert result["metric"] == "interactive_ms"
+    assert not result["regression"], result
+
+
+def test_headless_startup_within_budget():
+    result = run_startup_benchmark(runs=3, budget_ms=STARTUP_BUDGET_MS, headless=True)
+    
+    assert result["errors"] == []
+    assert result["runs"] == 3
+    assert not result["regression"], result
+
+
+def test_regression_against_baseline(tmp_path):
+    baseline = tmp_path / "startup_baseline.json"
+    baseline.write_text(json.dumps({"ready_ms": {"median": 0.001}}), encoding="utf-8")
+    
+    result = run_startup_benchmark(runs=1, baseline_file=str(baseline), headless=True)
+    assert result["baseline_ms"] == 0.001
+    assert result["regression"]
+
+
+def test_missing_baseline_is_recorded(tmp_path):
+    baseline = tmp_path / "startup_baseline.json"
+    
+    result = run_startup_benchmark(runs=1, baseline_file=str(baseline), headless=True)
+    assert not result["regression"]
+    assert json.loads(baseline.read_text(encoding="utf-8"))["ready_ms"]["median"] > 0
+
+
+def test_optimizer_import_skips_asyncio():
+    output = subprocess.run(
+        [sys.executable, "-c", "import sys, optimizer; print('asyncio' in sys.modules, 'ssl' in sys.modules)"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split() == ["False", "False"]
+
+
+def test_corrupt_baseline_is_reported_not_overwritten(tmp_path):
+    baseline = tmp_path / "startup_baseline.json"
+    baseline.write_text(json.dumps({"interactive_ms": {"median": 100.0}}), encoding="utf-8")
+    
+    result = run_startup_benchmark(runs=1, baseline_file=str(baseline), headless=True)
+    assert result["regression"]
+    assert any("KeyError" in error for error in result["errors"])
+    assert json.loads(baseline.read_text(encoding="utf-8")) == {"interactive_ms": {"median": 100.0}}
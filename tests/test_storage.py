@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+import functools
+from types import SimpleNamespace
+
+import pytest
+
+import optimizer
+import storage
+from benchmarks import open_unbuffered, read_at
+from storage import StorageBenchmark, discover_volumes, optimize_volumes
+
+
+OPTIONS = {"size_mb": 2, "queue_depths": (1,), "duration": 0.05, "fsync_samples": 5}
+
+
+def make_benchmark(tmp_path):
+    return StorageBenchmark(cache_file=str(tmp_path / "storage_cache.json"), **OPTIONS)
+
+
+def test_unbuffered_read_returns_full_blocks(tmp_path):
+    path = tmp_path / "probe.bin"
+    path.write_bytes(os.urandom(storage.BLOCK * 4))
+    fd, buffer = open_unbuffered(str(path))
+    try:
+        assert read_at(fd, storage.BLOCK * 2, buffer) == storage.BLOCK
+    finally:
+        os.close(fd)
+        if buffer is not None:
+            buffer.close()
+
+
+def test_os_media_overrides_benchmark_guess(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "classify_media", lambda result: "hdd")
+    bench = make_benchmark(tmp_path)
+    
+    decision = bench.needs_trim(str(tmp_path), media="ssd")
+    assert decision["result"]["media"] == "ssd"
+    assert decision["result"]["media_source"] == "os"
+    assert decision["trim"]
+    
+    cached = bench.needs_trim(str(tmp_path), media="ssd")
+    assert cached["result"]["timestamp"] == decision["result"]["timestamp"]
+
+
+def test_hdd_is_not_measured(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("HDD must not be benchmarked")
+    
+    monkeypatch.setattr(storage, "benchmark_volume", fail)
+    decision = make_benchmark(tmp_path).needs_trim(str(tmp_path), media="hdd")
+    assert not decision["trim"]
+    assert decision["media"] == "hdd"
+    assert decision["result"] is None
+
+
+def test_unknown_media_falls_back_to_benchmark(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "classify_media", lambda result: "hdd")
+    result = make_benchmark(tmp_path).measure(str(tmp_path), media="unknown")
+    assert result["media"] == "hdd"
+    assert result["media_source"] == "benchmark"
+
+
+def volume(drive, disk, media="ssd", removable=False):
+    return {"device": drive, "mountpoint": drive, "drive": drive, "fstype": "ext4", "disk": disk, "media": media, "removable": removable}
+
+
+class RecordingRunner:
+    
+    def __init__(self, delay=0.2, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.spans = {}
+        self._lock = threading.Lock()
+    
+    def __call__(self, command):
+        drive = command.split('"')[1] if '"' in command else command.split()[1]
+        started = time.perf_counter()
+        time.sleep(self.delay)
+        with self._lock:
+            self.spans[drive] = (started, time.perf_counter())
+        return drive not in self.fail, ""
+    
+    def overlap(self, a, b):
+        return self.spans[a][0] < self.spans[b][1] and self.spans[b][0] < self.spans[a][1]
+
+
+def test_same_disk_serial_different_disks_concurrent():
+    runner = RecordingRunner()
+    volumes = [volume("/a1", "sda"), volume("/a2", "sda"), volume("/b1", "sdb")]
+    
+    results = optimize_volumes(volumes, lambda v: runner(f'fstrim -v "{v["mountpoint"]}"')[0])
+    
+    assert [r["volume"]["drive"] for r in results] == ["/a1", "/a2", "/b1"]
+    assert all(r["success"] for r in results)
+    assert not runner.overlap("/a1", "/a2")
+    assert runner.overlap("/a1", "/b1") or runner.overlap("/a2", "/b1")
+
+
+def test_optimize_volumes_reports_each_failure():
+    def optimize(v):
+        if v["drive"] == "/boom":
+            raise OSError("device busy")
+        return v["drive"] != "/refused"
+    
+    results = optimize_volumes([volume("/ok", "sda"), volume("/boom", "sda"), volume("/refused", "sdb")], optimize)
+    by_drive = {r["volume"]["drive"]: r for r in results}
+    
+    assert by_drive["/ok"]["success"]
+    assert not by_drive["/boom"]["success"] and by_drive["/boom"]["error"] == "device busy"
+    assert not by_drive["/refused"]["success"] and by_drive["/refused"]["error"] is None
+
+
+def test_run_trim_per_volume_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(optimizer, "LOG_DIR", str(tmp_path / "logs"))
+    system = optimizer.SystemOptimizer(log_callback=lambda message: None, hardware=SimpleNamespace(start=lambda: None))
+    system._is_admin = True
+    runner = RecordingRunner(delay=0.1, fail={"/b1"})
+    volumes = [volume("/a1", "sda"), volume("/a2", "sda"), volume("/b1", "sdb", "hdd"), volume("/usb", "sdc", removable=True)]
+    
+    results = system.run_trim(volumes=volumes, runner=runner)
+    
+    assert results["success"]
+    assert results["drives"] == ["/a1", "/a2"]
+    assert [(v["drive"], v["disk"], v["trimmed"]) for v in results["volumes"]] == [
+        ("/a1", "sda", True), ("/a2", "sda", True), ("/b1", "sdb", False)
+    ]
+    assert "/usb" not in runner.spans
+    assert not runner.overlap("/a1", "/a2")
+    assert runner.overlap("/b1", "/a1")
+
+
+def test_benchmarked_trim_still_optimizes_hdd(tmp_path, monkeypatch):
+    monkeypatch.setattr(optimizer, "LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setattr(storage, "benchmark_volume", lambda *args, **kwargs: pytest.fail("HDD must not be benchmarked"))
+    system = optimizer.SystemOptimizer(log_callback=lambda message: None, hardware=SimpleNamespace(start=lambda: None))
+    system._is_admin = True
+    system._storage = make_benchmark(tmp_path)
+    runner = RecordingRunner(delay=0.0)
+    
+    results = system.run_trim(benchmark=True, volumes=[volume("/h1", "sdb", "hdd")], runner=runner)
+    
+    assert results["drives"] == ["/h1"]
+    assert results["decisions"] == {"/h1": "не SSD"}
+    assert results["effects"] == {}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Linux sysfs layout")
+def test_discover_volumes_with_fake_partitions(tmp_path, monkeypatch):
+    sysfs = tmp_path / "block"
+    for disk, rotational in (("sda", "0"), ("sdb", "1")):
+        (sysfs / disk / "queue").mkdir(parents=True)
+        (sysfs / disk / "queue" / "rotational").write_text(rotational + "\n")
+        (sysfs / disk / f"{disk}1").mkdir()
+        (sysfs / disk / f"{disk}1" / "partition").write_text("1\n")
+        (sysfs / f"{disk}1").symlink_to(sysfs / disk / f"{disk}1")
+    monkeypatch.setattr(storage, "_linux_disk", functools.partial(storage._linux_disk, root=str(sysfs)))
+    monkeypatch.setattr(storage, "_linux_media", functools.partial(storage._linux_media, root=str(sysfs)))
+    
+    def part(device, mountpoint, fstype="ext4", opts="rw"):
+        return SimpleNamespace(device=device, mountpoint=mountpoint, fstype=fstype, opts=opts)
+    
+    volumes = discover_volumes([
+        part("/dev/sda1", "/"),
+        part("/dev/sda1", "/mnt/bind"),
+        part("/dev/sdb1", "/data", opts="rw,removable"),
+        part("tmpfs", "/run", fstype="tmpfs"),
+        part("/dev/sr0", "/media/cd", fstype="iso9660"),
+        part("/dev/mapper/vg-root", "/srv"),
+    ], runner=lambda command: (False, ""))
+    
+    assert [(v["mountpoint"], v["disk"], v["media"], v["removable"]) for v in volumes] == [
+        ("/", "sda", "ssd", False),
+        ("/data", "sdb", "hdd", True),
+        ("/srv", "/dev/mapper/vg-root", "unknown", False),
+    ]
@@ -0,0 +1,94 @@
+import os
+import time
+
+import psutil
+import pytest
+
+from processes import PRIORITY_CLASSES, ProcessSnapshot
+from throttler import BackgroundThrottler
+
+
+@pytest.fixture
+def busy_children(spawn):
+    busy = spawn("busychild", "while True: pass")
+    idle = spawn("idlechild")
+    busy.ionice(psutil.IOPRIO_CLASS_BE, 2)
+    return busy, idle
+
+
+def make_throttler(foreground=None):
+    return BackgroundThrottler(
+        foreground=lambda: foreground or [os.getpid()],
+        snapshot=ProcessSnapshot(max_age=0),
+        log_callback=lambda message: None,
+        cpu_threshold=30.0,
+        window=2,
+        min_hold=0.0,
+        interval=0.1,
+    )
+
+
+def run_ticks(throttler, ticks=4):
+    for _ in range(ticks):
+        throttler.update()
+        time.sleep(0.25)
+
+
+def test_busy_child_is_throttled_and_restored_exactly(busy_children):
+    busy, idle = busy_children
+    throttler = make_throttler()
+    run_ticks(throttler)
+    
+    keys = {key[0] for key in throttler.throttled}
+    assert busy.pid in keys
+    assert idle.pid not in keys
+    assert busy.nice() == PRIORITY_CLASSES["below_normal"]
+    assert busy.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+    
+    assert busy.name() in throttler.restore_all()
+    assert busy.nice() == 0
+    assert tuple(busy.ionice()) == (psutil.IOPRIO_CLASS_BE, 2)
+    assert throttler.throttled == {}
+
+
+def test_failed_restore_is_reported_and_retried(busy_children, monkeypatch):
+    busy, _ = busy_children
+    throttler = make_throttler()
+    run_ticks(throttler)
+    assert busy.pid in {key[0] for key in throttler.throttled}
+    
+    original = psutil.Process.nice
+    
+    def unprivileged_nice(self, value=None):
+        if value is not None and value < original(self):
+            raise psutil.AccessDenied(self.pid)
+        return original(self, value)
+    
+    monkeypatch.setattr(psutil.Process, "nice", unprivileged_nice)
+    released = throttler.restore_all()
+    
+    assert busy.name() not in released
+    assert throttler.stats["restore_failed"] >= 1
+    assert busy.pid in {key[0] for key in throttler.failed_restores}
+    assert busy.nice() == PRIORITY_CLASSES["below_normal"]
+    
+    monkeypatch.setattr(psutil.Process, "nice", original)
+    assert busy.name() in throttler.retry_restores()
+    assert busy.nice() == 0
+    assert tuple(busy.ionice()) == (psutil.IOPRIO_CLASS_BE, 2)
+    assert throttler.failed_restores == {}
+
+
+def test_throttled_process_restored_when_it_becomes_foreground(busy_children):
+    busy, _ = busy_children
+    foreground = [os.getpid()]
+    throttler = make_throttler(foreground)
+    run_ticks(throttler)
+    assert busy.pid in {key[0] for key in throttler.throttled}
+    
+    foreground.append(busy.pid)
+    assert busy.name() in throttler.update()["released"]
+    assert busy.nice() == 0
+    assert tuple(busy.ionice()) == (psutil.IOPRIO_CLASS_BE, 2)
+    assert throttler.throttled == {}
+    assert throttler.failed_restores == {}
@@ -0,0 +1,234 @@
+import os
+import time
+import threading
+import psutil
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+from processes import IO_PRIORITIES, PRIORITY_CLASSES, ProcessSnapshot, get_shared_snapshot
+
+
+PROTECTED_PROCESSES = {
+    "system", "system idle process", "registry", "smss.exe", "csrss.exe", "wininit.exe",
+    "winlogon.exe", "services.exe", "lsass.exe", "dwm.exe", "audiodg.exe", "explorer.exe",
+    "systemd", "kthreadd", "xorg", "pulseaudio", "pipewire",
+}
+
+
+class BackgroundThrottler:
+    
+    def __init__(
+        self,
+        foreground: Callable[[], Iterable[int]],
+        snapshot: Optional[ProcessSnapshot] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
+        cpu_threshold: float = 25.0,
+        io_threshold: float = 10 * 1024 * 1024,
+        window: int = 5,
+        release_ratio: float = 0.5,
+        min_hold: float = 10.0,
+        priority: str = "below_normal",
+        io_priority: Optional[str] = "very_low",
+        protected: Iterable[str] = PROTECTED_PROCESSES,
+        interval: float = 1.0
+    ):
+        self._foreground = foreground
+        self._snapshot = snapshot if snapshot is not None else get_shared_snapshot()
+        self._log = log_callback or print
+        self.cpu_threshold = cpu_threshold
+        self.io_threshold = io_threshold
+        self.window = window
+        self.release_ratio = release_ratio
+        self.min_hold = min_hold
+        self.priority = priority
+        self.io_priority = io_priority if io_priority in IO_PRIORITIES else None
+        self.protected = {name.lower() for name in protected}
+        self.interval = interval
+        
+        self._samples = {}
+        self.throttled = {}
+        self.failed_restores = {}
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.RLock()
+        self.stats = {"ticks": 0, "throttled": 0, "released": 0, "restore_failed": 0, "tick_ms": 0.0}
+    
+    def update(self) -> dict:
+        with self._lock:
+            started = time.perf_counter()
+            events = {"throttled": [], "released": []}
+            foreground = set(self._foreground() or ())
+            if self.failed_restores:
+                events["released"] = self.retry_restores()
+            
+            if not foreground:
+                if self.throttled:
+                    events["released"] += self.restore_all()
+                self._samples.clear()
+                self._finish_tick(started)
+                return events
+            
+            rows = self._snapshot.get()
+            now = time.monotonic()
+            alive = set()
+            
+            for pid, row in rows.items():
+                key = (pid, row["create_time"])
+                if pid in foreground or pid == os.getpid() or self._is_protected(row):
+                    if key in self.throttled and self._restore(key):
+                        events["released"].append(row.get("name"))
+                    continue
+                alive.add(key)
+                
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = deque(maxlen=self.window)
+                samples.append((
+                    row.get("cpu_percent") or 0.0,
+                    row.get("io_read_rate", 0.0) + row.get("io_write_rate", 0.0),
+                ))
+                if len(samples) < self.window:
+                    continue
+                
+                cpu = sum(s[0] for s in samples) / len(samples)
+                io = sum(s[1] for s in samples) / len(samples)
+                record = self.throttled.get(key)
+                
+                if record is None:
+                    if cpu > self.cpu_threshold or io > self.io_threshold:
+                        if self._throttle(key, row):
+                            events["throttled"].append(row.get("name"))
+                elif now - record["since"] >= self.min_hold:
+                    if cpu < self.cpu_threshold * self.release_ratio and io < self.io_threshold * self.release_ratio:
+                        if self._restore(key):
+                            events["released"].append(row.get("name"))
+            
+            for key in list(self._samples):
+                if key not in alive:
+                    del self._samples[key]
+            for key in list(self.throttled):
+                if key not in alive:
+                    del self.throttled[key]
+            
+            self._finish_tick(started)
+            return events
+    
+    def _finish_tick(self, started: float):
+        self.stats["ticks"] += 1
+        self.stats["tick_ms"] = (time.perf_counter() - started) * 1000
+    
+    def _is_protected(self, row: dict) -> bool:
+        return (row.get("name") or "").lower() in self.protected
+    
+    def _throttle(self, key: tuple, row: dict) -> bool:
+        proc = self._snapshot.process(key[0])
+        if proc is None:
+            return False
+        
+        target = PRIORITY_CLASSES[self.priority]
+        try:
+            nice = proc.nice()
+            if nice == target:
+                return False
+            ionice = proc.ionice() if self.io_priority else None
+            proc.nice(target)
+            if self.io_priority:
+                proc.ionice(*IO_PRIORITIES[self.io_priority])
+        except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError, ValueError):
+            return False
+        
+        self.throttled[key] = {
+            "process": proc,
+            "name": row.get("name"),
+            "nice": nice,
+            "ionice": ionice,
+            "since": time.monotonic(),
+        }
+        self.stats["throttled"] += 1
+        self._log(f"  Фоновый процесс ограничен: {row.get('name')} (PID {key[0]})")
+        return True
+    
+    def _restore_parts(self, record: dict) -> list:
+        proc = record["process"]
+        failed = []
+        for part in list(record.get("pending") or ("nice", "ionice")):
+            try:
+                if part == "nice":
+                    proc.nice(record["nice"])
+                elif record["ionice"] is not None:
+                    ionice = record["ionice"]
+                    if isinstance(ionice, tuple):
+                        ranked = ionice.ioclass in (psutil.IOPRIO_CLASS_BE, psutil.IOPRIO_CLASS_RT)
+                        proc.ionice(ionice.ioclass, ionice.value if ranked else None)
+                    else:
+                        proc.ionice(ionice)
+            except psutil.NoSuchProcess:
+                raise
+            except (psutil.AccessDenied, AttributeError, ValueError, OSError) as e:
+                failed.append(part)
+                record["error"] = str(e) or type(e).__name__
+        return failed
+    
+    def _restore(self, key: tuple) -> Optional[str]:
+        record = self.throttled.pop(key, None) or self.failed_restores.pop(key)
+        try:
+            if not record["process"].is_running():
+                return None
+            failed = self._restore_parts(record)
+        except psutil.NoSuchProcess:
+            return None
+        
+        if failed:
+            first_failure = "pending" not in record
+            record["pending"] = failed
+            self.failed_restores[key] = record
+            if first_failure:
+                self.stats["restore_failed"] += 1
+                self._log(
+                    f"  ⚠ Не удалось восстановить приоритет: {record['name']} (PID {key[0]}): "
+                    f"{record['error']}, повтор позже"
+                )
+            return None
+        
+        self.stats["released"] += 1
+        self._log(f"  Приоритет восстановлен: {record['name']} (PID {key[0]})")
+        return record["name"]
+    
+    def retry_restores(self) -> list:
+        with self._lock:
+            return [name for name in map(self._restore, list(self.failed_restores)) if name]
+    
+    def restore_all(self) -> list:
+        with self._lock:
+            restored = [self._restore(key) for key in list(self.throttled)]
+            restored += self.retry_restores()
+            return [name for name in restored if name]
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.update()
+                except Exception as e:
+                    self._log(f"  Ошибка ограничения фоновых процессов: {e}")
+                self._stop.wait(self.interval)
+        
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.interval + 1)
+            self._thread = None
+        self.restore_all()
+        for key, record in self.failed_restores.items():
+            self._log(f"  ⚠ Приоритет не восстановлен: {record['name']} (PID {key[0]})")
+    
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
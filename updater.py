@@ -1,12 +1,6 @@
 import os
 import sys
 import json
-import shutil
-import zipfile
-import tempfile
-import subprocess
-import urllib.request
-import urllib.error
 from typing import Callable, Optional
 
 VERSION = "2.4.0"
@@ -60,6 +54,9 @@ class Updater:
         return 0
     
     def check_for_updates(self) -> dict:
+        import urllib.request
+        import urllib.error
+        
         self._log("Проверка обновлений...")
         
         result = {
@@ -135,6 +132,9 @@ class Updater:
             self._log("  URL загрузки не найден")
             return None
         
+        import tempfile
+        import urllib.request
+        
         self._log(f"Загрузка обновления v{self.latest_version}...")
         
         try:
@@ -187,6 +187,8 @@ class Updater:
             return self._apply_source_update(downloaded_path)
     
     def _apply_exe_update(self, new_exe_path: str) -> bool:
+        import subprocess
+        
         try:
             current_exe = sys.executable
             app_dir = os.path.dirname(current_exe)
@@ -278,6 +280,10 @@ del /f /q "%~f0" 2>nul
             return False
     
     def _apply_source_update(self, zip_path: str) -> bool:
+        import shutil
+        import tempfile
+        import zipfile
+        
         try:
             app_dir = get_app_dir()
             temp_extract = tempfile.mkdtemp()
@@ -291,7 +297,7 @@ del /f /q "%~f0" 2>nul
             else:
                 source_dir = temp_extract
             
-            files_to_update = ['main.py', 'optimizer.py', 'updater.py']
+            files_to_update = ['main.py', 'optimizer.py', 'updater.py', 'hardware.py', 'profiling.py', 'processes.py', 'games.py', 'benchmarks.py', 'policies.py', 'throttler.py', 'memory.py', 'history.py', 'experiments.py', 'latency.py', 'network.py', 'resolvers.py', 'storage.py']
             
             for filename in files_to_update:
                 src_file = os.path.join(source_dir, filename)